@@ -4,7 +4,7 @@ import jsPDF from 'jspdf';
 import html2canvas from 'html2canvas';
 import { FaHome } from 'react-icons/fa';
 
-type SummaryItem = { keywords: string[]; summary: string };
+type SummaryItem = { keywords: string[]; summary: string; article_set_id?: string };
 
 function FinalPage() {
   const location = useLocation();
@@ -35,6 +35,7 @@ function FinalPage() {
           body: JSON.stringify({
             keywords: last.keywords,
             summary: last.summary,
+            article_set_id: last.article_set_id,
           }),
         });
         const data = await resp.json();
@@ -2,14 +2,15 @@ import React, { useState, useEffect } from 'react';
 import { Link, useLocation, useNavigate } from 'react-router-dom';
 import { FaHome } from 'react-icons/fa';
 import HexKeywordGrid from './HexKeywordGrid';
+import { postEventStream } from '../sse';
 
 function ResultsPage() {
   const location = useLocation();
   const navigate = useNavigate();
 
   const [summary, setSummary] = useState<string>('');
-  const [summaryHistory, setSummaryHistory] = useState<{ keywords: string[], summary: string }[]>([]);
-  const { query_list = [], is_initial = true, articles = [], keywords = [] } = location.state || {};
+  const [summaryHistory, setSummaryHistory] = useState<{ keywords: string[], summary: string, article_set_id?: string }[]>([]);
+  const { query_list = [], is_initial = true, articles = [], keywords = [], stream_query, article_set_id = null } = location.state || {};
 
   const primaryQuery = query_list[0] || '';
   const safeArticles = Array.isArray(articles) ? articles : [];
@@ -20,9 +21,14 @@ function ResultsPage() {
   const [selectedKeywords, setSelectedKeywords] = useState<string[]>(
     is_initial && query_list.length > 0 ? [...query_list] : []
   );
+  const [queryList, setQueryList] = useState<string[]>(query_list);
+  const [baseArticles, setBaseArticles] = useState<any[]>(safeArticles);
   const [resultArticles, setResultArticles] = useState<any[]>(safeArticles);
+  // 서버에 저장된 기사 묶음 ID: /keywords, /summary 에 기사 대신 보낸다
+  const [baseArticleSetId, setBaseArticleSetId] = useState<string | null>(article_set_id);
+  const [articleSetId, setArticleSetId] = useState<string | null>(article_set_id);
   const [resultKeywords, setResultKeywords] = useState<string[]>(reorderedKeywords);
-  const [loading, setLoading] = useState(false);
+  const [loading, setLoading] = useState(!!stream_query);
   const [inputKeyword, setInputKeyword] = useState<string>("");
   const [composing, setComposing] = useState(false);
   const [showSpecialCharWarning, setShowSpecialCharWarning] = useState(false);
@@ -33,6 +39,44 @@ function ResultsPage() {
     }
   }, [location.state, navigate]);
 
+  // 검색 화면에서 넘어온 경우: /search/stream 으로 단계별 결과 수신
+  // raw_articles(네이버 페이지 도착 즉시) → articles(중복 제거) → keywords → done
+  useEffect(() => {
+    if (!stream_query) return;
+    const controller = new AbortController();
+    let raw: any[] = [];
+    postEventStream('http://localhost:5001/search/stream', { query: stream_query }, ({ event, data }) => {
+      if (event === 'query') {
+        setQueryList(data.query_list);
+        setSelectedKeywords([...data.query_list]);
+        setResultKeywords([data.query_list[0]]);
+      } else if (event === 'raw_articles') {
+        raw = [...raw, ...data.articles];
+        setResultArticles(raw);
+      } else if (event === 'articles') {
+        setBaseArticles(data.articles);
+        setResultArticles(data.articles);
+        setBaseArticleSetId(data.article_set_id || null);
+        setArticleSetId(data.article_set_id || null);
+      } else if (event === 'keywords') {
+        setResultKeywords(prev => [prev[0], ...data.keywords.filter((k: string) => k !== prev[0])]);
+      } else if (event === 'done' || event === 'error') {
+        setBaseArticles(data.articles || []);
+        setResultArticles(data.articles || []);
+        setBaseArticleSetId(data.article_set_id || null);
+        setArticleSetId(data.article_set_id || null);
+        if (data.alert) alert(data.alert);
+        setLoading(false);
+      }
+    }, controller.signal).catch(e => {
+      if (controller.signal.aborted) return;
+      console.error('Error:', e);
+      alert('서버 연결 중 오류가 발생했습니다.');
+      setLoading(false);
+    });
+    return () => controller.abort();
+  }, [stream_query]);
+
   const handleAddKeyword = () => {
     const trimmed = inputKeyword.trim();
     if (trimmed && !resultKeywords.includes(trimmed)) {
@@ -55,7 +99,8 @@ function ResultsPage() {
   const reSearch = async (keywordsToSearch?: string[]) => {
     const searchKeywords = keywordsToSearch ?? selectedKeywords;
     if (searchKeywords.length === 0) {
-      setResultArticles(safeArticles);
+      setResultArticles(baseArticles);
+      setArticleSetId(baseArticleSetId);
       return;
     }
     setLoading(true);
@@ -67,6 +112,7 @@ function ResultsPage() {
       });
       const data = await resp.json();
       setResultArticles(data.articles || []);
+      setArticleSetId(data.article_set_id || null);
     } catch (e) {
       alert('뉴스 검색 실패');
     }
@@ -77,30 +123,40 @@ function ResultsPage() {
     if (selectedKeywords.length === 0) return;
     setLoading(true);
     try {
-      const [keywordsResp, summaryResp] = await Promise.all([
-        fetch('http://localhost:5001/keywords', {
-          method: 'POST',
-          headers: { 'Content-Type': 'application/json' },
-          body: JSON.stringify({ articles: resultArticles })
-        }),
-        fetch('http://localhost:5001/summary', {
-          method: 'POST',
-          headers: { 'Content-Type': 'application/json' },
-          body: JSON.stringify({ articles: resultArticles })
+      // 기사 묶음 ID 가 있으면 ID 만 보내고, 묶음이 만료됐으면(404) 기사 목록을 보내 다시 요청
+      const fullBody = { articles: resultArticles };
+      const body = articleSetId ? { article_set_id: articleSetId } : fullBody;
+      const postKeywords = (b: object) => fetch('http://localhost:5001/keywords', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(b)
+      });
+      // 요약은 /summary/stream 으로 생성되는 대로 표시
+      let streamed = '';
+      setSummary('');
+      const streamSummary = (b: object) => postEventStream('http://localhost:5001/summary/stream', b, ({ event, data }) => {
+        if (event === 'summary') streamed += data.delta;
+        else if (event === 'done' || event === 'error') streamed = data.summary;
+        setSummary(streamed);
+      });
+      const [keywordsData] = await Promise.all([
+        postKeywords(body)
+          .then(resp => (resp.status === 404 && body !== fullBody ? postKeywords(fullBody) : resp))
+          .then(resp => resp.json()),
+        streamSummary(body).catch(e => {
+          if (body === fullBody) throw e;
+          streamed = '';
+          return streamSummary(fullBody);
         })
       ]);
 
-      const keywordsData = await keywordsResp.json();
-      const summaryData = await summaryResp.json();
-
       if (keywordsData.keywords) {
         const newKeywords = (keywordsData.keywords || []).slice(0, 3);
         setResultKeywords(prev => Array.from(new Set([...(prev || []), ...newKeywords])));
       }
 
-      if (summaryData.summary) {
-        setSummary(summaryData.summary);
-        setSummaryHistory(prev => [...prev, { keywords: [...selectedKeywords], summary: summaryData.summary }]);
+      if (streamed) {
+        setSummaryHistory(prev => [...prev, { keywords: [...selectedKeywords], summary: streamed, article_set_id: articleSetId || undefined }]);
       }
 
     } catch (e: any) {
@@ -180,7 +236,7 @@ function ResultsPage() {
             </div>
             {/* 실제 검색에 사용된 키워드 시각화 */}
             <div className="mb-2 text-sm text-gray-500">
-              <span className="font-semibold text-[#121212]">검색 키워드:</span> {query_list && query_list.length > 0 ? query_list.join(', ') : '없음'}
+              <span className="font-semibold text-[#121212]">검색 키워드:</span> {queryList && queryList.length > 0 ? queryList.join(', ') : '없음'}
             </div>
             {/* 중간: 헥사곤 키워드 그리드 */}
             <div className="flex-1 flex items-center justify-center">
@@ -188,7 +244,7 @@ function ResultsPage() {
                 keywords={resultKeywords}
                 selected={selectedKeywords}
                 onToggle={handleToggle}
-                primaryKeywords={query_list}
+                primaryKeywords={queryList}
                 confirmedKeywords={Array.from(new Set(summaryHistory.flatMap(h => h.keywords)))}
               />
             </div>
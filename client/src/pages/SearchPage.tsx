@@ -13,35 +13,14 @@ function SearchPage() {
     e.preventDefault();
     if (!searchQuery.trim()) return;
 
+    // 결과 화면으로 바로 이동해 /search/stream 으로 단계별 결과를 받는다
     setIsLoading(true);
-    try {
-      const response = await fetch('http://localhost:5001/search', {
-        method: 'POST',
-        headers: {
-          'Content-Type': 'application/json',
-        },
-        body: JSON.stringify({ query: searchQuery }),
-      });
-      const data = await response.json();
-      
-      if (response.ok) {
-        navigate('/results', {
-          state: {
-            query_list: data.query_list || [searchQuery],
-            is_initial: true,
-            articles: data.articles,
-            keywords: data.keywords,
-          },
-        });
-      } else {
-        alert('검색 중 오류가 발생했습니다.');
-      }
-    } catch (error) {
-      console.error('Error:', error);
-      alert('서버 연결 중 오류가 발생했습니다.');
-    } finally {
-      setIsLoading(false);
-    }
+    navigate('/results', {
+      state: {
+        stream_query: searchQuery,
+        is_initial: true,
+      },
+    });
   };
 
   return (
@@ -1,49 +1,101 @@
-from flask import Flask, request, jsonify
+# 서버 시작 시 무거운 모듈을 먼저 로드하고 모듈별 import 시간을 기록
+import startup
+startup.preload()
+
+import json
+import time
+
+from flask import Flask, Response, g, request, jsonify, stream_with_context
 from flask_cors import CORS, cross_origin
-from news_processor import process_news
-from gpt_processor import summarize_articles
+from news_processor import process_news, process_news_stream
+from gpt_processor import summarize_articles, summarize_articles_stream
 from gpt_processor import generate_final_report
 from gpt_processor import extract_keywords
+import metrics
 
 
 app = Flask(__name__)
 CORS(app)  # CORS 설정 추가
 
+# 토크나이저 / 벡터라이저 / Redis 풀 / OpenAI 클라이언트 warm-up (백그라운드)
+startup.start_warm_up()
+
+
+# 라우트별 요청 시간 히스토그램 + 요청 단위 단계 시간 (GET /metrics)
+@app.before_request
+def start_request_metrics():
+    g.request_started = time.perf_counter()
+    g.trace_token = metrics.start_trace()
+
+
+@app.after_request
+def record_request_metrics(response):
+    started = g.pop('request_started', None)
+    if started is None:
+        return response
+    elapsed = time.perf_counter() - started
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    metrics.REQUEST_SECONDS.observe(elapsed, method=request.method, route=route, status=response.status_code)
+    spans = metrics.finish_trace(g.pop('trace_token', None))
+    if spans:
+        print(f"⏱️ {request.method} {route} {response.status_code} {elapsed * 1000:.0f}ms | "
+              f"{metrics.format_spans(spans)}")
+    return response
+
 
 @app.route('/')
 def hello_world():
     return 'Hello World!'
 
 
+def resolve_query_list(data):
+    """요청 본문의 query_list (없으면 단일 query 에서 핵심 키워드 추출). 검색어가 없으면 None"""
+    # 다중 키워드 조합 및 최초/파생 검색 분기 지원
+    query_list = data.get('query_list')
+
+    # 기존 단일 query 입력도 호환
+    if not query_list:
+        search_query = data.get('query', '').strip()
+        if not search_query:
+            return None
+        # 문장형 자연어 입력 시 핵심 키워드 추출
+        keywords = local_extract_keywords(search_query)
+        query_list = keywords if keywords else [search_query]
+    return query_list
+
+
+def search_response(processed_results, query_list):
+    # 항상 query_list를 응답에 포함
+    response = dict(processed_results)
+    response['query_list'] = query_list
+    # 검색 결과가 없으면 추천 키워드와 안내 메시지 추가
+    if not response.get('articles'):
+        response['recommend_keywords'] = query_list
+        response['alert'] = '문장형 검색어 대신 핵심 키워드 위주로 검색해 주세요.'
+    return response
+
+
+def sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def sse_response(events):
+    return Response(stream_with_context(events), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
 @app.route('/search', methods=['POST'])
 @cross_origin()
 def search():
     try:
         data = request.get_json()
-        # 다중 키워드 조합 및 최초/파생 검색 분기 지원
-        query_list = data.get('query_list')
-        is_initial = data.get('is_initial', True)
-
-        # 기존 단일 query 입력도 호환
+        query_list = resolve_query_list(data)
         if not query_list:
-            search_query = data.get('query', '').strip()
-            if not search_query:
-                return jsonify({'error': '검색어를 입력해주세요.'}), 400
-            # 문장형 자연어 입력 시 핵심 키워드 추출
-            keywords = local_extract_keywords(search_query)
-            query_list = keywords if keywords else [search_query]
+            return jsonify({'error': '검색어를 입력해주세요.'}), 400
+        is_initial = data.get('is_initial', True)
 
         processed_results = process_news(query_list, is_initial)
-
-        # 항상 query_list를 응답에 포함
-        response = dict(processed_results)
-        response['query_list'] = query_list
-        # 검색 결과가 없으면 추천 키워드와 안내 메시지 추가
-        if not response.get('articles'):
-            response['recommend_keywords'] = query_list
-            response['alert'] = '문장형 검색어 대신 핵심 키워드 위주로 검색해 주세요.'
-
-        return jsonify(response)
+        return jsonify(search_response(processed_results, query_list))
     except Exception as e:
         print(f"❌ 처리 실패: {e}")
         # 뉴스 검색 실패 시에도 안내 메시지와 추천 키워드 반환
@@ -57,19 +109,145 @@ def search():
             })
         return jsonify({'error': str(e)}), 500
 
+
+# 스트리밍 검색 (SSE): 단계가 끝날 때마다 이벤트 전송
+# query → raw_articles(네이버 페이지마다) → articles(중복 제거) → keywords(최초 검색) → done(/search 응답과 같은 본문)
+@app.route('/search/stream', methods=['POST'])
+@cross_origin()
+def search_stream():
+    data = request.get_json()
+    query_list = resolve_query_list(data)
+    if not query_list:
+        return jsonify({'error': '검색어를 입력해주세요.'}), 400
+    is_initial = data.get('is_initial', True)
+
+    def events():
+        yield sse_event('query', {'query_list': query_list})
+        try:
+            for event, payload in process_news_stream(query_list, is_initial):
+                if event == 'result':
+                    yield sse_event('done', search_response(payload, query_list))
+                else:
+                    yield sse_event(event, payload)
+        except Exception as e:
+            print(f"❌ 스트리밍 처리 실패: {e}")
+            yield sse_event('error', {
+                'articles': [],
+                'query_list': query_list,
+                'recommend_keywords': query_list,
+                'alert': '검색 결과가 없습니다. 문장형 검색어 대신 키워드 위주로 검색해 주세요.',
+            })
+
+    return sse_response(events())
+
+# 준비 상태 (warm-up 완료 전에는 503)
+@app.route('/ready', methods=['GET'])
+def ready():
+    if startup.is_ready():
+        return jsonify({'ready': True})
+    return jsonify({'ready': False}), 503
+
+
+# 모듈별 import 시간 / warm-up 단계별 시간
+@app.route('/startup_report', methods=['GET'])
+def startup_report():
+    return jsonify(startup.report())
+
+
+# 검색 결과 캐시 hit/miss 카운터 (+ GPT 응답 캐시, 백그라운드 갱신)
+@app.route('/cache_stats', methods=['GET'])
+@cross_origin()
+def cache_stats():
+    try:
+        from redis_manager import RedisManager
+        from gpt_cache import get_response_cache
+        stats = RedisManager().get_cache_stats()
+        stats['gpt'] = get_response_cache().get_stats()
+        stats['combined'] = RedisManager().get_combined_stats()
+        from refresher import get_refresher
+        stats['refresh'] = get_refresher().get_stats()
+        return jsonify(stats)
+    except Exception as e:
+        print(f"❌ 캐시 통계 조회 실패: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
+# Prometheus 형식 지표 (라우트별 요청 시간, 단계별 시간, 캐시 hit/miss, upstream 오류, 기사 수)
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
 # === 키워드 추출 엔드포인트 추가 ===
 from gpt_processor import extract_keywords as gpt_extract_keywords
 from keyword_extractor import extract_keywords as local_extract_keywords
 
+SUMMARY_FAILED = "요약 생성 실패"
+
+
+def resolve_articles(data):
+    """
+    요청의 기사 목록과 기사 묶음 ID.
+    article_set_id 가 있으면 Redis(articleset:)에서 읽고, 없거나 만료됐으면 본문의 articles 를 쓴다.
+    Returns:
+        (articles | None, set_id | None, error_response | None)
+    """
+    set_id = data.get('article_set_id')
+    if set_id:
+        from redis_manager import RedisManager
+        try:
+            articles = RedisManager().get_article_set(set_id)
+        except Exception as e:
+            print(f"⚠️ 기사 묶음 조회 실패: {e}")
+            articles = None
+        if articles:
+            return articles, set_id, None
+    articles = data.get('articles', [])
+    if articles and isinstance(articles, list):
+        return articles, None, None
+    if set_id:
+        # 만료된 묶음: 클라이언트가 articles 를 함께 보내 다시 요청
+        return None, None, (jsonify({'error': '기사 묶음이 만료되었습니다. 기사 리스트를 보내 주세요.',
+                                     'expired': True}), 404)
+    return None, None, (jsonify({'error': '뉴스 기사 리스트가 필요합니다.'}), 400)
+
+
+def article_set_field(set_id, field):
+    """기사 묶음에 저장해 둔 keywords/summary (없으면 None)"""
+    if not set_id:
+        return None
+    from redis_manager import RedisManager
+    try:
+        return RedisManager().get_article_set_field(set_id, field)
+    except Exception as e:
+        print(f"⚠️ 기사 묶음 조회 실패: {e}")
+        return None
+
+
+def save_article_set_field(set_id, field, value):
+    if not set_id:
+        return
+    from redis_manager import RedisManager
+    try:
+        RedisManager().save_article_set_field(set_id, field, value)
+    except Exception as e:
+        print(f"❌ 기사 묶음 저장 실패: {e}")
+
+
 @app.route('/keywords', methods=['POST'])
 @cross_origin()
 def keywords():
     try:
         data = request.get_json()
-        articles = data.get('articles', [])
-        if not articles or not isinstance(articles, list):
-            return jsonify({'error': '뉴스 기사 리스트가 필요합니다.'}), 400
-        keywords = extract_keywords(articles)
+        # article_set_id 로 받으면 기사 재전송 없이, 이미 뽑은 키워드가 있으면 GPT 호출 없이 응답
+        articles, set_id, error = resolve_articles(data)
+        if error:
+            return error
+        keywords = article_set_field(set_id, 'keywords')
+        if keywords is None:
+            keywords = extract_keywords(articles)
+            # 빈 목록(응답 파싱 실패 등)은 저장하지 않고 다음 요청에서 다시 뽑는다
+            if keywords:
+                save_article_set_field(set_id, 'keywords', keywords)
         return jsonify({'keywords': keywords})
     except Exception as e:
         print(f"❌ 키워드 추출 실패: {e}")
@@ -81,16 +259,53 @@ def keywords():
 def summary():
     try:
         data = request.get_json()
-        articles = data.get('articles', [])
-        if not articles or not isinstance(articles, list):
-            return jsonify({'error': '뉴스 기사 리스트가 필요합니다.'}), 400
+        articles, set_id, error = resolve_articles(data)
+        if error:
+            return error
 
-        summary_text = summarize_articles(articles)
+        summary_text = article_set_field(set_id, 'summary')
+        if summary_text is None:
+            summary_text = summarize_articles(articles)
+            if summary_text and summary_text != SUMMARY_FAILED:
+                save_article_set_field(set_id, 'summary', summary_text)
         return jsonify({'summary': summary_text})
     except Exception as e:
         print(f"❌ 요약 API 실패: {e}")
         return jsonify({'error': str(e)}), 500 
 
+# 스트리밍 요약 (SSE): 모델이 생성하는 대로 summary 이벤트(delta), 끝나면 done(전체 요약)
+@app.route('/summary/stream', methods=['POST'])
+@cross_origin()
+def summary_stream():
+    data = request.get_json()
+    articles, set_id, error = resolve_articles(data)
+    if error:
+        return error
+
+    def events():
+        stored = article_set_field(set_id, 'summary')
+        if stored is not None:
+            yield sse_event('summary', {'delta': stored})
+            yield sse_event('done', {'summary': stored})
+            return
+        parts = []
+        try:
+            for delta in summarize_articles_stream(articles):
+                parts.append(delta)
+                yield sse_event('summary', {'delta': delta})
+            summary_text = ''.join(parts).strip()
+            if not summary_text:
+                # 빈 요약을 저장하면 이 기사 묶음은 계속 빈 요약만 다시 내보낸다
+                yield sse_event('error', {'summary': SUMMARY_FAILED})
+                return
+            save_article_set_field(set_id, 'summary', summary_text)
+            yield sse_event('done', {'summary': summary_text})
+        except Exception as e:
+            print(f"❌ 요약 스트리밍 실패: {e}")
+            yield sse_event('error', {'summary': SUMMARY_FAILED})
+
+    return sse_response(events())
+
 # # === 최종 보고 엔드포인트 ===
 # from gpt_processor import define_keywords
 
@@ -121,7 +336,8 @@ def final_report():
     try:
         data = request.get_json()
         keywords = data.get('keywords', [])
-        summary = data.get('summary', '')
+        # 요약문 대신 기사 묶음 ID 만 보내면 그 묶음에서 만든 요약을 사용
+        summary = data.get('summary') or article_set_field(data.get('article_set_id'), 'summary') or ''
         if not keywords or not isinstance(keywords, list) or not summary:
             return jsonify({'error': '키워드 리스트와 요약문이 필요합니다.'}), 400
 
@@ -0,0 +1,155 @@
+# article_codec.py
+"""
+Redis 에 넣는 기사 / 검색 결과 직렬화 (버전 헤더 + msgpack 또는 JSON + 선택 압축).
+- 값 앞 4바이트 헤더: b'NH' + 버전 + (압축 << 4 | 형식)
+  형식: 1=JSON, 2=msgpack (msgpack 이 설치돼 있으면 기본) / 압축: 0=없음, 1=zlib, 2=zstd (zstandard 설치 시)
+  COMPRESS_MIN 바이트 미만은 압축하지 않는다 (짧은 값은 헤더/사전 비용이 더 큼)
+- 기사 목록은 필드 이름을 한 번만 적는 열 형식 {"fields": [...], "rows": [[...], ...]}
+  저장하는 필드만 골라 담는다 (text 처럼 다시 만들 수 있는 값은 버림).
+  cluster 는 남긴다 — 기사 묶음으로 읽은 /summary 가 클러스터 단위로 map-reduce 요약을 나눈다
+- 버전: 1=cluster 없는 기사 목록, 2=cluster 포함. 읽기는 SUPPORTED_VERSIONS 모두 (열 형식이 필드 이름을 함께 담으므로
+  버전 1 값은 cluster 키 없이 그대로 읽힌다)
+- 읽기 호환: 헤더가 없으면 기존 JSON 문자열로 읽는다 (news:* 기존 해시는 redis_manager 가 따로 처리)
+config: REDIS_CODEC('msgpack'/'json'), REDIS_COMPRESSION('zlib'/'zstd'/'none')
+"""
+
+import json
+import zlib
+
+import config
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+MAGIC = b"NH"
+VERSION = 2
+SUPPORTED_VERSIONS = (1, 2)
+FORMAT_JSON = 1
+FORMAT_MSGPACK = 2
+COMPRESS_NONE = 0
+COMPRESS_ZLIB = 1
+COMPRESS_ZSTD = 2
+COMPRESS_MIN = 256
+ZLIB_LEVEL = 6
+
+# 결과 캐시 / 기사 묶음: 화면과 GPT 프롬프트(prompt_payload)에 쓰는 필드 + 요약 묶음(cluster)
+ARTICLE_FIELDS = ("title", "description", "pubDate", "originallink", "cluster")
+# news:* (로컬 색인 검색이 다시 중복 제거할 때 processed_text 필요). text 는 읽을 때 title + description 으로 복원
+NEWS_FIELDS = ("title", "description", "pubDate", "originallink", "processed_text")
+
+_FORMATS = {"json": FORMAT_JSON, "msgpack": FORMAT_MSGPACK}
+_COMPRESSIONS = {"none": COMPRESS_NONE, "zlib": COMPRESS_ZLIB, "zstd": COMPRESS_ZSTD}
+
+
+def _default_format():
+    name = getattr(config, "REDIS_CODEC", "msgpack" if msgpack else "json")
+    if name == "msgpack" and msgpack is None:
+        name = "json"
+    return _FORMATS[name]
+
+
+def _default_compression():
+    name = getattr(config, "REDIS_COMPRESSION", "zlib")
+    if name == "zstd" and zstandard is None:
+        name = "zlib"
+    return _COMPRESSIONS[name]
+
+
+def _serialize(obj, fmt):
+    if fmt == FORMAT_MSGPACK:
+        return msgpack.packb(obj, use_bin_type=True)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _deserialize(body, fmt):
+    if fmt == FORMAT_MSGPACK:
+        if msgpack is None:
+            raise ValueError("msgpack 으로 저장된 값이지만 msgpack 이 설치되어 있지 않습니다.")
+        return msgpack.unpackb(body, raw=False)
+    if fmt == FORMAT_JSON:
+        return json.loads(body)
+    raise ValueError(f"알 수 없는 직렬화 형식: {fmt}")
+
+
+def _compress(body, compression):
+    if compression == COMPRESS_ZLIB:
+        return zlib.compress(body, ZLIB_LEVEL)
+    if compression == COMPRESS_ZSTD:
+        return zstandard.ZstdCompressor().compress(body)
+    return body
+
+
+def _decompress(body, compression):
+    if compression == COMPRESS_ZLIB:
+        return zlib.decompress(body)
+    if compression == COMPRESS_ZSTD:
+        if zstandard is None:
+            raise ValueError("zstd 로 압축된 값이지만 zstandard 가 설치되어 있지 않습니다.")
+        return zstandard.ZstdDecompressor().decompress(body)
+    if compression == COMPRESS_NONE:
+        return body
+    raise ValueError(f"알 수 없는 압축 방식: {compression}")
+
+
+def dumps(obj, fmt=None, compression=None):
+    """obj → 헤더 붙은 bytes. fmt/compression 을 주지 않으면 config 기본값"""
+    fmt = _default_format() if fmt is None else fmt
+    compression = _default_compression() if compression is None else compression
+    body = _serialize(obj, fmt)
+    if len(body) < COMPRESS_MIN:
+        compression = COMPRESS_NONE
+    return MAGIC + bytes([VERSION, compression << 4 | fmt]) + _compress(body, compression)
+
+
+def is_encoded(value):
+    return isinstance(value, bytes) and value[:2] == MAGIC
+
+
+def loads(value):
+    """dumps 결과 또는 기존 JSON 문자열(bytes/str) → obj"""
+    if not is_encoded(value):
+        return json.loads(value)
+    version, flags = value[2], value[3]
+    if version not in SUPPORTED_VERSIONS:
+        raise ValueError(f"지원하지 않는 직렬화 버전: {version}")
+    return _deserialize(_decompress(value[4:], flags >> 4), flags & 0x0F)
+
+
+# ---------- 기사 ----------
+def pack_articles(articles, fields=ARTICLE_FIELDS):
+    """기사 dict 목록 → 열 형식 (fields 에 없는 키는 버림)"""
+    return {"fields": list(fields), "rows": [[article.get(f) for f in fields] for article in articles]}
+
+
+def unpack_articles(packed):
+    """pack_articles 결과 → 기사 dict 목록. 기존 형식(dict 목록)은 그대로 반환"""
+    if isinstance(packed, list):
+        return packed
+    fields = packed["fields"]
+    return [dict(zip(fields, row)) for row in packed["rows"]]
+
+
+def encode_articles(articles, fields=ARTICLE_FIELDS):
+    return dumps(pack_articles(articles, fields))
+
+
+def decode_articles(value):
+    return unpack_articles(loads(value))
+
+
+def encode_news(article):
+    """news:* 기사 한 건 → NEWS_FIELDS 순서의 값 목록 (필드 이름은 버전이 정함)"""
+    return dumps([article.get(f) for f in NEWS_FIELDS])
+
+
+def decode_news(value):
+    article = dict(zip(NEWS_FIELDS, loads(value)))
+    article["text"] = f"{article.get('title') or ''} {article.get('description') or ''}"
+    return article
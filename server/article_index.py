@@ -0,0 +1,94 @@
+# article_index.py
+"""
+이미 수집한 기사에 대한 Redis 역색인 (토큰 → 기사 링크).
+- 최초 검색에서 만든 processed_text 토큰마다 idx:{토큰} 집합에 기사 링크를 넣는다.
+- 파생(토글) 검색은 검색어 토큰들의 idx 집합 교집합으로 먼저 답하고,
+  결과 수가 min_results 보다 적을 때만 네이버를 다시 호출한다.
+- idx:{토큰} 은 ZSET (점수 = 색인할 때 함께 저장한 news:* 가 만료되는 시각).
+  교집합은 점수 MIN 으로 합쳐 만료 시각이 지난 링크를 빼고, 색인할 때마다 만료된 링크를 지우고
+  토큰마다 최신 MAX_POSTINGS 개만 남긴다 (흔한 토큰의 집합이 끝없이 커지지 않도록).
+  키 만료는 가장 늦게 색인한 링크의 만료 시각과 같다. 예전 SET 형식 키는 읽을 때 만료된 것으로 보고(점수 1)
+  다음 색인 때 ZSET 으로 다시 만든다.
+"""
+
+import time
+import uuid
+
+from redis.exceptions import ResponseError
+
+from redis_manager import NEWS_TTL
+
+MIN_TOKEN_LENGTH = 2
+MAX_POSTINGS = 5000  # 토큰마다 유지하는 최신 기사 링크 수
+TEMP_TTL = 60        # 교집합 임시 키 (같은 트랜잭션에서 지우지만 혹시 남을 때 대비)
+
+
+def index_tokens(processed_text):
+    """색인할 토큰 (중복 제거, 한 글자 토큰 제외)"""
+    return {tok for tok in str(processed_text).split() if len(tok) >= MIN_TOKEN_LENGTH}
+
+
+class ArticleIndex:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def add_articles(self, articles, ttl=NEWS_TTL):
+        """
+        기사들의 processed_text 토큰을 색인한다. 기사 수와 무관하게 파이프라인 왕복 1회
+        (예전 SET 형식 키가 섞여 있으면 그 키만 지우고 1회 더).
+        """
+        postings = {}
+        for article in articles:
+            link = article.get('originallink')
+            if not (isinstance(link, str) and link.startswith('http')):
+                continue
+            for token in index_tokens(article.get('processed_text', '')):
+                postings.setdefault(token, []).append(link)
+        if not postings:
+            return 0
+        now = time.time()
+        legacy = self._write_postings(postings, now, ttl)
+        if legacy:
+            self.conn.unlink(*(f"idx:{token}" for token in legacy))
+            self._write_postings({token: postings[token] for token in legacy}, now, ttl)
+        return len(postings)
+
+    def _write_postings(self, postings, now, ttl):
+        """토큰별 ZADD + 만료된 링크 삭제 + 최신 MAX_POSTINGS 개로 자르기. WRONGTYPE(예전 SET)인 토큰 목록 반환"""
+        pipe = self.conn.pipeline(transaction=False)
+        for token, links in postings.items():
+            key = f"idx:{token}"
+            pipe.zadd(key, dict.fromkeys(links, now + ttl))
+            pipe.zremrangebyscore(key, "-inf", now)
+            pipe.zremrangebyrank(key, 0, -(MAX_POSTINGS + 1))
+            pipe.expire(key, ttl)  # 방금 넣은 링크가 가장 늦게 만료된다
+        results = pipe.execute(raise_on_error=False)
+        return [token for token, added in zip(postings, results[::4]) if isinstance(added, ResponseError)]
+
+    def lookup(self, query_tokens):
+        """
+        모든 검색어 토큰을 포함하고 아직 만료되지 않은 기사 링크 집합.
+        ZINTERSTORE(점수 MIN) → 만료 시각이 지나지 않은 링크만 읽기 → 임시 키 삭제를 MULTI 한 번에.
+        """
+        keys = [f"idx:{tok}" for tok in sorted(set(query_tokens))]
+        if not keys:
+            return set()
+        dest = f"tmp:idx:{uuid.uuid4().hex}"
+        pipe = self.conn.pipeline(transaction=True)
+        pipe.zinterstore(dest, keys, aggregate="MIN")
+        pipe.expire(dest, TEMP_TTL)
+        pipe.zrangebyscore(dest, f"({time.time()}", "+inf")
+        pipe.unlink(dest)
+        _, _, links, _ = pipe.execute()
+        return set(links)
+
+
+def query_tokens(query_list, tokenize):
+    """
+    검색어 조합을 색인과 같은 방식으로 토큰화한다.
+    tokenize 는 word_model 의 tokenize (공백으로 이은 토큰 문자열 반환).
+    """
+    tokens = set()
+    for term in query_list:
+        tokens |= index_tokens(tokenize(str(term).strip()))
+    return tokens
@@ -0,0 +1,4 @@
+"""
+오프라인 성능 측정 스크립트 모음.
+server 디렉터리에서 `python -m benchmark.<모듈>` 형태로 실행한다.
+"""
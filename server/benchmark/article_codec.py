@@ -0,0 +1,129 @@
+# benchmark/article_codec.py
+"""
+Redis 기사 저장 형식 비교: 예전 형식(필드별 문자열 해시 / JSON 문자열) vs article_codec (헤더 + JSON/msgpack + zlib/zstd).
+합성 기사 --articles 건(processed_text, cluster 포함)을 fakeredis 에 저장해
+  news:*     기사 1,000건당 메모리 (기사마다 키 하나)
+  result:*   결과 캐시 값 하나의 메모리와 캐시 hit 시 읽기+디코딩 시간
+  articleset 예전 links → news:* 읽기 vs articles 값 하나 읽기
+를 잰다. 메모리는 MEMORY USAGE (fakeredis 처럼 없으면 DUMP 크기) 로, 로컬 redis-server 는 --redis-url 로.
+
+실행: cd server && python -m benchmark.article_codec --articles 1000
+"""
+
+import argparse
+import json
+import time
+
+from benchmark.corpus import generate_items
+from benchmark.offline import use_offline_config
+
+
+def build_articles(n):
+    """news_processor 결과와 같은 필드 (text, processed_text, cluster 포함)"""
+    from text_ingest import normalize_items
+    from word_model import WordScoreModel
+    articles = normalize_items(generate_items(n), cache=False)
+    model = WordScoreModel()
+    model.update([a["text"] for a in articles])
+    for i, (article, tokens) in enumerate(zip(articles, model.tokenize_batch([a["text"] for a in articles]))):
+        article["processed_text"] = tokens
+        article["cluster"] = i % 50
+    return articles
+
+
+def variants():
+    """(이름, fmt, compression) — 설치된 라이브러리만"""
+    import article_codec as codec
+    rows = [("json", codec.FORMAT_JSON, codec.COMPRESS_NONE), ("json+zlib", codec.FORMAT_JSON, codec.COMPRESS_ZLIB)]
+    if codec.msgpack is not None:
+        rows += [("msgpack", codec.FORMAT_MSGPACK, codec.COMPRESS_NONE),
+                 ("msgpack+zlib", codec.FORMAT_MSGPACK, codec.COMPRESS_ZLIB)]
+    if codec.zstandard is not None:
+        rows.append(("msgpack+zstd" if codec.msgpack else "json+zstd",
+                     codec.FORMAT_MSGPACK if codec.msgpack else codec.FORMAT_JSON, codec.COMPRESS_ZSTD))
+    return rows
+
+
+def best_ms(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=1000)
+    parser.add_argument("--redis-url", help="로컬 redis-server (해당 DB 를 비움)")
+    args = parser.parse_args()
+    use_offline_config()
+
+    if args.redis_url:
+        from redis import Redis
+        conn = Redis.from_url(args.redis_url, decode_responses=True)
+    else:
+        import fakeredis
+        conn = fakeredis.FakeRedis(decode_responses=True)
+    conn.flushdb()
+
+    import article_codec as codec
+    from redis_maintenance import RedisMaintenance
+    from redis_manager import RedisManager
+    mgr = RedisManager(conn)
+    maint = RedisMaintenance(conn)
+    articles = build_articles(args.articles)
+    per_1000 = 1000 / len(articles)
+
+    def memory(keys):
+        values, method = maint._memory_usage(list(keys))
+        return sum(v or 0 for v in values), method
+
+    # ---------- news:* ----------
+    links = [a["originallink"] for a in articles]
+    print(f"기사 {len(articles)}건, 1,000건 기준\n")
+    print(f"{'news:* format':<16} {'bytes/1000':>11} {'vs legacy':>9}")
+    pipe = conn.pipeline(transaction=False)
+    for a in articles:
+        pipe.hset(f"news:{a['originallink']}", mapping={k: str(v) for k, v in a.items()})
+    pipe.execute()
+    legacy_bytes, method = memory(f"news:{link}" for link in links)
+    print(f"{'legacy hash':<16} {legacy_bytes * per_1000:>11,.0f} {'':>9}")
+    for name, fmt, compression in variants():
+        pipe = mgr.raw.pipeline(transaction=False)
+        for a in articles:
+            pipe.set(f"news:{a['originallink']}",
+                     codec.dumps([a.get(f) for f in codec.NEWS_FIELDS], fmt, compression))
+        pipe.execute()
+        size, _ = memory(f"news:{link}" for link in links)
+        print(f"{name:<16} {size * per_1000:>11,.0f} {size / legacy_bytes - 1:>+9.0%}")
+
+    # ---------- result:* ----------
+    print(f"\n{'result:* format':<16} {'bytes/1000':>11} {'vs legacy':>9} {'hit ms':>8}")
+    payload = {"articles": articles, "keywords": ["반도체"], "cached_at": time.time()}
+    conn.set("result:legacy", json.dumps(payload, ensure_ascii=False))
+    legacy_bytes, _ = memory(["result:legacy"])
+    legacy_ms = best_ms(lambda: mgr.get_search_result(["legacy"]))
+    print(f"{'legacy json':<16} {legacy_bytes * per_1000:>11,.0f} {'':>9} {legacy_ms:>8.2f}")
+    for name, fmt, compression in variants():
+        packed = dict(payload, articles=codec.pack_articles(articles))
+        mgr.raw.set("result:packed", codec.dumps(packed, fmt, compression))
+        size, _ = memory(["result:packed"])
+        ms = best_ms(lambda: mgr.get_search_result(["packed"]))
+        print(f"{name:<16} {size * per_1000:>11,.0f} {size / legacy_bytes - 1:>+9.0%} {ms:>8.2f}")
+
+    # ---------- articleset ----------
+    conn.hset("articleset:legacy", mapping={"links": json.dumps(links)})
+    set_id = mgr.save_article_set(articles)
+    legacy_ms = best_ms(lambda: mgr.get_article_set("legacy"))
+    new_ms = best_ms(lambda: mgr.get_article_set(set_id))
+    size, _ = memory([f"articleset:{set_id}"])
+    print(f"\narticleset 읽기: links → news:* {legacy_ms:.2f}ms, articles 값 하나 {new_ms:.2f}ms "
+          f"({size * per_1000:,.0f} bytes/1000, 현재 설정)")
+    print(f"메모리 측정: {method}")
+    conn.flushdb()
+
+
+if __name__ == "__main__":
+    main()
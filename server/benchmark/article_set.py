@@ -0,0 +1,83 @@
+# benchmark/article_set.py
+"""
+/search 뒤의 후속 요청(/keywords, /summary, /final_report): 기사 전체 재전송 vs 기사 묶음 ID(article_set_id).
+가짜 네이버 / 가짜 OpenAI / fakeredis 로 Flask 앱을 test client 로 호출하고
+요청 본문 크기, 서버 처리 시간, OpenAI 호출 수를 비교한다.
+같은 조건을 만들려고 각 방식 전에 GPT 응답 캐시를 비운다 (묶음에 저장된 키워드/요약 재사용은 ID 방식의 이점).
+
+실행: cd server && python -m benchmark.article_set
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import time
+
+from benchmark.fake_naver import FakeNaverServer
+from benchmark.fake_openai import FakeOpenAIServer
+from benchmark.offline import use_offline_config
+
+ENDPOINTS = ("/keywords", "/summary", "/keywords", "/summary")  # 같은 화면을 두 번 여는 경우
+
+
+def run_followups(client, openai, body):
+    """후속 요청들을 보내고 [(경로, 본문 바이트, 처리 ms)], OpenAI 호출 수 반환"""
+    rows, before = [], openai.requests
+    summary = ""
+    for path in ENDPOINTS:
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        t0 = time.perf_counter()
+        resp = client.post(path, data=payload, content_type="application/json")
+        rows.append((path, len(payload), (time.perf_counter() - t0) * 1000))
+        assert resp.status_code == 200, resp.get_json()
+        summary = resp.get_json().get("summary", summary)
+    report_body = {"keywords": ["반도체"], **({"summary": summary} if "articles" in body else body)}
+    payload = json.dumps(report_body, ensure_ascii=False).encode("utf-8")
+    t0 = time.perf_counter()
+    client.post("/final_report", data=payload, content_type="application/json")
+    rows.append(("/final_report", len(payload), (time.perf_counter() - t0) * 1000))
+    return rows, openai.requests - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=500)
+    parser.add_argument("--gpt-latency", type=float, default=0.3)
+    args = parser.parse_args()
+
+    naver = FakeNaverServer(total=args.articles, latency=0.0).start()
+    openai = FakeOpenAIServer(latency=args.gpt_latency).start()
+    use_offline_config(NAVER_API_URL=naver.url, OPENAI_BASE_URL=openai.base_url)
+
+    import fakeredis
+    import redis_manager
+    redis_manager._pool = fakeredis.FakeRedis(decode_responses=True).connection_pool
+    with contextlib.redirect_stdout(io.StringIO()):
+        import app as app_module
+        from gpt_cache import get_response_cache
+        client = app_module.app.test_client()
+        result = client.post("/search", json={"query_list": ["묶음"]}).get_json()
+    articles, set_id = result["articles"], result["article_set_id"]
+    print(f"기사 {len(articles)}건, article_set_id={set_id}")
+
+    totals = {}
+    for name, body in (("articles", {"articles": articles}), ("article_set_id", {"article_set_id": set_id})):
+        get_response_cache().clear()
+        with contextlib.redirect_stdout(io.StringIO()):
+            rows, calls = run_followups(client, openai, body)
+        print(f"\n[{name}]")
+        print(f"{'endpoint':<14} {'request(bytes)':>15} {'time(ms)':>9}")
+        for path, size, ms in rows:
+            print(f"{path:<14} {size:>15,} {ms:>9.0f}")
+        totals[name] = (sum(r[1] for r in rows), sum(r[2] for r in rows), calls)
+
+    print(f"\n{'mode':<15} {'upload(bytes)':>14} {'time(ms)':>9} {'openai calls':>13}")
+    for name, (size, ms, calls) in totals.items():
+        print(f"{name:<15} {size:>14,} {ms:>9.0f} {calls:>13}")
+    naver.stop()
+    openai.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+# benchmark/corpus.py
+"""
+결정적(seed 고정) 한국어 합성 뉴스 코퍼스 생성기.
+- 네이버 뉴스 API 응답(items)과 같은 필드를 만든다.
+- dup_rate 로 근접 중복 기사(같은 사건을 조금 바꿔 쓴 기사) 비율을 조절한다.
+- 각 기사에는 정답 묶음 번호(story_id)가 붙어 있어 중복 제거 품질 평가에 쓴다.
+"""
+
+import html
+import random
+import re
+from datetime import datetime, timedelta, timezone
+
+TOPICS = {
+    '경제': ['삼성전자', '반도체', '수출', '금리', '환율', '코스피', '투자', '실적', '영업이익', '시장',
+           '기준금리', '한국은행', '물가', '소비자', '성장률', '부동산', '대출', '증시', '외국인', '매출'],
+    '정치': ['국회', '대통령', '여당', '야당', '법안', '선거', '정부', '장관', '국정감사', '예산',
+           '개정안', '본회의', '원내대표', '여론조사', '공천', '청문회', '외교', '정상회담', '합의', '발표'],
+    '사회': ['경찰', '사건', '수사', '법원', '판결', '학교', '교육', '학생', '병원', '의료',
+           '지자체', '주민', '안전', '화재', '사고', '복지', '노동', '임금', '출산', '고령화'],
+    '기술': ['인공지능', '데이터', '플랫폼', '스타트업', '클라우드', '보안', '로봇', '자율주행', '배터리', '전기차',
+           '스마트폰', '서비스', '개발자', '생성형', '반도체', '통신', '메타버스', '알고리즘', '서버', '연구'],
+    '스포츠': ['야구', '축구', '감독', '선수', '경기', '우승', '리그', '시즌', '득점', '홈런',
+            '대표팀', '올림픽', '기록', '이적', '구단', '관중', '결승', '부상', '훈련', '승리'],
+}
+FILLERS = ['관련', '이번', '지난', '올해', '최근', '계획', '전망', '확대', '강화', '논의',
+           '결정', '추진', '예정', '발표했다', '밝혔다', '설명했다', '전했다', '나타났다']
+SYLLABLES = ['가', '나', '다', '라', '마', '바', '사', '아', '자', '차', '카', '타', '파', '하',
+             '민', '준', '서', '연', '지', '현', '우', '진', '성', '영', '호', '석', '훈', '희']
+PREFIXES = ['[속보]', '[단독]', '[종합]', '[포토]', '']
+_TAG = re.compile(r'<.*?>')
+PRESS = ['news.example.com', 'daily.example.co.kr', 'press.example.kr', 'media.example.net']
+
+
+def _sentence(rng, words, length):
+    return ' '.join(rng.choice(words) for _ in range(length))
+
+
+def _entity(rng):
+    """사건마다 다른 고유명사(인명/기관명 등) — 실제 기사처럼 어휘 수를 늘린다"""
+    return ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+
+
+def _perturb(rng, tokens, vocab, rate=0.15):
+    """근접 중복: 일부 단어를 바꾸거나 빼서 다시 쓴 기사"""
+    out = []
+    for tok in tokens:
+        r = rng.random()
+        if r < rate / 2:
+            continue
+        if r < rate:
+            out.append(rng.choice(vocab))
+        else:
+            out.append(tok)
+    return out
+
+
+def generate_items(n, dup_rate=0.3, seed=42, start_date=None):
+    """
+    네이버 뉴스 검색 결과 items 형식의 합성 기사 n개를 만든다.
+
+    Args:
+        n (int): 기사 수
+        dup_rate (float): 근접 중복 기사 비율 (0~1)
+        seed (int): 난수 시드
+        start_date (datetime): 가장 최근 기사 시각 (기본: 2025-01-01 09:00 KST)
+
+    Returns:
+        list[dict]: title/description/pubDate/originallink/link/story_id
+    """
+    rng = random.Random(seed)
+    kst = timezone(timedelta(hours=9))
+    now = start_date or datetime(2025, 1, 1, 9, 0, tzinfo=kst)
+    topic_names = list(TOPICS)
+
+    items = []
+    stories = []  # (story_id, topic, title_tokens, desc_tokens)
+    for i in range(n):
+        if stories and rng.random() < dup_rate:
+            story_id, topic, title_tokens, desc_tokens = rng.choice(stories)
+            vocab = TOPICS[topic] + FILLERS
+            title_tokens = _perturb(rng, title_tokens, vocab)
+            desc_tokens = _perturb(rng, desc_tokens, vocab)
+        else:
+            story_id = len(stories)
+            topic = rng.choice(topic_names)
+            entities = [_entity(rng) for _ in range(rng.randint(2, 4))]
+            entities.append(f"{rng.randint(2, 999)}억원")
+            vocab = TOPICS[topic] + FILLERS
+            title_tokens = _sentence(rng, TOPICS[topic] + entities, rng.randint(4, 7)).split()
+            desc_tokens = _sentence(rng, vocab + entities * 3, rng.randint(18, 30)).split()
+            stories.append((story_id, topic, title_tokens, desc_tokens))
+
+        keyword = title_tokens[0] if title_tokens else topic
+        title = ' '.join(title_tokens).replace(keyword, f'<b>{keyword}</b>', 1)
+        title = f"{rng.choice(PREFIXES)} {title}".strip()
+        description = ' '.join(desc_tokens) + ' &quot;' + rng.choice(FILLERS) + '&quot;'
+        pub = now - timedelta(minutes=7 * i + rng.randint(0, 6))
+        link = f"https://{rng.choice(PRESS)}/article/{seed}/{i:06d}"
+        items.append({
+            'title': title,
+            'description': description,
+            'pubDate': pub.strftime('%a, %d %b %Y %H:%M:%S %z'),
+            'originallink': link,
+            'link': link,
+            'story_id': story_id,
+        })
+    return items
+
+
+def generate_texts(n, dup_rate=0.3, seed=42):
+    """HTML 태그를 뺀 '제목 + 설명' 문자열과 정답 story_id 리스트"""
+    items = generate_items(n, dup_rate=dup_rate, seed=seed)
+    texts = [_TAG.sub('', html.unescape(it['title'] + ' ' + it['description'])) for it in items]
+    return texts, [it['story_id'] for it in items]
+
+
+def soynlp_tokenize(texts):
+    """process_news 와 같은 방식(WordExtractor → LTokenizer)으로 만든 processed_text"""
+    from soynlp.tokenizer import LTokenizer
+    from soynlp.word import WordExtractor
+
+    word_extractor = WordExtractor()
+    word_extractor.train(texts)
+    scores = {word: score.cohesion_forward for word, score in word_extractor.extract().items()}
+    tokenizer = LTokenizer(scores=scores)
+    return [' '.join(tokenizer.tokenize(t)) for t in texts]
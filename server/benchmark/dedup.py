@@ -0,0 +1,93 @@
+# benchmark/dedup.py
+"""
+중복 제거 단계 지연시간 / 최대 메모리 비교.
+- legacy: 기존 process_news 방식 (dense TF-IDF, 72회 DBSCAN + 실루엣, 중복 제거 시 재학습)
+- engine: dedup_engine (희소 float32 TF-IDF + 이웃 그래프 1회, 라벨 재사용)
+
+실행: cd server && python -m benchmark.dedup --sizes 100 500 1000
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+from sklearn.cluster import DBSCAN
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics import silhouette_score
+
+from benchmark.corpus import generate_texts
+from dedup_engine import EPS_VALUES, MIN_SAMPLES_VALUES, cluster_articles, select_representatives
+
+
+def legacy_dedup(texts):
+    """변경 전 process_news 의 파라미터 탐색 + 중복 제거 (비교 기준)"""
+    vectorizer = TfidfVectorizer()
+    tfidf_array = vectorizer.fit_transform(texts).toarray()
+    results = []
+    for eps in EPS_VALUES:
+        for min_samples in MIN_SAMPLES_VALUES:
+            clusters = DBSCAN(eps=eps, min_samples=int(min_samples),
+                              metric='cosine').fit_predict(tfidf_array)
+            num_clusters = len(set(clusters)) - (1 if -1 in clusters else 0)
+            mask = clusters != -1
+            score = None
+            if num_clusters > 1 and np.sum(mask) > 1:
+                try:
+                    score = silhouette_score(tfidf_array[mask], clusters[mask], metric='cosine')
+                except ValueError:
+                    score = None
+            results.append({'eps': eps, 'min_samples': int(min_samples),
+                            'num_clusters': num_clusters, 'silhouette_score': score})
+    ranked = pd.DataFrame(results).dropna().sort_values(by='silhouette_score', ascending=False)
+    if len(ranked) >= 2:
+        eps, min_samples = float(ranked.iloc[1]['eps']), int(ranked.iloc[1]['min_samples'])
+        nc = 2 if ranked.iloc[1]['num_clusters'] < 4 else 1
+    else:
+        eps, min_samples, nc = 0.2, 2, 1
+
+    df = pd.DataFrame({'processed_text': texts})
+    tfidf_matrix = TfidfVectorizer().fit_transform(df['processed_text'])
+    clusters = DBSCAN(eps=eps, min_samples=min_samples,
+                      metric='cosine').fit_predict(tfidf_matrix.toarray())
+    return select_representatives(df, clusters, nc)
+
+
+def engine_dedup(texts):
+    clusters, params = cluster_articles(texts)
+    df = pd.DataFrame({'processed_text': texts})
+    return select_representatives(df, clusters, params['nc'])
+
+
+def measure(fn, texts, repeat):
+    """(최소 소요 시간[s], 최대 메모리[MB], 결과 기사 수)"""
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn(texts)
+        best = min(best, time.perf_counter() - t0)
+    tracemalloc.start()
+    fn(texts)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak / 1024 / 1024, len(result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 500])
+    parser.add_argument('--dup-rate', type=float, default=0.3)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'n':>6} {'path':>8} {'time(s)':>9} {'peak(MB)':>9} {'kept':>6}")
+    for n in args.sizes:
+        texts, _ = generate_texts(n, dup_rate=args.dup_rate)
+        for name, fn in (('legacy', legacy_dedup), ('engine', engine_dedup)):
+            elapsed, peak, kept = measure(fn, texts, args.repeat)
+            print(f"{n:>6} {name:>8} {elapsed:>9.3f} {peak:>9.1f} {kept:>6}")
+
+
+if __name__ == '__main__':
+    main()
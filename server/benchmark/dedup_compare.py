@@ -0,0 +1,65 @@
+# benchmark/dedup_compare.py
+"""
+중복 제거 백엔드 품질 / 속도 비교 (고정 코퍼스).
+- 품질: 정답 story_id 기준 쌍(pair) 단위 precision / recall / F1, 두 백엔드 간 ARI
+- 속도: 백엔드별 클러스터링 소요 시간
+
+실행: cd server && python -m benchmark.dedup_compare --sizes 500 1000
+"""
+
+import argparse
+import time
+from collections import Counter
+
+import numpy as np
+from sklearn.metrics import adjusted_rand_score
+
+from benchmark.corpus import generate_texts, soynlp_tokenize
+from dedup_engine import DEDUP_BACKENDS, cluster_with_backend
+
+
+def _pairs(labels):
+    """같은 묶음으로 판정된 쌍 수 (노이즈 -1 제외)"""
+    return sum(c * (c - 1) // 2 for label, c in Counter(labels).items() if label != -1)
+
+
+def pair_scores(labels, truth):
+    """예측 라벨의 쌍 단위 precision / recall / F1 (정답: 같은 story_id 끼리가 중복)"""
+    labels = np.asarray(labels)
+    truth = np.asarray(truth)
+    predicted = _pairs(labels.tolist())
+    actual = _pairs(truth.tolist())
+    both = 0
+    for label in set(labels.tolist()) - {-1}:
+        both += _pairs(truth[labels == label].tolist())
+    precision = both / predicted if predicted else 0.0
+    recall = both / actual if actual else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return precision, recall, f1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[500, 1000])
+    parser.add_argument('--dup-rate', type=float, default=0.3)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{'n':>6} {'backend':>8} {'time(s)':>8} {'groups':>7} {'prec':>6} {'recall':>6} {'f1':>6}")
+    for n in args.sizes:
+        texts, truth = generate_texts(n, dup_rate=args.dup_rate, seed=args.seed)
+        processed = soynlp_tokenize(texts)
+        labels = {}
+        for backend in DEDUP_BACKENDS:
+            t0 = time.perf_counter()
+            clusters, params = cluster_with_backend(processed, backend)
+            elapsed = time.perf_counter() - t0
+            labels[backend] = clusters
+            precision, recall, f1 = pair_scores(clusters, truth)
+            print(f"{n:>6} {backend:>8} {elapsed:>8.3f} {params['num_clusters']:>7} "
+                  f"{precision:>6.2f} {recall:>6.2f} {f1:>6.2f}")
+        print(f"{n:>6} ARI(dbscan, minhash) = {adjusted_rand_score(labels['dbscan'], labels['minhash']):.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+# benchmark/delta_refresh.py
+"""
+반복 검색어 갱신: 매번 전체 수집 + 전체 클러스터링(DELTA_FETCH=False) vs 델타 수집 + 증분 클러스터링.
+가짜 네이버에 라운드마다 --new 건의 새 기사(최신순 맨 앞)를 추가하고, 결과 캐시 없이(use_cache=False)
+같은 검색어를 다시 돌려 'articles' 이벤트(중복 제거 결과)까지의 네이버 요청 수, 시간, CPU 시간을 잰다.
+대표 기사가 덮는 기사 묶음(story_id) 수로 중복 제거 결과가 비슷한지 확인한다.
+(full 도 라운드마다 파라미터 탐색이 eps/min_samples 를 다르게 고르면 대표 기사 수가 크게 흔들린다.
+ delta 는 클러스터 수/실루엣이 전체 클러스터링 때와 달라지면 전체 클러스터링으로 바뀐다)
+
+실행: cd server && python -m benchmark.delta_refresh --articles 500 --new 20 --rounds 5
+"""
+
+import argparse
+import contextlib
+import io
+import time
+
+from benchmark.corpus import generate_items
+from benchmark.fake_naver import FakeNaverServer
+from benchmark.offline import use_offline_config
+
+
+def run_until_articles(query, max_results):
+    from news_processor import process_news_stream
+    for event, data in process_news_stream([query], True, max_results, use_cache=False):
+        if event == "articles":
+            return data["articles"]
+
+
+def run_mode(delta, args, items, naver):
+    """라운드별 [(네이버 요청, ms, CPU ms, 대표 기사 수, 덮은 story 수)]"""
+    import config
+    import redis_manager
+    config.DELTA_FETCH = delta
+    redis_manager.RedisManager().conn.flushdb()
+    story = {it["originallink"]: it["story_id"] for it in items}
+
+    rows = []
+    for r in range(args.rounds + 1):
+        naver.httpd.items = items[(args.rounds - r) * args.new:]
+        before = naver.requests
+        t0, c0 = time.perf_counter(), time.process_time()
+        with contextlib.redirect_stdout(io.StringIO()):
+            articles = run_until_articles("델타", args.articles)
+        rows.append((naver.requests - before, (time.perf_counter() - t0) * 1000, (time.process_time() - c0) * 1000,
+                     len(articles), len({story[a["originallink"]] for a in articles})))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=500)
+    parser.add_argument("--new", type=int, default=20, help="라운드마다 추가되는 새 기사 수")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--naver-latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    items = generate_items(args.articles + args.new * args.rounds, dup_rate=0.3)
+    naver = FakeNaverServer(latency=args.naver_latency, items=list(items)).start()
+    use_offline_config(NAVER_API_URL=naver.url, DELTA_DRIFT_THRESHOLD=0.3)
+
+    import fakeredis
+    import redis_manager
+    redis_manager._pool = fakeredis.FakeRedis(decode_responses=True).connection_pool
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        run_until_articles("워밍업", args.articles)  # import / 첫 호출 비용을 라운드 0 에서 빼기
+    results = {"full": run_mode(False, args, items, naver), "delta": run_mode(True, args, items, naver)}
+    naver.stop()
+
+    print(f"기사 {args.articles}건, 라운드마다 새 기사 {args.new}건 (라운드 0 은 첫 수집)")
+    print(f"\n{'round':<6} {'mode':<6} {'naver':>6} {'ms':>8} {'cpu ms':>8} {'reps':>5} {'stories':>8}")
+    for r in range(args.rounds + 1):
+        for mode, rows in results.items():
+            calls, ms, cpu, reps, stories = rows[r]
+            print(f"{r:<6} {mode:<6} {calls:>6} {ms:>8.0f} {cpu:>8.0f} {reps:>5} {stories:>8}")
+    for mode, rows in results.items():
+        repeat = rows[1:]
+        print(f"\n{mode}: 재검색 평균 네이버 {sum(r[0] for r in repeat) / len(repeat):.1f}회, "
+              f"{sum(r[1] for r in repeat) / len(repeat):.0f}ms, CPU {sum(r[2] for r in repeat) / len(repeat):.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
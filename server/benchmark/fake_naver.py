@@ -0,0 +1,172 @@
+# benchmark/fake_naver.py
+"""
+로컬 가짜 네이버 뉴스 검색 API 서버.
+- /v1/search/news.json 을 흉내 내며 corpus.generate_items 로 만든 기사를 페이지 단위로 돌려준다.
+- latency(초) 만큼 응답을 늦추고, fail_rate 확률로 500 을 돌려줘 재시도/부분 결과를 시험할 수 있다.
+- HTTP/1.1 keep-alive 를 지원한다.
+- rate_limit(초당 요청 수)를 넘는 요청은 429 + Retry-After 로 돌려준다 (limited 에 횟수).
+- match_query=True 면 검색어의 모든 단어가 제목/설명에 들어 있는 기사만 돌려준다 (검색어마다 다른 결과).
+
+사용:
+    with FakeNaverServer(total=500, latency=0.1) as server:
+        client = NaverSearch("id", "secret", base_url=server.url)
+"""
+
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from benchmark.corpus import generate_items
+
+NEWS_PATH = "/v1/search/news.json"
+
+
+class UpstreamLimit:
+    """가짜 서버용 초당 요청 제한 (토큰 버킷). take() 가 0 이면 통과, 아니면 Retry-After 초"""
+
+    def __init__(self, rate):
+        self.rate = rate
+        self.tokens = float(rate or 0)
+        self.updated = time.monotonic()
+        self.limited = 0
+        self.lock = threading.Lock()
+
+    def take(self):
+        if not self.rate:
+            return 0.0
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            self.limited += 1
+            return (1 - self.tokens) / self.rate
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body, headers=None):
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        server = self.server
+        url = urlparse(self.path)
+        with server.lock:
+            server.requests += 1
+        if url.path != NEWS_PATH:
+            return self._send(404, {"errorMessage": "Not Found"})
+        if not self.headers.get("X-Naver-Client-Id") or not self.headers.get("X-Naver-Client-Secret"):
+            return self._send(401, {"errorMessage": "Authentication failed"})
+
+        retry_after = server.limit.take()
+        if retry_after:
+            return self._send(429, {"errorMessage": "Rate limit exceeded.", "errorCode": "012"},
+                              {"Retry-After": f"{retry_after:.2f}"})
+        if server.latency:
+            threading.Event().wait(server.latency)
+        with server.lock:
+            fail = server.rng.random() < server.fail_rate
+        if fail:
+            return self._send(500, {"errorMessage": "System error"})
+
+        params = parse_qs(url.query)
+        display = int(params.get("display", ["10"])[0])
+        start = int(params.get("start", ["1"])[0])
+        matched = server.items
+        if server.match_query:
+            words = params.get("query", [""])[0].split()
+            matched = [it for it in matched if all(w in it["title"] + it["description"] for w in words)]
+        items = matched[start - 1:start - 1 + display]
+        self._send(200, {
+            "lastBuildDate": "Wed, 01 Jan 2025 09:00:00 +0900",
+            "total": len(matched),
+            "start": start,
+            "display": len(items),
+            "items": [{k: v for k, v in it.items() if k != "story_id"} for it in items],
+        })
+
+
+class FakeNaverServer:
+    def __init__(self, total=500, latency=0.0, fail_rate=0.0, dup_rate=0.3, seed=42,
+                 host="127.0.0.1", port=0, items=None, match_query=False, rate_limit=None):
+        """
+        Args:
+            total (int): 검색 결과 전체 기사 수
+            latency (float): 페이지 응답 지연(초)
+            fail_rate (float): 500 응답 확률
+            items (list): 직접 지정할 기사 목록 (없으면 합성 코퍼스)
+            match_query (bool): 검색어 단어를 모두 포함한 기사만 응답
+            rate_limit (float): 초당 요청 한도 (넘으면 429)
+        """
+        self.httpd = ThreadingHTTPServer((host, port), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.items = items if items is not None else generate_items(total, dup_rate=dup_rate, seed=seed)
+        self.httpd.latency = latency
+        self.httpd.fail_rate = fail_rate
+        self.httpd.match_query = match_query
+        self.httpd.limit = UpstreamLimit(rate_limit)
+        self.httpd.rng = random.Random(seed)
+        self.httpd.lock = threading.Lock()
+        self.httpd.requests = 0
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}{NEWS_PATH}"
+
+    @property
+    def requests(self):
+        return self.httpd.requests
+
+    @property
+    def limited(self):
+        return self.httpd.limit.limited
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="가짜 네이버 뉴스 검색 API 서버")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--total", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.1)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    with FakeNaverServer(total=args.total, latency=args.latency, fail_rate=args.fail_rate,
+                         port=args.port) as server:
+        print(f"🟢 가짜 네이버 API: {server.url}")
+        while True:
+            time.sleep(3600)
@@ -0,0 +1,199 @@
+# benchmark/fake_openai.py
+"""
+로컬 가짜 OpenAI chat completions 서버.
+- POST /v1/chat/completions 만 흉내 낸다. 응답은 프롬프트 해시로 정해지는 결정적 문장.
+- response_format=json_object 이면 {"keywords": [...]} JSON 을 돌려준다 (extract_keywords 용).
+  프롬프트에 '키워드: [...]' 목록이 있으면 {"definitions": {키워드: 정의}} (define_keywords 일괄 모드 용).
+- stream=true 이면 SSE(data: ...) 로 content 를 몇 글자씩 나눠 token_delay(초) 간격으로 보낸다.
+- rate_limit(초당 요청 수)를 넘는 요청은 429 + Retry-After 로 돌려준다 (limited 에 횟수).
+- latency(초) 만큼 응답을 늦추고(스트리밍이면 첫 조각까지의 지연), 받은 요청 수(requests)를 센다.
+  prefill_delay(초 / 프롬프트 1,000자)로 긴 프롬프트일수록 첫 응답이 늦어지게 할 수 있다.
+- reply(요청 본문 → content)를 바꾸면 빈 응답, 깨진 JSON 등도 흉내 낼 수 있다 (테스트용).
+
+사용:
+    with FakeOpenAIServer(latency=0.5) as server:
+        use_offline_config(OPENAI_BASE_URL=server.base_url)
+"""
+
+import hashlib
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmark.fake_naver import UpstreamLimit
+
+COMPLETIONS_PATH = "/v1/chat/completions"
+KEYWORD_POOL = ['반도체', '금리', '수출', '환율', '인공지능', '부동산', '선거', '물가', '배터리', '투자']
+_DEFINE_KEYWORDS = re.compile(r"키워드: (\[.*?\])")
+
+
+def fake_reply(body):
+    """요청 본문으로 결정적인 응답 content 를 만든다."""
+    digest = hashlib.sha256(json.dumps(body.get("messages"), ensure_ascii=False).encode("utf-8")).digest()
+    if (body.get("response_format") or {}).get("type") == "json_object":
+        asked = _DEFINE_KEYWORDS.search(str(body.get("messages", [{}])[-1].get("content", "")))
+        if asked:
+            return json.dumps({"definitions": {kw: f"{kw}: 가짜 정의 {digest[:2].hex()} 문장입니다."
+                                               for kw in json.loads(asked.group(1))}}, ensure_ascii=False)
+        keywords = [KEYWORD_POOL[b % len(KEYWORD_POOL)] for b in digest[:3]]
+        return json.dumps({"keywords": keywords}, ensure_ascii=False)
+    return (f"가짜 응답 {digest[:4].hex()}: 주요 기사들의 흐름을 요약한 문장입니다. "
+            "관련 발표와 시장 반응이 이어졌습니다. 전문가들은 당분간 추이를 지켜봐야 한다고 전했습니다.")
+
+
+def split_chunks(content, size=4):
+    return [content[i:i + size] for i in range(0, len(content), size)]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body, headers=None):
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):
+        server = self.server
+        with server.lock:
+            server.requests += 1
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}")
+        if self.path != COMPLETIONS_PATH:
+            return self._send(404, {"error": {"message": "Not Found"}})
+        chars = sum(len(str(m.get("content", ""))) for m in body.get("messages", []))
+        with server.lock:
+            server.prompt_chars += chars
+
+        retry_after = server.limit.take()
+        if retry_after:
+            return self._send(429, {"error": {"message": "Rate limit reached", "type": "requests",
+                                              "code": "rate_limit_exceeded"}},
+                              {"Retry-After": f"{retry_after:.2f}"})
+        delay = server.latency + server.prefill_delay * chars / 1000
+        if delay:
+            threading.Event().wait(delay)
+        content = server.reply(body)
+        if body.get("stream"):
+            return self._stream(body, content)
+        if server.token_delay:  # 스트리밍이 아니어도 생성 시간은 같다
+            threading.Event().wait(server.token_delay * len(split_chunks(content)))
+        self._send(200, {
+            "id": f"chatcmpl-{server.requests}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "gpt-3.5-turbo"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+        })
+
+    def _stream(self, body, content):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        base = {"id": f"chatcmpl-{self.server.requests}", "object": "chat.completion.chunk",
+                "created": int(time.time()), "model": body.get("model", "gpt-3.5-turbo")}
+        chunks = [{"role": "assistant", "content": ""}] + [{"content": c} for c in split_chunks(content)]
+        for i, delta in enumerate(chunks):
+            if i and self.server.token_delay:
+                threading.Event().wait(self.server.token_delay)
+            event = {**base, "choices": [{"index": 0, "delta": delta, "finish_reason": None}]}
+            self.wfile.write(f"data: {json.dumps(event, ensure_ascii=False)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+        done = {**base, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+        self.wfile.write(f"data: {json.dumps(done)}\n\ndata: [DONE]\n\n".encode("utf-8"))
+        self.wfile.flush()
+
+
+class FakeOpenAIServer:
+    def __init__(self, latency=0.0, token_delay=0.0, host="127.0.0.1", port=0, rate_limit=None, prefill_delay=0.0,
+                 reply=fake_reply):
+        """
+        Args:
+            latency (float): 응답 지연(초)
+            token_delay (float): 스트리밍 조각 사이 지연(초)
+            rate_limit (float): 초당 요청 한도 (넘으면 429)
+            prefill_delay (float): 프롬프트 1,000자마다 더하는 응답 지연(초)
+            reply (callable): 요청 본문(dict) → 응답 content (기본 fake_reply)
+        """
+        self.httpd = ThreadingHTTPServer((host, port), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.latency = latency
+        self.httpd.token_delay = token_delay
+        self.httpd.prefill_delay = prefill_delay
+        self.httpd.reply = reply
+        self.httpd.lock = threading.Lock()
+        self.httpd.requests = 0
+        self.httpd.prompt_chars = 0
+        self.httpd.limit = UpstreamLimit(rate_limit)
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    @property
+    def requests(self):
+        return self.httpd.requests
+
+    @property
+    def prompt_chars(self):
+        return self.httpd.prompt_chars
+
+    @property
+    def reply(self):
+        return self.httpd.reply
+
+    @reply.setter
+    def reply(self, fn):
+        self.httpd.reply = fn
+
+    @property
+    def limited(self):
+        return self.httpd.limit.limited
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="가짜 OpenAI chat completions 서버")
+    parser.add_argument("--port", type=int, default=8082)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--token-delay", type=float, default=0.02)
+    args = parser.parse_args()
+    with FakeOpenAIServer(latency=args.latency, token_delay=args.token_delay, port=args.port) as server:
+        print(f"🟢 가짜 OpenAI API: {server.base_url}")
+        while True:
+            time.sleep(3600)
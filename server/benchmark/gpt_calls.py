@@ -0,0 +1,75 @@
+# benchmark/gpt_calls.py
+"""
+GPT 호출 수/지연시간: 응답 캐시 + single-flight 적용 전후.
+클라이언트가 검색 직후 /keywords 와 /summary 를 같은 기사 묶음으로 동시에 부르는 상황을
+--users 명이 같은 검색 결과를 보는 것으로 흉내 내고, 가짜 OpenAI 서버가 받은 요청 수를 센다.
+- legacy: 캐시 없이 매번 client.chat.completions.create (변경 전과 같은 조건)
+- cached: gpt_processor._chat (메모리 LRU + single-flight)
+
+실행: cd server && python -m benchmark.gpt_calls --users 8 --latency 0.5
+"""
+
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmark.corpus import generate_items
+from benchmark.fake_openai import FakeOpenAIServer
+from benchmark.offline import use_offline_config
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=8, help="같은 결과를 동시에 보는 사용자 수")
+    parser.add_argument("--articles", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.5, help="가짜 OpenAI 응답 지연(초)")
+    args = parser.parse_args()
+
+    server = FakeOpenAIServer(latency=args.latency).start()
+    use_offline_config(OPENAI_BASE_URL=server.base_url)
+    import gpt_processor
+    from gpt_cache import get_response_cache
+
+    articles = [{"title": it["title"], "description": it["description"]}
+                for it in generate_items(args.articles, seed=3)]
+
+    def legacy_chat(messages, model=gpt_processor.MODEL, accept=None, **params):
+        response = gpt_processor.client.chat.completions.create(model=model, messages=messages, **params)
+        return response.choices[0].message.content
+
+    cached_chat = gpt_processor._chat
+
+    def one_user():
+        # 화면 진입 시 /keywords, /summary 동시 호출
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            keywords = pool.submit(gpt_processor.extract_keywords, articles)
+            summary = pool.submit(gpt_processor.summarize_articles, articles)
+            return keywords.result(), summary.result()
+
+    print(f"users={args.users} articles={args.articles} latency={args.latency}s "
+          f"payload={len(json.dumps(articles, ensure_ascii=False)) // 1024}KB")
+    print(f"{'path':<8} {'upstream':>9} {'wall(ms)':>9}")
+    for name, chat in (("legacy", legacy_chat), ("cached", cached_chat)):
+        gpt_processor._chat = chat
+        get_response_cache().clear()
+        before = server.requests
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.users) as pool:
+            results = list(pool.map(lambda _: one_user(), range(args.users)))
+        elapsed = time.perf_counter() - t0
+        assert all(r == results[0] for r in results), "사용자별 결과가 달라짐"
+        print(f"{name:<8} {server.requests - before:>9} {elapsed * 1000:>9.0f}")
+
+    # 캐시가 찬 상태에서 다시 (검색 결과 Redis HIT 후 재요청)
+    t0 = time.perf_counter()
+    before = server.requests
+    one_user()
+    print(f"{'warm':<8} {server.requests - before:>9} {(time.perf_counter() - t0) * 1000:>9.0f}")
+    print("cache stats:", get_response_cache().get_stats())
+    gpt_processor._chat = cached_chat
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
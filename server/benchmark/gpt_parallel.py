@@ -0,0 +1,91 @@
+# benchmark/gpt_parallel.py
+"""
+여러 번 부르는 GPT 작업의 끝-끝 지연: 기존 순차 경로 vs 동시 실행(gpt_map) / 일괄 호출 / map-reduce 요약.
+가짜 OpenAI 서버(응답 지연 --latency + 생성 시간 --token-delay + 프롬프트 길이 비례 --prefill-delay)로 잰다.
+- define_keywords: --keywords 개 키워드 정의. sequential(기존) / concurrent / batch(호출 한 번)
+- 요약: --articles 건 (cluster 라벨 포함). single(기존, 토큰 예산을 넘으면 기사 표본만) /
+  map-reduce(묶음별 부분 요약 → 합치기)를 동시 호출 수 1 / 4 / 8 로
+  covered: 프롬프트에 실제로 들어간 기사 수 (single 은 예산 안으로 고르게 뽑은 표본)
+매 측정 전에 응답 캐시를 비운다.
+
+실행: cd server && python -m benchmark.gpt_parallel --articles 500 --keywords 8
+"""
+
+import argparse
+import contextlib
+import io
+import time
+
+from benchmark.corpus import generate_items
+from benchmark.fake_openai import FakeOpenAIServer
+from benchmark.offline import use_offline_config
+
+KEYWORDS = ['반도체', '금리', '수출', '환율', '인공지능', '부동산', '선거', '물가', '배터리', '투자', '물류', '고용']
+
+
+def measure(server, fn):
+    """(결과, 가짜 서버 요청 수, ms)"""
+    from gpt_cache import get_response_cache
+    get_response_cache().clear()
+    before = server.requests
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = fn()
+    return result, server.requests - before, (time.perf_counter() - t0) * 1000
+
+
+def covered(articles, mode, chunk_size):
+    import gpt_processor
+    from prompt_payload import build_payload
+    with contextlib.redirect_stdout(io.StringIO()):
+        if mode == "single":
+            return build_payload(articles)[1]["articles_out"]
+        return sum(build_payload(chunk)[1]["articles_out"]
+                   for chunk in gpt_processor.chunk_articles(articles, chunk_size))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=500)
+    parser.add_argument("--keywords", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.3, help="가짜 OpenAI 첫 응답 지연(초)")
+    parser.add_argument("--token-delay", type=float, default=0.02, help="응답 4글자마다 생성 시간(초)")
+    parser.add_argument("--prefill-delay", type=float, default=0.02, help="프롬프트 1,000자마다 더하는 지연(초)")
+    args = parser.parse_args()
+
+    server = FakeOpenAIServer(latency=args.latency, token_delay=args.token_delay,
+                              prefill_delay=args.prefill_delay).start()
+    config = use_offline_config(OPENAI_BASE_URL=server.base_url)
+    import gpt_processor
+
+    keywords = (KEYWORDS * (args.keywords // len(KEYWORDS) + 1))[:args.keywords]
+    keywords = [f"{kw}{i // len(KEYWORDS) or ''}" for i, kw in enumerate(keywords)]
+    context = "가짜 요약문입니다. " * 40
+    print(f"define_keywords: 키워드 {len(keywords)}개")
+    print(f"{'mode':<14} {'upstream':>9} {'ms':>8} {'failed':>7}")
+    for mode in ("sequential", "concurrent", "batch"):
+        result, calls, ms = measure(server, lambda: gpt_processor.define_keywords(keywords, context, mode))
+        failed = sum(v == "정의 생성 실패" for v in result.values())
+        print(f"{mode:<14} {calls:>9} {ms:>8.0f} {failed:>7}")
+
+    items = generate_items(args.articles, dup_rate=0.3)
+    articles = sorted(({"title": it["title"], "description": it["description"], "cluster": it["story_id"]}
+                       for it in items), key=lambda a: a["cluster"])
+    chunk_size = gpt_processor.DEFAULT_SUMMARY_CHUNK
+    print(f"\nsummarize_articles: 기사 {len(articles)}건, 묶음 {chunk_size}건 "
+          f"({len(gpt_processor.chunk_articles(articles, chunk_size))}개)")
+    print(f"{'mode':<14} {'upstream':>9} {'ms':>8} {'covered':>8} {'prompt KB':>10}")
+    for name, mode, concurrency in (("single", "single", 1), ("map-reduce x1", "map_reduce", 1),
+                                    ("map-reduce x4", "map_reduce", 4), ("map-reduce x8", "map_reduce", 8)):
+        config.GPT_SUMMARY_MODE = mode
+        config.GPT_MAX_CONCURRENCY = concurrency
+        chars = server.prompt_chars
+        summary, calls, ms = measure(server, lambda: gpt_processor.summarize_articles(articles))
+        assert summary != "요약 생성 실패"
+        print(f"{name:<14} {calls:>9} {ms:>8.0f} {covered(articles, mode, chunk_size):>8} "
+              f"{(server.prompt_chars - chars) / 1024:>10.0f}")
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
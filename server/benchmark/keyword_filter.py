@@ -0,0 +1,104 @@
+# benchmark/keyword_filter.py
+"""
+extract_keywords 후처리(입력에 이미 나오는 키워드 제외) 비교:
+모든 연속 구간 문자열 집합(변경 전) vs CandidateSpans (이어 붙인 문자열 + 경계 위치).
+- 시간, tracemalloc 최대 메모리
+- 같은 판정인지: 입력에서 뽑은 구간 / 구간 경계를 어긋난 부분 문자열 / 없는 단어를 섞은 키워드로 비교
+변경 전 방식은 후보 수 n 에 대해 O(n^2) 개 문자열, O(n^3) 글자를 만들어 --legacy-max 기사 수까지만 잰다.
+
+실행: cd server && python -m benchmark.keyword_filter --articles 10 20 40 500 --legacy-max 20
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+
+from benchmark.corpus import generate_items
+from benchmark.offline import use_offline_config
+
+
+def legacy_candidate_set(candidates):
+    def normalize(s):
+        norm = s.replace(' ', '').strip().lower()
+
+        return norm
+
+    candidate_set = set([normalize(x) for x in candidates])
+    n = len(candidates)
+    for i in range(n):
+        for j in range(i+1, n+1):
+            if j-i >= 2:
+                candidate_set.add(normalize(''.join(candidates[i:j])))     # 붙여쓰기
+                candidate_set.add(normalize(' '.join(candidates[i:j])))   # 띄어쓰기
+    return candidate_set
+
+
+def probe_keywords(candidates, rng, k=300):
+    """판정 비교용 키워드: 실제 구간(띄어쓰기/대소문자 변형), 경계가 어긋난 부분 문자열, 없는 단어"""
+    probes = []
+    n = len(candidates)
+    for _ in range(k):
+        i = rng.randrange(n)
+        j = min(n, i + rng.randint(1, 4))
+        span = candidates[i:j]
+        r = rng.random()
+        if r < 0.4:
+            probes.append(rng.choice([' ', '']).join(span).upper())
+        elif r < 0.8:
+            joined = ''.join(span)
+            a = rng.randrange(len(joined))
+            probes.append(joined[a:a + rng.randint(1, 6)])
+        else:
+            probes.append(f"없는단어{rng.randint(0, 99)}")
+    return probes
+
+
+def measure(fn):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, nargs="+", default=[10, 20, 40, 500])
+    parser.add_argument("--legacy-max", type=int, default=20)
+    args = parser.parse_args()
+
+    use_offline_config()
+    from gpt_processor import CandidateSpans, input_candidates, normalize
+
+    rng = random.Random(0)
+    print(f"{'n':>5} {'cands':>6} {'path':<7} {'build(ms)':>10} {'peak(MB)':>9} {'check(ms)':>10} {'same':>5}")
+    for n in args.articles:
+        news_data = [{"title": it["title"], "description": it["description"]}
+                     for it in generate_items(n, seed=5)]
+        candidates = input_candidates(news_data)
+        probes = probe_keywords(candidates, rng)
+
+        spans, build, peak = measure(lambda: CandidateSpans(candidates))
+        t0 = time.perf_counter()
+        verdicts = [kw in spans for kw in probes]
+        check = time.perf_counter() - t0
+        print(f"{n:>5} {len(candidates):>6} {'spans':<7} {build * 1000:>10.1f} {peak / 2**20:>9.2f} {check * 1000:>10.1f}")
+
+        if n > args.legacy_max:
+            print(f"{n:>5} {len(candidates):>6} {'legacy':<7} {'(생략)':>10}")
+            continue
+        legacy, build, peak = measure(lambda: legacy_candidate_set(candidates))
+        t0 = time.perf_counter()
+        legacy_verdicts = [normalize(kw) in legacy for kw in probes]
+        check = time.perf_counter() - t0
+        same = legacy_verdicts == verdicts
+        print(f"{n:>5} {len(candidates):>6} {'legacy':<7} {build * 1000:>10.1f} {peak / 2**20:>9.2f} {check * 1000:>10.1f}"
+              f" {str(same):>5}")
+        assert same, "판정이 다름"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# benchmark/keyword_sets.py
+"""
+여러 단어 조합 검색: 조합마다 네이버 새 검색(KEYWORD_SETS=False) vs 단어별 기사 집합의 Redis 집합 연산(keyword_sets.py).
+가짜 네이버는 검색어 단어를 모두 포함한 기사만 돌려준다 (match_query). 단어 하나짜리 검색을 먼저 돌린 뒤
+두 단어 / 세 단어 조합을 모두 검색해(파생 검색, 결과 캐시는 조합마다 처음이라 miss)
+조합 검색의 네이버 요청 수, 'articles' 까지 시간, 기사 출처(stats:combined_query)를 잰다.
+recall: 네이버가 조합 검색에 돌려줄 기사(최대 --max-results) 중 단어별 집합 연산 결과에 들어 있는 비율
+(단어마다 최신 --max-results 건만 수집하므로 기사가 많은 단어와 묶으면 오래된 기사가 빠질 수 있다)
+
+실행: cd server && python -m benchmark.keyword_sets --articles 3000
+"""
+
+import argparse
+import contextlib
+import io
+import itertools
+import time
+
+from benchmark.corpus import generate_items
+from benchmark.fake_naver import FakeNaverServer
+from benchmark.offline import use_offline_config
+
+WORDS = ['삼성전자', '반도체', '수출', '금리', '환율', '코스피']
+
+
+def run_until_articles(query_list, max_results):
+    from news_processor import process_news_stream
+    for event, data in process_news_stream(query_list, False, max_results):
+        if event == "articles":
+            return data["articles"]
+
+
+def run_mode(enabled, args, naver, combos):
+    """조합별 [(네이버 요청, ms, 대표 기사 수)] 와 출처 통계"""
+    import config
+    from redis_manager import RedisManager
+    config.KEYWORD_SETS = enabled
+    mgr = RedisManager()
+    mgr.conn.flushdb()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for word in WORDS:
+            run_until_articles([word], args.max_results)
+
+    rows = []
+    for combo in combos:
+        before = naver.requests
+        t0 = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            articles = run_until_articles(list(combo), args.max_results)
+        rows.append((naver.requests - before, (time.perf_counter() - t0) * 1000, len(articles)))
+    return rows, mgr.get_combined_stats()
+
+
+def recall(items, combos, max_results):
+    """조합별 (네이버 결과 수, 집합 연산 결과 중 네이버 결과에 든 비율) — 마지막 모드의 kwset:* 로"""
+    from keyword_sets import KeywordSets
+    from redis_manager import RedisManager
+    sets = KeywordSets(RedisManager().conn)
+    rows = []
+    for combo in combos:
+        truth = set([it["originallink"] for it in items
+                     if all(w in it["title"] + it["description"] for w in combo)][:max_results])
+        composed = set(sets.compose(combo, "and", max_results) or [])
+        rows.append((len(truth), len(composed & truth) / len(truth) if truth else 1.0))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=3000)
+    parser.add_argument("--max-results", type=int, default=500)
+    parser.add_argument("--naver-latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    items = generate_items(args.articles, dup_rate=0.3)
+    naver = FakeNaverServer(latency=args.naver_latency, items=items, match_query=True).start()
+    use_offline_config(NAVER_API_URL=naver.url)
+
+    import fakeredis
+    import redis_manager
+    redis_manager._pool = fakeredis.FakeRedis(decode_responses=True).connection_pool
+
+    combos = list(itertools.combinations(WORDS, 2)) + list(itertools.combinations(WORDS[:4], 3))
+    with contextlib.redirect_stdout(io.StringIO()):
+        run_until_articles(["워밍업"], args.max_results)  # import / 첫 호출 비용 제외
+    results = {"per-query": run_mode(False, args, naver, combos),
+               "kwset": run_mode(True, args, naver, combos)}
+    recalls = recall(items, combos, args.max_results)
+    naver.stop()
+
+    print(f"기사 {args.articles}건, 단어 {len(WORDS)}개를 먼저 검색한 뒤 조합 {len(combos)}개 검색\n")
+    print(f"{'combo':<16} {'naver(pq)':>9} {'ms(pq)':>8} {'naver(kw)':>9} {'ms(kw)':>8} "
+          f"{'reps pq/kw':>11} {'truth':>6} {'recall':>7}")
+    for i, combo in enumerate(combos):
+        pq, kw = results["per-query"][0][i], results["kwset"][0][i]
+        truth, rate = recalls[i]
+        print(f"{'+'.join(combo):<16} {pq[0]:>9} {pq[1]:>8.0f} {kw[0]:>9} {kw[1]:>8.0f} "
+              f"{f'{pq[2]}/{kw[2]}':>11} {truth:>6} {rate:>7.0%}")
+    for mode, (rows, stats) in results.items():
+        print(f"\n{mode}: 조합 검색 네이버 {sum(r[0] for r in rows)}회, 평균 {sum(r[1] for r in rows) / len(rows):.0f}ms, "
+              f"출처 {{{', '.join(f'{k}: {v}' for k, v in stats.items() if k != 'upstream_avoided_ratio')}}}, "
+              f"네이버 없이 답한 비율 {stats['upstream_avoided_ratio']:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+# benchmark/load.py
+"""
+운영 모드(serve.py) 부하 테스트.
+가짜 네이버 / 가짜 OpenAI / fakeredis 를 쓰는 앱을 werkzeug threaded 서버로 띄우고,
+--clients 개의 클라이언트가 서로 다른 검색어로 /search 를 반복 호출한다 (결과 캐시 miss → 전체 파이프라인).
+클러스터링 프로세스 수를 바꿔 가며 처리량(req/s)과 지연시간, 503/504 수를 비교한다.
+  workers=0: 클러스터링을 요청 스레드에서 실행 (GIL 경쟁, 변경 전과 같은 조건)
+  workers=N: cpu_pool 프로세스 N 개
+
+실행: cd server && python -m benchmark.load --clients 8 --requests 32 --workers 0 1 2 4
+"""
+
+import argparse
+import contextlib
+import io
+import itertools
+import logging
+import os
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from benchmark.fake_naver import FakeNaverServer
+from benchmark.fake_openai import FakeOpenAIServer
+from benchmark.offline import use_offline_config
+
+
+def run_load(url, clients, counter, end):
+    """clients 개 스레드가 검색어 번호 end 까지 /search 호출 → (경과 시간, 지연시간 목록, 상태 코드별 수)"""
+    latencies, statuses = [], {}
+    lock = threading.Lock()
+
+    def client():
+        session = requests.Session()
+        while True:
+            with lock:
+                i = next(counter)
+                if i >= end:
+                    return
+            t0 = time.perf_counter()
+            resp = session.post(f"{url}/search", json={"query_list": [f"부하{i}"]}, timeout=120)
+            elapsed = time.perf_counter() - t0
+            with lock:
+                latencies.append(elapsed)
+                statuses[resp.status_code] = statuses.get(resp.status_code, 0) + 1
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        for _ in range(clients):
+            pool.submit(client)
+    return time.perf_counter() - t0, latencies, statuses
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=32)
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 1, 2, os.cpu_count() or 1])
+    parser.add_argument("--articles", type=int, default=500)
+    parser.add_argument("--naver-latency", type=float, default=0.1)
+    parser.add_argument("--gpt-latency", type=float, default=0.3)
+    parser.add_argument("--max-inflight", type=int, default=16)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    naver = FakeNaverServer(total=args.articles, latency=args.naver_latency).start()
+    openai = FakeOpenAIServer(latency=args.gpt_latency).start()
+    use_offline_config(NAVER_API_URL=naver.url, OPENAI_BASE_URL=openai.base_url)
+
+    import fakeredis
+    import redis_manager
+    from werkzeug.serving import make_server
+
+    redis_manager._pool = fakeredis.FakeRedis(decode_responses=True).connection_pool
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)  # 요청 로그 생략
+    with contextlib.redirect_stdout(io.StringIO()):
+        import app as app_module
+        import cpu_pool
+        import serve
+        import startup
+        startup.warm_up()
+    flask_app = app_module.app
+    base_wsgi = flask_app.wsgi_app
+
+    print(f"cpu={os.cpu_count()} clients={args.clients} requests={args.requests} "
+          f"max_inflight={args.max_inflight}")
+    print(f"{'workers':>7} {'req/s':>7} {'p50(ms)':>8} {'p95(ms)':>8} {'status':>20}")
+    offset = 0
+    for workers in args.workers:
+        with contextlib.redirect_stdout(io.StringIO()):
+            cpu_pool.configure(workers=workers, timeout=args.timeout)
+            pool = cpu_pool.get_pool()
+            if pool is not None:  # 워커 기동 시간은 측정에서 뺀다
+                list(pool.map(cpu_pool.cluster_with_backend, [["워커 준비", "워커 준비 완료"]] * workers))
+        flask_app.wsgi_app = serve.GuardedApp(base_wsgi, max_inflight=args.max_inflight, timeout=args.timeout)
+        server = make_server("127.0.0.1", 0, flask_app, threaded=True)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        url = f"http://127.0.0.1:{server.server_port}"
+
+        counter = itertools.count(offset)
+        offset += args.requests
+        with contextlib.redirect_stdout(io.StringIO()):
+            elapsed, latencies, statuses = run_load(url, args.clients, counter, offset)
+        server.shutdown()
+        latencies.sort()
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        status_text = ", ".join(f"{k}:{v}" for k, v in sorted(statuses.items()))
+        print(f"{workers:>7} {len(latencies) / elapsed:>7.2f} {statistics.median(latencies) * 1000:>8.0f}"
+              f" {p95 * 1000:>8.0f} {status_text:>20}")
+    cpu_pool.shutdown()
+    naver.stop()
+    openai.stop()
+
+
+if __name__ == "__main__":
+    main()
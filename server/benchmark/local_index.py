@@ -0,0 +1,73 @@
+# benchmark/local_index.py
+"""
+파생(토글) 검색 지연시간: 로컬 역색인 vs 네이버 재호출.
+가짜 네이버 서버(페이지 지연 --latency)와 fakeredis 를 쓰고, GPT 키워드 추출은 고정 응답으로 대체한다.
+1) 최초 검색으로 기사 저장 + 색인
+2) 파생 검색어 조합들을 (a) 색인 사용 (b) 색인 미사용(기존 방식) 으로 각각 실행
+결과 캐시(result:*)는 매 검색 전에 지워 파이프라인 자체를 잰다.
+
+실행: cd server && python -m benchmark.local_index --latency 0.15
+"""
+
+import argparse
+import contextlib
+import io
+import statistics
+import time
+
+from benchmark.fake_naver import FakeNaverServer
+from benchmark.offline import use_offline_config
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.15, help="네이버 페이지 응답 지연(초)")
+    parser.add_argument("--min-results", type=int, default=20, help="LOCAL_INDEX_MIN_RESULTS")
+    args = parser.parse_args()
+
+    server = FakeNaverServer(total=args.articles, latency=args.latency).start()
+    use_offline_config(NAVER_API_URL=server.url, LOCAL_INDEX_MIN_RESULTS=args.min_results)
+
+    import fakeredis
+    import news_processor
+    import redis_manager
+
+    conn = fakeredis.FakeRedis(decode_responses=True)
+    redis_manager._pool = conn.connection_pool
+    news_processor.extract_keywords = lambda articles: ["반도체", "금리"]
+
+    def run(query_list, is_initial, use_index=True):
+        for key in conn.scan_iter("result:*"):
+            conn.delete(key)
+        requests_before = server.requests
+        t0 = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            original = news_processor.search_local_corpus
+            if not use_index:  # 기존 방식: 색인 조회 없이 바로 네이버
+                news_processor.search_local_corpus = lambda *a, **k: None
+            try:
+                result = news_processor.process_news(query_list, is_initial)
+            finally:
+                news_processor.search_local_corpus = original
+        return time.perf_counter() - t0, len(result["articles"]), server.requests - requests_before
+
+    elapsed, kept, calls = run(["삼성전자"], True)
+    print(f"최초 검색: {elapsed * 1000:.0f} ms, 기사 {kept}건, 네이버 호출 {calls}회")
+
+    derived = [["삼성전자", "반도체"], ["삼성전자", "투자"], ["반도체", "수출"], ["금리", "시장"], ["경찰", "수사"]]
+    print(f"파생 검색 (색인 결과 {args.min_results}건 미만이면 네이버로 대체)")
+    print(f"{'query':<16} {'path':<8} {'ms':>8} {'기사':>5} {'naver':>6}")
+    totals = {"index": [], "naver": []}
+    for query_list in derived:
+        for path, use_index in (("index", True), ("naver", False)):
+            elapsed, kept, calls = run(query_list, False, use_index)
+            totals[path].append(elapsed)
+            print(f"{' '.join(query_list):<16} {path:<8} {elapsed * 1000:>8.0f} {kept:>5} {calls:>6}")
+    for path, times in totals.items():
+        print(f"median {path}: {statistics.median(times) * 1000:.0f} ms")
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# benchmark/naver_fetch.py
+"""
+네이버 뉴스 수집 단계의 cold 검색 지연시간 비교 (로컬 가짜 네이버 서버 사용).
+- legacy: 변경 전 process_news 방식 (페이지마다 새 urllib 연결, 순차 요청, 첫 오류에서 중단)
+- pooled: NaverSearch.fetch_news (keep-alive 풀, fan_out 동시 요청, 페이지별 재시도)
+
+실행: cd server && python -m benchmark.naver_fetch --latency 0.15 --fail-rate 0.1
+"""
+
+import argparse
+import json
+import statistics
+import time
+import urllib.parse
+import urllib.request
+
+from benchmark.fake_naver import FakeNaverServer
+from naver_search import NaverSearch
+
+
+def legacy_fetch(url, query, max_results=500, display=100, sort="date"):
+    """변경 전 process_news 의 수집 루프 (비교 기준)"""
+    enc_text = urllib.parse.quote(query)
+    all_results = []
+    for start in range(1, max_results + 1, display):
+        request = urllib.request.Request(
+            f"{url}?query={enc_text}&display={display}&start={start}&sort={sort}")
+        request.add_header("X-Naver-Client-Id", "bench")
+        request.add_header("X-Naver-Client-Secret", "bench")
+        try:
+            response = urllib.request.urlopen(request)
+            result = json.loads(response.read().decode("utf-8"))
+            all_results.extend(result.get("items", []))
+        except Exception:
+            break
+    return all_results
+
+
+def run(label, fn, repeat):
+    times, counts = [], []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        counts.append(len(fn()))
+        times.append(time.perf_counter() - t0)
+    print(f"{label:<28} median {statistics.median(times) * 1000:>8.1f} ms"
+          f"   기사 {min(counts)}~{max(counts)}건")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--total", type=int, default=500, help="가짜 서버의 검색 결과 수")
+    parser.add_argument("--max-results", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.15, help="페이지 응답 지연(초)")
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with FakeNaverServer(total=args.total, latency=args.latency, fail_rate=args.fail_rate) as server:
+        print(f"total={args.total} latency={args.latency}s fail_rate={args.fail_rate}")
+        run("legacy (urllib, 순차)", lambda: legacy_fetch(server.url, "삼성전자", args.max_results), args.repeat)
+        for fan_out in (1, 5):
+            def cold_fetch():
+                # cold 검색: 매번 새 클라이언트 (커넥션 풀도 비어 있는 상태)
+                client = NaverSearch("bench", "bench", base_url=server.url,
+                                     fan_out=fan_out, backoff=0.05)
+                try:
+                    return client.fetch_news("삼성전자", max_results=args.max_results)
+                finally:
+                    client.close()
+            run(f"pooled fan_out={fan_out} (cold)", cold_fetch, args.repeat)
+
+        warm = NaverSearch("bench", "bench", base_url=server.url, backoff=0.05)
+        run("pooled fan_out=5 (warm)", lambda: warm.fetch_news("삼성전자", max_results=args.max_results),
+            args.repeat)
+        warm.close()
+        print(f"가짜 서버가 받은 요청 수: {server.requests}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+# benchmark/offline.py
+"""
+실제 인증 정보 없이 서버 모듈을 import 하기 위한 오프라인 설정.
+config.py 대신 가짜 값이 담긴 config 모듈을 sys.modules 에 등록한다.
+반드시 redis_manager / gpt_processor / news_processor 를 import 하기 전에 호출할 것.
+"""
+
+import sys
+import types
+
+DEFAULTS = {
+    'NAVER_CLIENT_ID': 'offline',
+    'NAVER_CLIENT_SECRET': 'offline',
+    'OPENAI_API_KEY': 'sk-offline',
+    'REDIS_HOST': 'localhost',
+    'REDIS_PORT': 6379,
+    'REDIS_DB': 0,
+    'RATE_LIMIT': False,  # 파이프라인 측정이 upstream 속도 제한에 묶이지 않도록 (benchmark.rate_limit 에서만 켬)
+}
+
+
+def use_offline_config(**overrides):
+    """가짜 config 모듈을 등록하고 반환한다. overrides 로 값(NAVER_API_URL 등)을 바꿀 수 있다."""
+    config = types.ModuleType('config')
+    for key, value in {**DEFAULTS, **overrides}.items():
+        setattr(config, key, value)
+    sys.modules['config'] = config
+    return config
@@ -0,0 +1,61 @@
+# benchmark/prompt_tokens.py
+"""
+GPT 입력 토큰: 기사 dict 전체 json.dumps (변경 전) vs prompt_payload.build_payload.
+/search 응답 그대로(title/description/pubDate/originallink/text/processed_text/cluster)를
+클라이언트가 /keywords, /summary 로 보내는 상황을 흉내 낸다.
+tiktoken 이 없으면 prompt_payload 의 근사 토큰 수를 쓴다.
+
+실행: cd server && python -m benchmark.prompt_tokens --articles 100 500 --budget 6000
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import time
+
+from benchmark.corpus import generate_items
+from benchmark.offline import use_offline_config
+
+
+def search_records(n):
+    """/search 응답의 articles 와 같은 모양의 기사 목록"""
+    records = []
+    for i, item in enumerate(generate_items(n, dup_rate=0.3, seed=11)):
+        text = f"{item['title']} {item['description']}"
+        records.append({
+            "title": item["title"],
+            "description": item["description"],
+            "pubDate": item["pubDate"],
+            "originallink": item["originallink"],
+            "text": text,
+            "processed_text": text,
+            "cluster": item["story_id"],
+        })
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, nargs="+", default=[100, 500])
+    parser.add_argument("--budget", type=int, default=6000)
+    args = parser.parse_args()
+
+    use_offline_config(GPT_PROMPT_TOKEN_BUDGET=args.budget)
+    from prompt_payload import build_payload, count_tokens
+
+    print(f"budget={args.budget}")
+    print(f"{'n':>5} {'legacy tok':>11} {'payload tok':>12} {'saved':>7} {'articles':>10} {'build(ms)':>10}")
+    for n in args.articles:
+        records = search_records(n)
+        legacy = count_tokens(json.dumps(records, ensure_ascii=False))
+        t0 = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            payload, report = build_payload(records)
+        elapsed = time.perf_counter() - t0
+        print(f"{n:>5} {legacy:>11} {report['tokens_after']:>12} {report['tokens_saved'] / legacy:>7.0%}"
+              f" {report['articles_in']:>4} → {report['articles_out']:<4} {elapsed * 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+# benchmark/query_keywords.py
+"""
+검색어(자연어 문장) → 핵심 키워드 추출의 정확도 / 지연시간 비교.
+- legacy_regex: 변경 전 fallback (정규식 단어 + 불용어/질문어 제거, 조사 그대로)
+- regex: 정규식 fast path (조사 떼기 추가)
+- okt: konlpy Okt 명사 추출 (konlpy 가 설치돼 있을 때만)
+- memo: 같은 검색어 반복 (LRU hit)
+- batch: extract_keywords_batch 로 전체 검색어를 한 번에 (memo 비운 뒤)
+정확도는 손으로 붙인 정답 키워드 집합 대비 precision / recall / 완전 일치 비율.
+
+실행: cd server && python -m benchmark.query_keywords --repeat 200
+"""
+
+import argparse
+import re
+import time
+
+import keyword_extractor as ke
+
+# (검색어, 정답 키워드)
+LABELED = [
+    ("삼성전자 주가는 어떻게 돼?", {"삼성전자", "주가"}),
+    ("한국은행 기준금리 인상 전망 알려줘", {"한국은행", "기준금리", "인상", "전망"}),
+    ("요즘 부동산 시장이 왜 이렇게 불안해", {"부동산", "시장"}),
+    ("테슬라 전기차 판매량", {"테슬라", "전기차", "판매량"}),
+    ("대통령의 외교 일정이 궁금해", {"대통령", "외교", "일정"}),
+    ("손흥민 이적설", {"손흥민", "이적설"}),
+    ("국회에서 통과된 법안 뭐야", {"국회", "통과", "법안"}),
+    ("환율이 오르면 수출 기업은 어떻게 될까", {"환율", "수출", "기업"}),
+    ("인공지능 규제 법안 논의", {"인공지능", "규제", "법안", "논의"}),
+    ("카카오와 네이버의 실적 비교", {"카카오", "네이버", "실적", "비교"}),
+    ("서울 아파트 전세 가격 하락", {"서울", "아파트", "전세", "가격", "하락"}),
+    ("반도체 수출 실적", {"반도체", "수출", "실적"}),
+    ("민주주의 위기에 대한 전문가 의견", {"민주주의", "위기", "전문가", "의견"}),
+    ("코스피 3000 돌파 가능성", {"코스피", "3000", "돌파", "가능성"}),
+    ("어린이 보호구역 교통사고", {"어린이", "보호구역", "교통사고"}),
+    ("물가 상승률이 가장 높은 나라", {"물가", "상승률", "나라"}),
+    ("SK하이닉스 HBM 공급 계약", {"SK", "하이닉스", "HBM", "공급", "계약"}),
+    ("의대 증원 갈등은 언제 끝나", {"의대", "증원", "갈등"}),
+    ("프로야구 개막전 관중 기록", {"프로야구", "개막전", "관중", "기록"}),
+    ("기후변화로 인한 폭염 피해", {"기후변화", "폭염", "피해"}),
+    ("미국 대선 결과가 한국 경제에 미치는 영향", {"미국", "대선", "결과", "한국", "경제", "영향"}),
+    ("비트코인 가격은 왜 떨어졌어", {"비트코인", "가격"}),
+    ("전문가가 본 저출산 대책", {"전문가", "저출산", "대책"}),
+    ("제주도 관광객 증가", {"제주도", "관광객", "증가"}),
+]
+
+_LEGACY_QUESTION = set(['어떻게', '왜', '뭐', '무엇', '누구', '언제', '어디', '될까', '되나', '되니', '되냐', '되나요',
+                        '되었나', '되었나요', '궁금', '알려줘', '알고싶', '싶다', '싶어요', '싶니', '싶나요', '있나요', '있니', '있나'])
+
+
+def legacy_regex(text, top_k=10):
+    """변경 전 keyword_extractor fallback (비교 기준)"""
+    candidates = re.findall(r'[가-힣]{2,}|[a-zA-Z0-9]{2,}', text)
+    filtered = [w for w in candidates if w not in ke.stopwords and w not in _LEGACY_QUESTION]
+    return list(dict.fromkeys(filtered))[:top_k]
+
+
+def score(fn):
+    tp = fp = fn_ = exact = 0
+    for query, expected in LABELED:
+        got = set(fn(query))
+        tp += len(got & expected)
+        fp += len(got - expected)
+        fn_ += len(expected - got)
+        exact += got == expected
+    return tp / max(1, tp + fp), tp / max(1, tp + fn_), exact / len(LABELED)
+
+
+def latency_us(fn, repeat):
+    queries = [q for q, _ in LABELED]
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for q in queries:
+            fn(q)
+    return (time.perf_counter() - t0) / (repeat * len(queries)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    methods = [('legacy_regex', legacy_regex), ('regex', ke.regex_keywords)]
+    if ke.okt_available():
+        t0 = time.perf_counter()
+        ke.warm_up()
+        print(f"Okt 기동(JVM): {(time.perf_counter() - t0) * 1000:.0f}ms")
+        methods.append(('okt', ke.okt_keywords))
+    else:
+        print("konlpy 미설치: okt 비교 생략")
+
+    print(f"검색어 {len(LABELED)}개")
+    print(f"{'method':<13} {'precision':>9} {'recall':>7} {'exact':>6} {'us/query':>9}")
+    for name, fn in methods:
+        precision, recall, exact = score(fn)
+        print(f"{name:<13} {precision:>9.2f} {recall:>7.2f} {exact:>6.2f} {latency_us(fn, args.repeat):>9.1f}")
+
+    mode = 'okt' if ke.okt_available() else 'regex'
+    ke.extract_keywords_batch([q for q, _ in LABELED], mode=mode)
+    print(f"{'memo':<13} {'':>9} {'':>7} {'':>6} {latency_us(lambda q: ke.extract_keywords(q, mode=mode), args.repeat):>9.1f}")
+
+    queries = [q for q, _ in LABELED]
+    best = float('inf')
+    for _ in range(max(1, args.repeat // 20)):
+        ke.clear_memo()
+        t0 = time.perf_counter()
+        ke.extract_keywords_batch(queries, mode=mode)
+        best = min(best, time.perf_counter() - t0)
+    print(f"{'batch':<13} {'':>9} {'':>7} {'':>6} {best / len(queries) * 1e6:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
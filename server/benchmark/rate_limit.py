@@ -0,0 +1,142 @@
+# benchmark/rate_limit.py
+"""
+워커 간 공유 속도 제한(rate_limiter.py) 켜기/끄기 비교.
+초당 한도를 넘으면 429 + Retry-After 를 돌려주는 가짜 네이버(--naver-rate)와 가짜 OpenAI(--openai-rate),
+프로세스 간 공유 Redis 로 fakeredis TCP 서버를 띄우고, --workers 개의 워커 프로세스가 각각 --threads 개 스레드로
+--duration 초 동안 네이버 페이지 요청을 보낸다 (--gpt-every 번째 요청마다 GPT 호출 한 번).
+스레드 중 하나는 background 우선순위(refresher 갱신과 같은 경로)로 보낸다.
+  upstream 요청 수 / 429 수: 가짜 서버가 받은 요청 (재시도 포함)
+  성공/실패, 성공 처리량, 지연 p50/p95: 호출한 쪽에서 잰 값 (재시도·대기 포함)
+제한을 끄면 각 워커가 따로 재시도(backoff + Retry-After)하고, 켜면 Redis 토큰 버킷을 함께 쓴다.
+
+실행: cd server && python -m benchmark.rate_limit --workers 4 --threads 4 --duration 10
+"""
+
+import argparse
+import contextlib
+import io
+import multiprocessing
+import threading
+import time
+import uuid
+
+from benchmark.fake_naver import FakeNaverServer
+from benchmark.fake_openai import FakeOpenAIServer
+from benchmark.offline import use_offline_config
+
+
+def worker(index, args, urls, enabled, results):
+    """워커 프로세스 하나: 스레드마다 [(upstream, 우선순위, 성공, 초)]"""
+    naver_url, openai_url, redis_port = urls
+    use_offline_config(NAVER_API_URL=naver_url, OPENAI_BASE_URL=openai_url,
+                       REDIS_HOST="127.0.0.1", REDIS_PORT=redis_port,
+                       RATE_LIMIT=enabled, NAVER_RATE=args.naver_rate, NAVER_BURST=args.naver_rate,
+                       OPENAI_RATE=args.openai_rate, OPENAI_BURST=args.openai_rate,
+                       RATE_LIMIT_BACKGROUND_TIMEOUT=args.background_timeout)
+    import gpt_processor
+    from news_processor import get_naver_client
+    from rate_limiter import BACKGROUND, INTERACTIVE, priority
+    client = get_naver_client()
+    stop_at = time.monotonic() + args.duration
+    rows = []
+    lock = threading.Lock()
+
+    def run(thread, prio):
+        with priority(prio):
+            n = 0
+            while time.monotonic() < stop_at:
+                n += 1
+                gpt = args.gpt_every and n % args.gpt_every == 0
+                t0 = time.perf_counter()
+                try:
+                    if gpt:
+                        # 응답 캐시를 거치지 않도록 매번 다른 프롬프트
+                        gpt_processor._create(model=gpt_processor.MODEL,
+                                              messages=[{"role": "user", "content": uuid.uuid4().hex}])
+                        ok = True
+                    else:
+                        ok = "error" not in client.search(f"부하{index}-{thread}", display=100, start=1, sort="date")
+                except Exception:
+                    ok = False
+                with lock:
+                    rows.append(("openai" if gpt else "naver", prio, ok, time.perf_counter() - t0))
+                time.sleep(args.think)
+
+    threads = [threading.Thread(target=run, args=(t, BACKGROUND if t == 0 else INTERACTIVE))
+               for t in range(args.threads)]
+    with contextlib.redirect_stdout(io.StringIO()):
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    results.put(rows)
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def run_mode(enabled, args, naver, openai, redis_port):
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    before = (naver.requests, naver.limited, openai.requests, openai.limited)
+    procs = [ctx.Process(target=worker, args=(i, args, (naver.url, openai.base_url, redis_port), enabled, results))
+             for i in range(args.workers)]
+    t0 = time.perf_counter()
+    for p in procs:
+        p.start()
+    rows = [row for _ in procs for row in results.get()]
+    for p in procs:
+        p.join()
+    elapsed = time.perf_counter() - t0
+    upstream = {"naver": (naver.requests - before[0], naver.limited - before[1]),
+                "openai": (openai.requests - before[2], openai.limited - before[3])}
+    return rows, upstream, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--think", type=float, default=0.05, help="스레드마다 호출 사이 쉬는 시간(초)")
+    parser.add_argument("--gpt-every", type=int, default=4)
+    parser.add_argument("--naver-rate", type=float, default=10)
+    parser.add_argument("--openai-rate", type=float, default=3)
+    parser.add_argument("--background-timeout", type=float, default=5.0)
+    args = parser.parse_args()
+
+    from fakeredis import TcpFakeServer
+    redis_server = TcpFakeServer(("127.0.0.1", 0), server_type="redis")
+    threading.Thread(target=redis_server.serve_forever, daemon=True).start()
+    redis_port = redis_server.server_address[1]
+    naver = FakeNaverServer(total=100, latency=0.05, rate_limit=args.naver_rate).start()
+    openai = FakeOpenAIServer(latency=0.2, rate_limit=args.openai_rate).start()
+
+    print(f"워커 {args.workers}개 × 스레드 {args.threads}개 (스레드 하나는 background), {args.duration:.0f}초, "
+          f"upstream 한도 네이버 {args.naver_rate:g}/s, OpenAI {args.openai_rate:g}/s\n")
+    print(f"{'mode':<6} {'upstream':<7} {'sent':>6} {'429':>6} {'priority':<12} {'ok':>5} {'fail':>5} "
+          f"{'fail%':>6} {'ok/s':>6} {'p50 ms':>8} {'p95 ms':>8}")
+    for enabled in (False, True):
+        rows, upstream, _ = run_mode(enabled, args, naver, openai, redis_port)
+        mode = "on" if enabled else "off"
+        for name in ("naver", "openai"):
+            sent, limited = upstream[name]
+            for prio in ("interactive", "background"):
+                picked = [r for r in rows if r[0] == name and r[1] == prio]
+                ok = [r[3] for r in picked if r[2]]
+                fail = len(picked) - len(ok)
+                print(f"{mode:<6} {name:<7} {sent:>6} {limited:>6} {prio:<12} {len(ok):>5} {fail:>5} "
+                      f"{fail / max(1, len(picked)):>6.0%} {len(ok) / args.duration:>6.1f} "
+                      f"{percentile(ok, 0.5) * 1000:>8.0f} {percentile(ok, 0.95) * 1000:>8.0f}")
+                sent = limited = ""
+    naver.stop()
+    openai.stop()
+    redis_server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# benchmark/redis_io.py
+"""
+RedisManager 왕복(round trip) 횟수 / 지연시간 비교.
+- legacy: 변경 전 방식 (기사마다 hmset + expire, 캐시 hit 시 링크마다 hgetall)
+- batched: RedisManager 파이프라인 API (저장/조회 모두 왕복 횟수 고정)
+
+기본은 fakeredis 에 왕복마다 --rtt-ms 만큼 지연을 더해 네트워크를 흉내 낸다.
+로컬 redis-server 가 있으면 --redis-url redis://localhost:6379/15 로 실제 서버에서 잰다.
+
+실행: cd server && python -m benchmark.redis_io --articles 500 --rtt-ms 0.3
+"""
+
+import argparse
+import time
+
+import redis
+
+from benchmark.corpus import generate_items
+from benchmark.offline import use_offline_config
+
+use_offline_config()
+from redis_manager import RedisManager, KEYWORD_TTL, NEWS_TTL  # noqa: E402
+
+
+class RoundTripCounter:
+    """커넥션에서 명령 패킷을 보낼 때마다(= 왕복 1회) 세고, 필요하면 지연을 더한다."""
+
+    def __init__(self, rtt=0.0):
+        self.rtt = rtt
+        self.count = 0
+        self._orig = redis.connection.AbstractConnection.send_packed_command
+
+    def __enter__(self):
+        counter = self
+
+        def send_packed_command(conn, *args, **kwargs):
+            counter.count += 1
+            if counter.rtt:
+                time.sleep(counter.rtt)
+            return counter._orig(conn, *args, **kwargs)
+
+        redis.connection.AbstractConnection.send_packed_command = send_packed_command
+        return self
+
+    def __exit__(self, *exc):
+        redis.connection.AbstractConnection.send_packed_command = self._orig
+
+
+def legacy_save(conn, keyword, articles):
+    links = [a['originallink'] for a in articles]
+    conn.sadd(f"keyword:{keyword}", *links)
+    conn.expire(f"keyword:{keyword}", KEYWORD_TTL)
+    for article in articles:
+        conn.hset(f"news:{article['originallink']}", mapping=article)
+        conn.expire(f"news:{article['originallink']}", NEWS_TTL)
+
+
+def legacy_load(conn, keyword):
+    articles = []
+    for link in conn.smembers(f"keyword:{keyword}"):
+        article = conn.hgetall(f"news:{link}")
+        if article:
+            articles.append(article)
+    return articles
+
+
+def batched_save(mgr, keyword, articles):
+    mgr.save_keywords([keyword], [a['originallink'] for a in articles])
+    mgr.save_news_articles(articles)
+
+
+def batched_load(mgr, keyword):
+    return mgr.get_news_articles(mgr.get_keyword_links(keyword))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=500)
+    parser.add_argument("--rtt-ms", type=float, default=0.3, help="fakeredis 왕복마다 더할 지연(ms)")
+    parser.add_argument("--redis-url", default=None, help="실제 redis-server 주소 (없으면 fakeredis)")
+    args = parser.parse_args()
+
+    if args.redis_url:
+        conn = redis.Redis.from_url(args.redis_url, decode_responses=True)
+        rtt = 0.0
+    else:
+        import fakeredis
+        conn = fakeredis.FakeRedis(decode_responses=True)
+        rtt = args.rtt_ms / 1000
+    mgr = RedisManager(conn=conn)
+
+    articles = [{k: str(v) for k, v in it.items() if k != 'link'}
+                for it in generate_items(args.articles)]
+    print(f"articles={args.articles} backend={'redis-server' if args.redis_url else 'fakeredis'}"
+          f" rtt={rtt * 1000:.2f}ms")
+    print(f"{'operation':<16} {'round trips':>12} {'time(ms)':>10}")
+    cases = [
+        ("legacy save", lambda: legacy_save(conn, "bench-legacy", articles)),
+        ("legacy load", lambda: legacy_load(conn, "bench-legacy")),
+        ("batched save", lambda: batched_save(mgr, "bench-batched", articles)),
+        ("batched load", lambda: batched_load(mgr, "bench-batched")),
+    ]
+    for name, fn in cases:
+        with RoundTripCounter(rtt) as counter:
+            t0 = time.perf_counter()
+            result = fn()
+            elapsed = time.perf_counter() - t0
+        if result is not None:
+            assert len(result) == args.articles, f"{name}: {len(result)}건"
+        print(f"{name:<16} {counter.count:>12} {elapsed * 1000:>10.1f}")
+
+    for key in conn.scan_iter("keyword:bench-*"):
+        conn.delete(key)
+    conn.delete(*[f"news:{a['originallink']}" for a in articles])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+# benchmark/redis_maintenance.py
+"""
+Redis 정리: 기존 clear_redis.py (KEYS + 키마다 DEL) vs RedisMaintenance.clear (SCAN + 파이프라인 UNLINK),
+그리고 고아 기사 회수(gc) 결과 확인.
+--keys 개의 news:* 와 keyword:* 를 만들고 각 방식의 전체 시간, 왕복 수, 가장 오래 걸린 명령 하나의 시간을 잰다.
+(KEYS 는 키 전체를 한 번에 훑는 명령이라 그동안 다른 클라이언트가 기다린다 → '최대 명령(ms)')
+기본은 fakeredis, --redis-url redis://localhost:6379/15 로 로컬 redis-server 에서도 잴 수 있다 (해당 DB 를 비움).
+
+실행: cd server && python -m benchmark.redis_maintenance --keys 50000
+"""
+
+import argparse
+import time
+
+from benchmark.offline import use_offline_config
+
+
+def populate(conn, keys):
+    """news:* keys 개 (keyword:* 가 앞쪽 절반만 가리킴, 나머지는 오래된 고아 기사)"""
+    from redis_manager import NEWS_TTL
+    conn.flushdb()
+    pipe = conn.pipeline(transaction=False)
+    for i in range(keys):
+        link = f"https://news.example.com/{i}"
+        pipe.hset(f"news:{link}", mapping={"title": f"기사 {i}", "description": "본문 " * 40, "originallink": link})
+        pipe.expire(f"news:{link}", NEWS_TTL - 3600)
+        if i < keys // 2:
+            pipe.sadd(f"keyword:키워드{i % 100}", link)
+        if i % 1000 == 999:
+            pipe.execute()
+    pipe.execute()
+
+
+class Timed:
+    """conn 메서드 호출(파이프라인 execute 포함) 수와 가장 오래 걸린 호출 시간을 센다"""
+
+    def __init__(self):
+        self.calls = 0
+        self.longest = 0.0
+
+    def wrap(self, fn):
+        def wrapper(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.calls += 1
+                self.longest = max(self.longest, time.perf_counter() - t0)
+        return wrapper
+
+
+def legacy_clear(conn, timer):
+    keys = timer.wrap(conn.keys)
+    delete = timer.wrap(conn.delete)
+    deleted = 0
+    for key in keys("keyword:*") + keys("news:*"):
+        delete(key)
+        deleted += 1
+    return deleted
+
+
+def maintenance_clear(conn, timer):
+    from redis import Redis
+    from redis_maintenance import RedisMaintenance
+    maint = RedisMaintenance(Redis(connection_pool=conn.connection_pool))  # 계측용 래퍼를 붙일 별도 클라이언트
+    maint.conn.scan = timer.wrap(maint.conn.scan)
+    pipeline = maint.conn.pipeline
+
+    def timed_pipeline(*args, **kwargs):
+        pipe = pipeline(*args, **kwargs)
+        pipe.execute = timer.wrap(pipe.execute)
+        return pipe
+    maint.conn.pipeline = timed_pipeline
+    return sum(maint.clear(["keyword:*", "news:*"]).values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--keys", type=int, default=50000)
+    parser.add_argument("--redis-url", help="로컬 redis-server (해당 DB 를 비움)")
+    args = parser.parse_args()
+    use_offline_config()
+
+    if args.redis_url:
+        from redis import Redis
+        conn = Redis.from_url(args.redis_url, decode_responses=True)
+    else:
+        import fakeredis
+        conn = fakeredis.FakeRedis(decode_responses=True)
+
+    print(f"news:* {args.keys}개 + keyword:* 100개")
+    print(f"\n{'method':<14} {'deleted':>8} {'total(ms)':>10} {'calls':>8} {'max call(ms)':>13}")
+    for name, clear in (("keys+del", legacy_clear), ("scan+unlink", maintenance_clear)):
+        populate(conn, args.keys)
+        timer = Timed()
+        t0 = time.perf_counter()
+        deleted = clear(conn, timer)
+        elapsed = (time.perf_counter() - t0) * 1000
+        print(f"{name:<14} {deleted:>8} {elapsed:>10.0f} {timer.calls:>8} {timer.longest * 1000:>13.1f}")
+
+    from redis_maintenance import RedisMaintenance
+    populate(conn, args.keys)
+    maint = RedisMaintenance(conn)
+    report, method = maint.namespace_report()
+    before = report["news"]["bytes"]
+    t0 = time.perf_counter()
+    result = maint.gc()
+    elapsed = (time.perf_counter() - t0) * 1000
+    after, _ = maint.namespace_report()
+    print(f"\ngc: news:* {result['news']}개 중 고아 {result['orphans']}개 삭제 ({elapsed:.0f}ms), "
+          f"news 메모리({method}) {before / 1024 / 1024:.1f}MB → {after['news']['bytes'] / 1024 / 1024:.1f}MB")
+    conn.flushdb()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# benchmark/refresh.py
+"""
+인기 검색어 결과 캐시: 만료 후 다시 계산(기존) vs stale-while-revalidate vs SWR + 백그라운드 prefetch.
+가짜 네이버 / 가짜 OpenAI / fakeredis 로 인기 검색어 몇 개를 Zipf 비슷한 분포로 --duration 초 동안 반복 검색하고
+검색 응답 시간(p50/p95/max)과 cold miss(사용자가 전체 파이프라인을 기다린 횟수)를 비교한다.
+시간을 줄이려고 RESULT_TTL 을 --fresh 초로 줄인다.
+  none      RESULT_STALE_TTL=0, 스케줄러 없음 (만료되면 다음 사용자가 cold 파이프라인)
+  swr       stale 결과로 바로 응답하고 갱신은 백그라운드 (만료 직후 첫 사용자도 기다리지 않음)
+  prefetch  swr + 스케줄러가 --interval 초마다 곧 만료될 인기 검색어를 미리 갱신
+
+실행: cd server && python -m benchmark.refresh
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import time
+
+from benchmark.fake_naver import FakeNaverServer
+from benchmark.fake_openai import FakeOpenAIServer
+from benchmark.offline import use_offline_config
+
+MODES = ("none", "swr", "prefetch")
+
+
+def percentile(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+def run_mode(mode, args):
+    """mode 하나로 트래픽을 흘리고 (응답 ms 목록, cold miss 수, stale 응답 수, 갱신 통계) 반환"""
+    import redis_manager
+    import refresher as refresher_module
+    from metrics import CACHE_REQUESTS
+    from news_processor import process_news
+
+    redis_manager.RedisManager().conn.flushdb()
+    redis_manager.RESULT_TTL = args.fresh
+    redis_manager.RESULT_STALE_TTL = 0 if mode == "none" else args.fresh * 10
+    refresher = refresher_module.Refresher(max_concurrent=1, top_n=args.queries, interval=args.interval,
+                                           refresh_ahead=args.interval * 2)
+    refresher_module._refresher = refresher
+
+    queries = [[f"인기{i}"] for i in range(args.queries)]
+    weights = [1 / (i + 1) for i in range(args.queries)]
+    rng = random.Random(7)
+    # 워밍업: 모든 검색어를 한 번씩 (cold miss 에는 세지 않음)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for query in queries:
+            process_news(query, max_results=args.articles)
+    if mode == "prefetch":
+        refresher.start()
+
+    latencies = []
+    misses_before = CACHE_REQUESTS.get(cache="result", result="miss")
+    stale_before = redis_manager.RedisManager().get_cache_stats()["stale_hit"]
+    deadline = time.monotonic() + args.duration
+    with contextlib.redirect_stdout(io.StringIO()):
+        while time.monotonic() < deadline:
+            query = rng.choices(queries, weights)[0]
+            t0 = time.perf_counter()
+            process_news(query, max_results=args.articles)
+            latencies.append((time.perf_counter() - t0) * 1000)
+            time.sleep(args.think)
+        refresher.stop()
+        refresher.wait_idle(timeout=30)
+    cold = CACHE_REQUESTS.get(cache="result", result="miss") - misses_before
+    stale = redis_manager.RedisManager().get_cache_stats()["stale_hit"] - stale_before
+    return latencies, cold, stale, refresher.get_stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", type=int, default=5, help="인기 검색어 수")
+    parser.add_argument("--articles", type=int, default=300)
+    parser.add_argument("--duration", type=float, default=15.0, help="mode 별 트래픽 시간(초)")
+    parser.add_argument("--fresh", type=int, default=3, help="줄인 RESULT_TTL(초)")
+    parser.add_argument("--interval", type=float, default=1.0, help="prefetch 스케줄러 주기(초)")
+    parser.add_argument("--think", type=float, default=0.05, help="검색 사이 대기(초)")
+    parser.add_argument("--naver-latency", type=float, default=0.05)
+    parser.add_argument("--gpt-latency", type=float, default=0.3)
+    args = parser.parse_args()
+
+    naver = FakeNaverServer(total=args.articles, latency=args.naver_latency).start()
+    openai = FakeOpenAIServer(latency=args.gpt_latency).start()
+    use_offline_config(NAVER_API_URL=naver.url, OPENAI_BASE_URL=openai.base_url)
+
+    import fakeredis
+    import redis_manager
+    redis_manager._pool = fakeredis.FakeRedis(decode_responses=True).connection_pool
+
+    print(f"인기 검색어 {args.queries}개, 기사 {args.articles}건, 신선 기간 {args.fresh}초, {args.duration:.0f}초씩")
+    print(f"\n{'mode':<9} {'requests':>8} {'p50(ms)':>8} {'p95(ms)':>8} {'max(ms)':>8} {'cold miss':>9} {'stale':>6} {'refreshed':>9}")
+    for mode in MODES:
+        latencies, cold, stale, stats = run_mode(mode, args)
+        print(f"{mode:<9} {len(latencies):>8} {percentile(latencies, 0.5):>8.1f} {percentile(latencies, 0.95):>8.1f} "
+              f"{max(latencies):>8.1f} {cold:>9} {stale:>6} {stats['completed']:>9}")
+    naver.stop()
+    openai.stop()
+
+
+if __name__ == "__main__":
+    main()
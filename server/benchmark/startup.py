@@ -0,0 +1,87 @@
+# benchmark/startup.py
+"""
+cold start / steady state 지연시간 측정.
+새 파이썬 프로세스에서 (1) preload, (2) warm-up 을 거친 뒤 process_news 를 여러 번 호출해
+첫 요청(cold)과 이후 요청(steady state)의 지연시간을 비교한다.
+preload/warm-up 없이 첫 요청에서 import 하는 경우(변경 전과 같은 조건)와도 비교한다.
+네이버는 가짜 서버, Redis 는 fakeredis 를 쓰고, GPT 호출이 없는 파생 검색(is_initial=False)만 사용한다.
+
+실행: cd server && python -m benchmark.startup
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+CHILD = r'''
+import json, sys, time
+t_start = time.perf_counter()
+from benchmark.offline import use_offline_config
+from benchmark.fake_naver import FakeNaverServer
+server = FakeNaverServer(total={total}, latency=0.0).start()
+use_offline_config(NAVER_API_URL=server.url)
+
+import fakeredis
+import redis_manager
+redis_manager._pool = fakeredis.FakeRedis(decode_responses=True).connection_pool
+
+import startup
+if "{mode}" != "lazy":
+    startup.preload()
+t_preload = time.perf_counter()
+if "{mode}" == "warm":
+    startup.warm_up()
+t_ready = time.perf_counter()
+
+latencies = []
+for i in range({requests}):
+    t0 = time.perf_counter()
+    from news_processor import process_news  # lazy 모드에서는 첫 요청이 import 비용을 치른다
+    process_news([f"검색어{{i}}"], is_initial=False)  # 매번 다른 검색어 → 결과 캐시 miss
+    latencies.append(time.perf_counter() - t0)
+server.stop()
+print("RESULT" + json.dumps({{
+    "preload_s": t_preload - t_start,
+    "ready_s": t_ready - t_start,
+    "latencies_s": latencies,
+    "report": startup.report(),
+}}))
+'''
+
+
+MODES = {
+    "lazy": "preload/warm-up 없음 (첫 요청에서 import)",
+    "preload": "preload 만",
+    "warm": "preload + warm-up",
+}
+
+
+def run_child(mode, total, requests):
+    code = CHILD.format(mode=mode, total=total, requests=requests)
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    for line in proc.stdout.splitlines():
+        if line.startswith("RESULT"):
+            return json.loads(line[len("RESULT"):])
+    raise RuntimeError(proc.stderr[-2000:])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=4)
+    args = parser.parse_args()
+
+    for mode, label in MODES.items():
+        result = run_child(mode, args.articles, args.requests)
+        lat = [f"{x * 1000:.0f}" for x in result["latencies_s"]]
+        print(f"[{mode}] {label}")
+        print(f"  ready {result['ready_s']:.2f}s  요청별(ms): {', '.join(lat)}")
+        if mode == "warm":
+            imports = sorted(result["report"]["import_ms"].items(), key=lambda kv: -kv[1])[:6]
+            print("  import 상위:", ", ".join(f"{k} {v:.0f}ms" for k, v in imports))
+            print("  warm-up:", ", ".join(f"{k} {v:.0f}ms" for k, v in result["report"]["warmup_ms"].items()))
+
+
+if __name__ == "__main__":
+    main()
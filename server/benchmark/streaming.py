@@ -0,0 +1,90 @@
+# benchmark/streaming.py
+"""
+첫 화면 표시까지의 시간: /search, /summary (전체 완료 후 응답) vs /search/stream, /summary/stream (SSE).
+가짜 네이버(페이지 지연 --naver-latency), 가짜 OpenAI(첫 조각 지연 --gpt-latency, 조각 간격 --token-delay),
+fakeredis 로 Flask 앱을 test client 로 호출한다. 검색마다 다른 검색어를 써서 결과 캐시를 피한다.
+
+실행: cd server && python -m benchmark.streaming
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import time
+
+from benchmark.fake_naver import FakeNaverServer
+from benchmark.fake_openai import FakeOpenAIServer
+from benchmark.offline import use_offline_config
+
+
+def read_events(response):
+    """SSE 응답을 (도착 시각, 이벤트 이름, 데이터) 로"""
+    buf = ""
+    for chunk in response.response:
+        buf += chunk.decode("utf-8") if isinstance(chunk, bytes) else chunk
+        while "\n\n" in buf:
+            block, buf = buf.split("\n\n", 1)
+            lines = dict(line.split(": ", 1) for line in block.split("\n"))
+            yield time.perf_counter(), lines["event"], json.loads(lines["data"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=500)
+    parser.add_argument("--naver-latency", type=float, default=0.15)
+    parser.add_argument("--gpt-latency", type=float, default=0.8)
+    parser.add_argument("--token-delay", type=float, default=0.02)
+    args = parser.parse_args()
+
+    naver = FakeNaverServer(total=args.articles, latency=args.naver_latency).start()
+    openai = FakeOpenAIServer(latency=args.gpt_latency, token_delay=args.token_delay).start()
+    use_offline_config(NAVER_API_URL=naver.url, OPENAI_BASE_URL=openai.base_url)
+
+    import fakeredis
+    import redis_manager
+    redis_manager._pool = fakeredis.FakeRedis(decode_responses=True).connection_pool
+    with contextlib.redirect_stdout(io.StringIO()):
+        import app as app_module
+        import startup
+        startup.warm_up()
+    client = app_module.app.test_client()
+
+    rows = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        t0 = time.perf_counter()
+        articles = client.post("/search", json={"query_list": ["검색1"]}).get_json()["articles"]
+        rows.append(("/search", None, time.perf_counter() - t0))
+
+        t0 = time.perf_counter()
+        marks = {}
+        for at, event, data in read_events(client.post("/search/stream", json={"query_list": ["검색2"]},
+                                                       buffered=False)):
+            marks.setdefault(event, at - t0)
+        rows.append(("/search/stream", marks.get("raw_articles"), marks["done"]))
+        stage_marks = marks
+
+        t0 = time.perf_counter()
+        client.post("/summary", json={"articles": articles})
+        rows.append(("/summary", None, time.perf_counter() - t0))
+
+        from gpt_cache import get_response_cache
+        get_response_cache().clear()
+        t0 = time.perf_counter()
+        marks = {}
+        for at, event, data in read_events(client.post("/summary/stream", json={"articles": articles},
+                                                       buffered=False)):
+            marks.setdefault(event, at - t0)
+        rows.append(("/summary/stream", marks.get("summary"), marks["done"]))
+
+    print(f"{'endpoint':<16} {'first content(ms)':>18} {'complete(ms)':>13}")
+    for name, first, total in rows:
+        first = total if first is None else first
+        print(f"{name:<16} {first * 1000:>18.0f} {total * 1000:>13.0f}")
+    print("search/stream 단계별(ms):", ", ".join(f"{k} {v * 1000:.0f}" for k, v in stage_marks.items()))
+    naver.stop()
+    openai.stop()
+
+
+if __name__ == "__main__":
+    main()
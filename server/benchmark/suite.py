@@ -0,0 +1,193 @@
+# benchmark/suite.py
+"""
+검색 파이프라인 단계별 오프라인 벤치마크 (회귀 비교용).
+합성 코퍼스를 내려주는 가짜 네이버, 가짜 OpenAI, fakeredis 로 기사 수(--sizes)마다 아래 단계를 잰다.
+  fetch          네이버 페이지 수집 (NaverSearch.iter_pages)
+  clean          HTML 정리 / pubDate 변환 (clean_page)
+  soynlp_train   요청마다 soynlp WordExtractor 를 새로 학습하던 기존 방식 (참고용)
+  tokenize       단어 점수 모델 학습 + LTokenizer 토큰화 (새 WordScoreModel)
+  dbscan_sweep   TF-IDF + (eps, min_samples) 탐색 (cluster_articles)
+  dedup          대표 기사 선택 (select_representatives)
+  gpt_keywords   키워드 추출 왕복 (extract_keywords, 응답 캐시 비운 뒤)
+  gpt_summary    요약 왕복 (summarize_articles, 응답 캐시 비운 뒤)
+  process_news   전체 파이프라인 (결과 캐시 miss, 매번 다른 검색어)
+단계마다 --repeat 회 중 최소 시간(ms)과, 따로 한 번 더 실행해 tracemalloc 최대 메모리(MB)를 기록한다.
+결과는 JSON 으로 저장하고(--save), 이전 결과(--compare)와 비교해 --tolerance 이상 느려진 단계를 표시한다.
+
+실행: cd server && python -m benchmark.suite --sizes 100 500 1000 --save bench.json
+      cd server && python -m benchmark.suite --compare bench.json
+"""
+
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+from benchmark.corpus import soynlp_tokenize
+from benchmark.fake_naver import FakeNaverServer
+from benchmark.fake_openai import FakeOpenAIServer
+from benchmark.offline import use_offline_config
+
+STAGES = ('fetch', 'clean', 'soynlp_train', 'tokenize', 'dbscan_sweep', 'dedup', 'gpt_keywords', 'gpt_summary', 'process_news')
+
+
+def measure(fn, repeat):
+    """fn 을 repeat 회 실행한 최소 시간(ms)과 추가 1회 실행의 최대 메모리(MB), 마지막 반환값"""
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'ms': round(best * 1000, 2), 'peak_mb': round(peak / 1024 / 1024, 2)}, result
+
+
+def run_size(size, repeat, query_counter):
+    """기사 size 건 기준 단계별 측정 결과 {stage: {'ms', 'peak_mb'}}"""
+    import pandas as pd
+
+    import news_processor
+    from dedup_engine import cluster_articles, select_representatives
+    from gpt_cache import get_response_cache
+    from gpt_processor import extract_keywords, summarize_articles
+    from word_model import WordScoreModel
+
+    stats = {}
+    client = news_processor.get_naver_client()
+    stats['fetch'], pages = measure(lambda: dict(client.iter_pages("벤치마크", max_results=size)), repeat)
+
+    stats['clean'], cleaned = measure(
+        lambda: {start: news_processor.clean_page(items) for start, items in pages.items()}, repeat)
+    articles_df = pd.concat([cleaned[start] for start in sorted(cleaned)], ignore_index=True)
+    texts = articles_df['text'].tolist()
+
+    stats['soynlp_train'], _ = measure(lambda: soynlp_tokenize(texts), repeat)
+
+    def tokenize():
+        model = WordScoreModel()
+        model.update(texts)
+        return model.tokenize_batch(texts)
+    stats['tokenize'], processed = measure(tokenize, repeat)
+
+    stats['dbscan_sweep'], (clusters, params) = measure(lambda: cluster_articles(processed), repeat)
+    articles_df['processed_text'] = processed
+    stats['dedup'], dedup_df = measure(
+        lambda: select_representatives(articles_df.copy(), clusters, params['nc']), repeat)
+    articles = dedup_df.to_dict(orient='records')
+
+    cache = get_response_cache()
+
+    def uncached(fn):
+        def run():
+            cache.clear()
+            return fn(articles)
+        return run
+    stats['gpt_keywords'], _ = measure(uncached(extract_keywords), repeat)
+    stats['gpt_summary'], _ = measure(uncached(summarize_articles), repeat)
+
+    def pipeline():
+        cache.clear()
+        return news_processor.process_news([f"벤치마크{next(query_counter)}"], max_results=size)
+    stats['process_news'], _ = measure(pipeline, repeat)
+    stats['articles'] = {'fetched': len(texts), 'deduplicated': len(articles)}
+    return stats
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_table(results, baseline=None, tolerance=0.2):
+    """단계별 시간/메모리 표. baseline 이 있으면 시간 변화율과 회귀(⚠️) 표시. 회귀 수 반환"""
+    regressions = 0
+    for size, stats in results.items():
+        articles = stats.get('articles', {})
+        print(f"\n[{size}건] 수집 {articles.get('fetched')}건 → 대표 {articles.get('deduplicated')}건")
+        header = f"{'stage':<14} {'ms':>10} {'peak MB':>9}"
+        print(header + (f" {'base ms':>10} {'change':>8}" if baseline else ""))
+        base_stats = (baseline or {}).get(size, {})
+        for stage in STAGES:
+            if stage not in stats:
+                continue
+            row = stats[stage]
+            line = f"{stage:<14} {row['ms']:>10.1f} {row['peak_mb']:>9.2f}"
+            base = base_stats.get(stage)
+            if base and base['ms'] > 0:
+                change = row['ms'] / base['ms'] - 1
+                flag = ""
+                if change > tolerance:
+                    regressions += 1
+                    flag = " ⚠️"
+                line += f" {base['ms']:>10.1f} {change:>+8.0%}{flag}"
+            print(line)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 500, 1000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--dup-rate', type=float, default=0.3)
+    parser.add_argument('--naver-latency', type=float, default=0.05)
+    parser.add_argument('--gpt-latency', type=float, default=0.2)
+    parser.add_argument('--save', help='결과 JSON 저장 경로')
+    parser.add_argument('--compare', help='비교할 이전 결과 JSON')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='회귀로 볼 시간 증가 비율')
+    args = parser.parse_args()
+
+    naver = FakeNaverServer(total=max(args.sizes), latency=args.naver_latency, dup_rate=args.dup_rate).start()
+    openai = FakeOpenAIServer(latency=args.gpt_latency).start()
+    use_offline_config(NAVER_API_URL=naver.url, OPENAI_BASE_URL=openai.base_url)
+
+    import fakeredis
+    import redis_manager
+    redis_manager._pool = fakeredis.FakeRedis(decode_responses=True).connection_pool
+
+    query_counter = itertools.count()
+    results = {}
+    for size in args.sizes:
+        with contextlib.redirect_stdout(io.StringIO()):
+            results[str(size)] = run_size(size, args.repeat, query_counter)
+    naver.stop()
+    openai.stop()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+    regressions = print_table(results, baseline, args.tolerance)
+
+    if args.save:
+        report = {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'git': git_revision(),
+            'python': platform.python_version(),
+            'cpu_count': os.cpu_count(),
+            'args': vars(args),
+            'results': results,
+        }
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 결과 저장: {args.save}")
+    if regressions:
+        print(f"\n⚠️ {args.tolerance:.0%} 이상 느려진 단계 {regressions}개")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
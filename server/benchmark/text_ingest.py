@@ -0,0 +1,96 @@
+# benchmark/text_ingest.py
+"""
+기사 정리(HTML 엔티티/태그 제거, pubDate 변환, text 컬럼) 처리량 비교.
+- legacy: 변경 전 clean_page (pandas apply + 매번 re.sub, 행마다 datetime.strptime)
+- batch: text_ingest.normalize_frame (링크 캐시 없이)
+- cached: 같은 기사를 다시 정리하는 경우 (링크 캐시 hit)
+세 방식의 결과가 같은지도 확인한다.
+
+실행: cd server && python -m benchmark.text_ingest --articles 10000
+"""
+
+import argparse
+import html
+import re
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from benchmark.corpus import generate_items
+from text_ingest import IngestCache, normalize_frame
+
+
+def convert_pubdate(date_str):
+    dt = datetime.strptime(date_str, "%a, %d %b %Y %H:%M:%S %z")
+    hour = dt.hour
+    ampm = "오전" if hour < 12 else "오후"
+    hour_12 = hour if 1 <= hour <= 12 else abs(
+        hour - 12) if hour != 0 else 12
+    return f"{dt.year}.{dt.month:02}.{dt.day:02}. {ampm} {hour_12}:{dt.minute:02}"
+
+
+def clean_html(raw_text):
+    decoded_text = html.unescape(str(raw_text))
+    clean_text = re.sub(r'<.*?>', '', decoded_text)
+    return clean_text
+
+
+def legacy_clean_page(items):
+    """변경 전 news_processor.clean_page (비교 기준)"""
+    page_df = pd.DataFrame([{
+        "title": item.get("title"),
+        "description": item.get("description"),
+        "pubDate": item.get("pubDate"),
+        "originallink": item.get("originallink")
+    } for item in items], columns=["title", "description", "pubDate", "originallink"])
+    page_df['title'] = page_df['title'].apply(clean_html)
+    page_df['description'] = page_df['description'].apply(clean_html)
+    page_df['text'] = page_df['title'] + " " + page_df['description']
+    page_df['pubDate'] = page_df['pubDate'].apply(convert_pubdate)
+    return page_df
+
+
+def best_of(fn, repeat):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--articles', type=int, default=10000)
+    parser.add_argument('--page-size', type=int, default=100, help='네이버 페이지 크기 (clean_page 호출 단위)')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    items = generate_items(args.articles)
+    for i, item in enumerate(items):  # 엔티티/태그 섞인 기사도 포함
+        if i % 5 == 0:
+            item['description'] += ' &lt;b&gt;강조&lt;/b&gt; AT&amp;T <i>기울임</i>'
+    pages = [items[i:i + args.page_size] for i in range(0, len(items), args.page_size)]
+
+    def by_page(fn):
+        return lambda: pd.concat([fn(page) for page in pages], ignore_index=True)
+
+    cache = IngestCache(maxsize=args.articles)
+    normalize_frame(items, cache=cache)
+    rows = [
+        ('legacy', *best_of(by_page(legacy_clean_page), args.repeat)),
+        ('batch', *best_of(by_page(lambda page: normalize_frame(page, cache=False)), args.repeat)),
+        ('cached', *best_of(by_page(lambda page: normalize_frame(page, cache=cache)), args.repeat)),
+    ]
+
+    expected = rows[0][2]
+    print(f"기사 {len(items):,}건, 페이지 {len(pages)}개")
+    print(f"{'mode':<8} {'time(ms)':>9} {'articles/s':>12} {'same':>6}")
+    for name, elapsed, df in rows:
+        same = df.equals(expected)
+        print(f"{name:<8} {elapsed * 1000:>9.1f} {len(items) / elapsed:>12,.0f} {str(same):>6}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+# benchmark/tokenizer.py
+"""
+soynlp 토큰화 단계 비교: 요청마다 WordExtractor 학습 vs 장기 유지 단어 점수 모델.
+연속된 검색 요청이 기사를 일부 공유하는 상황을 흉내 낸다 (요청 i 는 전체 코퍼스의 구간을 조금씩 밀며 사용).
+- 요청별 토큰화 소요 시간
+- 안정성: 이전 요청에서도 나온 기사 텍스트가 같은 토큰열로 나오는 비율
+
+실행: cd server && python -m benchmark.tokenizer --requests 10 --articles 500 --overlap 0.5
+"""
+
+import argparse
+import contextlib
+import io
+import statistics
+import time
+
+from benchmark.corpus import generate_texts, soynlp_tokenize
+from word_model import WordScoreModel
+
+
+def legacy_tokenize(texts):
+    # soynlp 진행 로그는 버린다
+    with contextlib.redirect_stdout(io.StringIO()):
+        return soynlp_tokenize(texts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=10)
+    parser.add_argument("--articles", type=int, default=500)
+    parser.add_argument("--overlap", type=float, default=0.5, help="연속 요청 간 기사 공유 비율")
+    args = parser.parse_args()
+
+    step = max(1, int(args.articles * (1 - args.overlap)))
+    corpus, _ = generate_texts(args.articles + step * args.requests, seed=7)
+    batches = [corpus[i * step:i * step + args.articles] for i in range(args.requests)]
+
+    model = WordScoreModel()
+    results = {}
+    for name in ("legacy", "model"):
+        seen = {}
+        times, stable, repeated = [], 0, 0
+        for texts in batches:
+            t0 = time.perf_counter()
+            if name == "legacy":
+                processed = legacy_tokenize(texts)
+            else:
+                model.update(texts)
+                processed = model.tokenize_batch(texts)
+            times.append(time.perf_counter() - t0)
+            for text, tokens in zip(texts, processed):
+                if text in seen:
+                    repeated += 1
+                    stable += seen[text] == tokens
+                seen[text] = tokens
+        results[name] = (times, stable / repeated if repeated else 1.0)
+
+    print(f"requests={args.requests} articles={args.articles} overlap={args.overlap}")
+    print(f"{'path':<8} {'first(ms)':>10} {'median(ms)':>11} {'stable':>8}")
+    for name, (times, stability) in results.items():
+        print(f"{name:<8} {times[0] * 1000:>10.0f} {statistics.median(times[1:] or times) * 1000:>11.0f}"
+              f" {stability:>8.1%}")
+    print(f"model: 누적 문장 {model.num_sents}개, L 항목 {len(model.L)}개")
+
+
+if __name__ == "__main__":
+    main()
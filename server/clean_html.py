@@ -1,24 +1,10 @@
-import re
+from text_ingest import clean_text as _clean_text
+
 
 def clean_text(text):
     """HTML 태그와 특수 문자를 제거하는 함수"""
-    # 원본 텍스트 저장
-    original_text = text
-    
-    # HTML 태그 제거 (<b>, </b> 등)
-    text = re.sub(r'<[^>]*>', '', text)
-    
-    # 특수 문자 변환 (&quot; 등)
-    text = text.replace('&quot;', '"')\
-               .replace('&amp;', '&')\
-               .replace('&lt;', '<')\
-               .replace('&gt;', '>')\
-               .replace('&apos;', "'")\
-               .replace('&nbsp;', ' ')
-    
-    cleaned_text = text.strip()
-    
-    return cleaned_text
+    # HTML 엔티티(&quot; 등) 복원 + 태그(<b>, </b> 등) 제거는 text_ingest 와 같은 규칙
+    return _clean_text(text).strip()
 
 def clean_news_results(news_results):
     """네이버 뉴스 API 결과의 description과 title에서 HTML 태그를 제거하는 함수"""
@@ -31,4 +17,4 @@ def clean_news_results(news_results):
         if 'title' in item:
             item['title'] = clean_text(item['title'])
     
-    return news_results 
\ No newline at end of file
+    return news_results 
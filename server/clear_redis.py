@@ -1,14 +1,10 @@
 # clear_redis.py
-import redis
+# keyword:* 와 news:* 키 전체 삭제 (SCAN + 파이프라인 UNLINK, redis_maintenance.py clear 와 같음)
+from redis_maintenance import RedisMaintenance
 
-# Redis 연결 설정 (host, port 수정 가능)
-r = redis.Redis(host='localhost', port=6379, decode_responses=True)
+maint = RedisMaintenance()
+counts = maint.clear(["keyword:*", "news:*"])
+for pattern, count in counts.items():
+    print(f"🗑 {pattern}: {count}개 삭제")
 
-# keyword:* 와 news:* 키 전체 삭제
-deleted_count = 0
-for key in r.keys("keyword:*") + r.keys("news:*"):
-    print(f"🗑 삭제: {key}")
-    r.delete(key)
-    deleted_count += 1
-
-print(f"\n✅ 삭제 완료: 총 {deleted_count}개 키 삭제됨")
+print(f"\n✅ 삭제 완료: 총 {sum(counts.values())}개 키 삭제됨")
@@ -0,0 +1,93 @@
+# cpu_pool.py
+"""
+CPU 를 오래 쓰는 중복 제거(TF-IDF + DBSCAN 탐색 / MinHash)를 별도 프로세스 풀에서 실행.
+- 스레드로 요청을 처리하면 클러스터링이 GIL 을 잡고 있어 다른 요청의 I/O 처리까지 늦어진다
+- 풀 크기는 config.CLUSTER_WORKERS (기본 0: 풀 없이 현재 프로세스에서 실행, 개발 서버용)
+  serve.py 는 configure() 로 CPU 수만큼 워커를 둔다
+- config.CLUSTER_TIMEOUT(초) 안에 끝나지 않으면 TimeoutError
+- 토큰화는 장기 유지 단어 점수 모델(word_model)을 갱신해야 하므로 요청 프로세스에 남긴다
+"""
+
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from dedup_engine import cluster_with_backend
+
+DEFAULT_TIMEOUT = 60
+
+_pool = None
+_pool_lock = threading.Lock()
+_overrides = {}
+
+
+def configure(workers=None, timeout=None):
+    """config 대신 쓸 워커 수 / 타임아웃 (serve.py 의 명령행 옵션). 이미 만든 풀은 다시 만든다."""
+    if workers is not None:
+        _overrides['workers'] = workers
+    if timeout is not None:
+        _overrides['timeout'] = timeout
+    shutdown()
+
+
+def _settings():
+    import config
+    workers = _overrides.get('workers', getattr(config, 'CLUSTER_WORKERS', 0))
+    timeout = _overrides.get('timeout', getattr(config, 'CLUSTER_TIMEOUT', DEFAULT_TIMEOUT))
+    return workers, timeout
+
+
+def _warm_worker():
+    # 워커 시작 시 numpy/scipy/sklearn import 를 미리 끝낸다
+    cluster_with_backend(["워커 준비", "워커 준비 완료"])
+
+
+def get_pool():
+    """프로세스 풀 (워커 수가 0 이면 None). 처음 호출 시 생성한다."""
+    global _pool
+    workers, _ = _settings()
+    if workers <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            # fork 는 부모의 스레드(커넥션 풀, warm-up 등) 상태를 복사하므로 spawn 으로 새로 띄운다
+            _pool = ProcessPoolExecutor(max_workers=workers,
+                                        mp_context=multiprocessing.get_context('spawn'),
+                                        initializer=_warm_worker)
+        return _pool
+
+
+def cluster_texts(texts, backend='dbscan', timeout=None):
+    """
+    cluster_with_backend 를 프로세스 풀에서 실행하고 (clusters, params) 를 반환한다.
+    풀이 깨지면(워커 비정상 종료) 새로 만들고 이번 요청은 현재 프로세스에서 처리한다.
+    """
+    global _pool
+    pool = get_pool()
+    if pool is None:
+        return cluster_with_backend(texts, backend)
+    if timeout is None:
+        timeout = _settings()[1]
+    try:
+        future = pool.submit(cluster_with_backend, list(texts), backend)
+        try:
+            return future.result(timeout=timeout)
+        except TimeoutError:
+            # 아직 대기 중이면 취소, 이미 실행 중이면 워커가 끝까지 마친다. 요청에는 TimeoutError 전달
+            future.cancel()
+            raise
+    except BrokenProcessPool:
+        print("⚠️ 클러스터링 프로세스 풀 재생성")
+        with _pool_lock:
+            if _pool is pool:
+                _pool = None
+        return cluster_with_backend(texts, backend)
+
+
+def shutdown():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
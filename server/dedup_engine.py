@@ -0,0 +1,193 @@
+# dedup_engine.py
+"""
+뉴스 중복 제거(DBSCAN 파라미터 탐색) 엔진.
+- TF-IDF 희소 행렬(float32)과 코사인 거리 / 반경 이웃 그래프를 한 번만 만든다.
+- 모든 (eps, min_samples) 후보와 실루엣 점수 계산이 같은 그래프를 재사용한다.
+- 최종 중복 제거는 탐색 때 구한 라벨을 그대로 사용한다 (재학습 없음).
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics import silhouette_score
+
+from minhash_dedup import cluster_articles_minhash
+
+# process_news 에서 사용하던 탐색 범위 그대로
+EPS_VALUES = np.arange(0.2, 1.0, 0.1)
+MIN_SAMPLES_VALUES = list(range(2, 11))
+
+# 선택 가능한 중복 제거 백엔드 (config.DEDUP_BACKEND 로 기본값 지정)
+DEDUP_BACKENDS = ('dbscan', 'minhash')
+
+
+class DedupEngine:
+    def __init__(self, texts, max_eps=None):
+        """
+        Args:
+            texts: 형태소 분석이 끝난 문서 리스트 (processed_text)
+            max_eps (float): 이웃 그래프에 담을 최대 거리 (기본: EPS_VALUES 최대값)
+        """
+        if max_eps is None:
+            max_eps = float(EPS_VALUES.max())
+        self.max_eps = max_eps
+
+        vectorizer = TfidfVectorizer(dtype=np.float32)
+        # TfidfVectorizer 는 기본적으로 L2 정규화 → 내적이 곧 코사인 유사도
+        self.tfidf_matrix = vectorizer.fit_transform(texts)
+        self.n_samples = self.tfidf_matrix.shape[0]
+
+        self.distances = self._cosine_distances()
+        self.graph = self._radius_graph(self.distances, max_eps)
+
+        self._adjacency = None
+        self._labels = {}
+        self._silhouette = {}
+
+    def _cosine_distances(self):
+        """문서 간 코사인 거리 (n x n, float32). 실루엣 점수 계산에 재사용."""
+        similarity = (self.tfidf_matrix @ self.tfidf_matrix.T).toarray()
+        distances = np.subtract(1.0, similarity, dtype=np.float32)
+        np.clip(distances, 0.0, 2.0, out=distances)
+        np.fill_diagonal(distances, 0.0)
+        return distances
+
+    @staticmethod
+    def _radius_graph(distances, radius):
+        """max_eps 이내 이웃만 담은 희소 거리 그래프 (0 거리도 명시적으로 보존)"""
+        rows, cols = np.nonzero(distances <= radius)
+        data = distances[rows, cols]
+        graph = sparse.csr_matrix(
+            (data, (rows, cols)), shape=distances.shape, dtype=np.float32)
+        graph.sort_indices()
+        return graph
+
+    def _neighbourhood(self, eps):
+        """이웃 그래프에서 거리 eps 이내 간선만 남긴 인접 행렬 (자기 자신 포함)"""
+        key = round(float(eps), 6)
+        if self._adjacency is None or self._adjacency[0] != key:
+            if key > self.max_eps:
+                raise ValueError(f"eps({eps})가 이웃 그래프 반경({self.max_eps})보다 큽니다.")
+            graph = self.graph
+            keep = graph.data <= key
+            adjacency = sparse.csr_matrix(
+                (keep.astype(np.int32), graph.indices.copy(), graph.indptr.copy()),
+                shape=graph.shape)
+            adjacency.eliminate_zeros()
+            # sweep 는 eps 순으로 돌기 때문에 마지막 eps 하나만 보관
+            self._adjacency = (key, adjacency)
+        return self._adjacency[1]
+
+    def labels(self, eps, min_samples):
+        """
+        (eps, min_samples) 조합의 DBSCAN 라벨. 같은 조합은 한 번만 계산.
+        코어 점끼리의 연결 성분이 클러스터가 되고, 경계 점은 가장 가까운 코어 점의
+        클러스터에 붙는다 (sklearn DBSCAN 과 같은 정의, 이웃 탐색만 재사용).
+        """
+        key = (round(float(eps), 6), int(min_samples))
+        if key in self._labels:
+            return self._labels[key]
+
+        adjacency = self._neighbourhood(key[0])
+        core = np.asarray(adjacency.sum(axis=1)).ravel() >= key[1]
+        clusters = np.full(self.n_samples, -1, dtype=np.intp)
+
+        core_idx = np.flatnonzero(core)
+        if len(core_idx):
+            _, components = connected_components(
+                adjacency[core_idx][:, core_idx], directed=False)
+            clusters[core_idx] = components
+
+            border_idx = np.flatnonzero(~core)
+            if len(border_idx):
+                dist = self.distances[np.ix_(border_idx, core_idx)]
+                nearest = dist.argmin(axis=1)
+                reachable = dist[np.arange(len(border_idx)), nearest] <= key[0]
+                clusters[border_idx[reachable]] = components[nearest[reachable]]
+
+        self._labels[key] = clusters
+        return clusters
+
+    def silhouette(self, clusters):
+        """노이즈(-1)를 제외한 실루엣 점수. 라벨이 같으면 캐시된 값을 사용."""
+        key = clusters.tobytes()
+        if key in self._silhouette:
+            return self._silhouette[key]
+
+        num_clusters = len(set(clusters)) - (1 if -1 in clusters else 0)
+        mask = clusters != -1
+        score = None
+        if num_clusters > 1 and np.sum(mask) > 1:
+            idx = np.flatnonzero(mask)
+            try:
+                score = float(silhouette_score(
+                    self.distances[np.ix_(idx, idx)], clusters[mask], metric='precomputed'))
+            except ValueError:
+                score = None
+        self._silhouette[key] = score
+        return score
+
+    def sweep(self, eps_values=EPS_VALUES, min_samples_values=MIN_SAMPLES_VALUES):
+        """기존 compute_dbscan_results 와 같은 형태의 결과 DataFrame 반환"""
+        results = []
+        for eps in eps_values:
+            for min_samples in min_samples_values:
+                clusters = self.labels(eps, min_samples)
+                num_clusters = len(set(clusters)) - (1 if -1 in clusters else 0)
+                results.append({'eps': eps, 'min_samples': int(min_samples),
+                                'num_clusters': num_clusters,
+                                'silhouette_score': self.silhouette(clusters)})
+        return pd.DataFrame(results)
+
+
+def select_representatives(df, clusters, nc):
+    """
+    클러스터 라벨을 df['cluster']에 기록하고, 노이즈(-1)를 제외한
+    클러스터마다 nc개씩 대표 기사를 뽑는다.
+    """
+    df['cluster'] = clusters
+    unique_docs = df[df['cluster'] != -1].groupby('cluster').sample(n=nc)
+    return unique_docs.sort_values('cluster', kind='stable').reset_index(drop=True)
+
+
+def cluster_articles(texts, eps_values=EPS_VALUES, min_samples_values=MIN_SAMPLES_VALUES):
+    """
+    파라미터 탐색 후 선택된 라벨과 대표 기사 수(nc)를 반환.
+    실루엣 점수 2위 조합을 사용하고, 후보가 부족하면 기본 파라미터(0.2, 2)를 쓴다.
+
+    Returns:
+        (clusters, params) — params: {'backend', 'eps', 'min_samples', 'num_clusters', 'nc'}
+    """
+    engine = DedupEngine(texts)
+    results_df = engine.sweep(eps_values, min_samples_values)
+    ranked = results_df.dropna().sort_values(by='silhouette_score', ascending=False)
+
+    if len(ranked) >= 2:
+        second_best = ranked.iloc[1]
+        eps = float(second_best['eps'])
+        min_samples = int(second_best['min_samples'])
+    else:
+        print("유효한 실루엣 점수가 충분하지 않아 기본 파라미터 사용")
+        eps = 0.2
+        min_samples = 2
+
+    clusters = engine.labels(eps, min_samples)
+    num_clusters = len(set(clusters)) - (1 if -1 in clusters else 0)
+    nc = 2 if num_clusters < 4 else 1
+    return clusters, {'backend': 'dbscan', 'eps': eps, 'min_samples': min_samples,
+                      'num_clusters': num_clusters, 'nc': nc}
+
+
+def cluster_with_backend(texts, backend='dbscan'):
+    """
+    선택한 백엔드로 (clusters, params) 를 구한다.
+    - dbscan: TF-IDF 코사인 거리 + 파라미터 탐색 (기본)
+    - minhash: shingle MinHash + LSH 버킷 (기사 수에 선형, 근접 중복만 묶음)
+    """
+    if backend == 'dbscan':
+        return cluster_articles(texts)
+    if backend == 'minhash':
+        return cluster_articles_minhash(texts)
+    raise ValueError(f"알 수 없는 중복 제거 백엔드: {backend} (지원: {', '.join(DEDUP_BACKENDS)})")
@@ -0,0 +1,224 @@
+# gpt_cache.py
+"""
+GPT 응답 캐시 + single-flight.
+- 키: sha256(모델 + 프롬프트(messages) + 호출 옵션), 공백을 정규화한 뒤 해시 → 같은 기사 묶음이면 같은 키
+- 1차: 프로세스 메모리 LRU (TTL), 2차(선택): Redis (gpt:{키}, TTL)
+- 같은 키의 요청이 동시에 들어오면 upstream 호출은 1번만 하고 나머지는 그 결과를 기다린다
+  (/keywords 와 /summary 가 같은 기사로 동시에 호출되는 경우, Redis HIT 후 키워드 재추출 등)
+- 실패(예외)는 캐시하지 않고 기다리던 요청들에 그대로 전달한다. 빈(공백뿐인) 응답도 캐시하지 않는다
+- 스트리밍 응답(get_or_stream)도 같은 키로 저장해 일반 호출과 캐시를 공유한다
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from metrics import CACHE_REQUESTS
+
+REDIS_PREFIX = "gpt:"
+
+
+def _normalize(value):
+    """해시용 정규화: 문자열은 연속 공백을 한 칸으로, dict 는 키 정렬(json.dumps sort_keys)"""
+    if isinstance(value, str):
+        return ' '.join(value.split())
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def response_key(model, messages, **params):
+    """모델 + 프롬프트 + 옵션의 내용 기반 키"""
+    payload = json.dumps(_normalize({"model": model, "messages": messages, "params": params}),
+                         ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _cacheable(value):
+    """None 이나 빈(공백뿐인) 응답은 저장하지 않는다 (저장하면 TTL 동안 다시 호출하지 않고 빈 응답만 돌려줌)"""
+    return value is not None and not (isinstance(value, str) and not value.strip())
+
+
+class ResponseCache:
+    def __init__(self, maxsize=1024, ttl=3600, conn=None):
+        """
+        Args:
+            maxsize (int): 메모리 LRU 항목 수 상한
+            ttl (int): 캐시 유지 시간(초). 메모리/Redis 공통
+            conn: Redis 커넥션 (None 이면 메모리 캐시만 사용)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.conn = conn
+        self._entries = OrderedDict()  # key -> (만료 시각, 응답)
+        self._lock = threading.Lock()
+        self._inflight = {}  # key -> _Flight
+        self.stats = {"hit": 0, "redis_hit": 0, "miss": 0, "shared": 0}
+
+    # ---------- 메모리 LRU ----------
+    def _get_local(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def _set_local(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    # ---------- 조회/저장 ----------
+    def get(self, key):
+        value = self._get_local(key)
+        if value is not None:
+            self._count("hit")
+            return value
+        if self.conn is not None:
+            try:
+                value = self.conn.get(REDIS_PREFIX + key)
+            except Exception as e:
+                print(f"⚠️ GPT 캐시 Redis 조회 실패: {e}")
+                value = None
+            if value is not None:
+                self._set_local(key, value)
+                self._count("redis_hit")
+                return value
+        return None
+
+    def set(self, key, value):
+        self._set_local(key, value)
+        if self.conn is not None:
+            try:
+                self.conn.set(REDIS_PREFIX + key, value, ex=self.ttl)
+            except Exception as e:
+                print(f"⚠️ GPT 캐시 Redis 저장 실패: {e}")
+
+    def get_or_call(self, key, fn, accept=None):
+        """
+        캐시에 있으면 바로 반환, 없으면 fn() 을 호출해 저장 후 반환.
+        같은 key 로 이미 호출 중이면 새로 호출하지 않고 그 결과를 기다린다 (single-flight).
+        accept(value) 가 False 인 응답(호출한 쪽이 못 쓰는 응답)은 반환만 하고 저장하지 않는다.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        with self._lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+        if not leader:
+            self._count("shared")
+            return flight.wait()
+
+        try:
+            # 대기 등록 사이에 다른 요청이 끝냈을 수 있으므로 한 번 더 확인
+            value = self.get(key)
+            if value is None:
+                self._count("miss")
+                value = fn()
+                if _cacheable(value) and (accept is None or accept(value)):
+                    self.set(key, value)
+            flight.resolve(value)
+            return value
+        except BaseException as e:
+            flight.reject(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def get_or_stream(self, key, stream_fn):
+        """
+        스트리밍 응답용: 캐시에 있으면 전체 응답을 한 번에 내보내고, 없으면 stream_fn() 의 조각을
+        그대로 내보내며 모아 두었다가 끝까지 받으면 저장한다 (중간에 끊기면 저장하지 않음).
+        조각이 바로바로 나가야 하므로 single-flight 는 적용하지 않는다.
+        """
+        value = self.get(key)
+        if value is not None:
+            yield value
+            return
+        self._count("miss")
+        parts = []
+        for part in stream_fn():
+            parts.append(part)
+            yield part
+        value = ''.join(parts)
+        if _cacheable(value):
+            self.set(key, value)
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+        CACHE_REQUESTS.inc(cache='gpt', result='miss' if name == 'miss' else 'hit')
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats["size"] = len(self._entries)
+        calls = stats["hit"] + stats["redis_hit"] + stats["miss"] + stats["shared"]
+        stats["hit_ratio"] = round((calls - stats["miss"]) / calls, 3) if calls else 0.0
+        return stats
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class _Flight:
+    """진행 중인 upstream 호출 1건. 같은 키를 기다리는 요청들이 결과(또는 예외)를 공유한다."""
+
+    def __init__(self):
+        self._done = threading.Event()
+        self._value = None
+        self._error = None
+
+    def resolve(self, value):
+        self._value = value
+        self._done.set()
+
+    def reject(self, error):
+        self._error = error
+        self._done.set()
+
+    def wait(self):
+        self._done.wait()
+        if self._error is not None:
+            raise self._error
+        return self._value
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    """
+    프로세스 전체에서 공유하는 GPT 응답 캐시.
+    config: GPT_CACHE_SIZE(기본 1024), GPT_CACHE_TTL(기본 3600초), GPT_CACHE_REDIS(기본 False)
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            import config
+            conn = None
+            if getattr(config, "GPT_CACHE_REDIS", False):
+                from redis_manager import RedisManager
+                conn = RedisManager().conn
+            _cache = ResponseCache(maxsize=getattr(config, "GPT_CACHE_SIZE", 1024),
+                                   ttl=getattr(config, "GPT_CACHE_TTL", 3600),
+                                   conn=conn)
+        return _cache
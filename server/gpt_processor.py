@@ -1,13 +1,188 @@
-from openai import OpenAI
+from openai import OpenAI, RateLimitError
 from config import OPENAI_API_KEY
+import config
+import contextvars
 import json
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from gpt_cache import get_response_cache, response_key
+from metrics import UPSTREAM_ERRORS, span, timed
+from prompt_payload import build_payload, token_budget, truncate_text
+from rate_limiter import get_limiter
 
-client = OpenAI(api_key=OPENAI_API_KEY)
+MODEL = "gpt-3.5-turbo"
+DEFAULT_MAX_CONCURRENCY = 4   # 프로세스 전체에서 동시에 보내는 GPT 호출 수 (gpt_map)
+DEFAULT_SUMMARY_CHUNK = 40    # map-reduce 요약의 map 호출 하나에 넣는 기사 수
 
+# OPENAI_BASE_URL 로 로컬 가짜 서버(benchmark/fake_openai.py)를 가리킬 수 있다
+client = OpenAI(api_key=OPENAI_API_KEY, base_url=getattr(config, 'OPENAI_BASE_URL', None))
+
+
+def _create(**kwargs):
+    """
+    chat completion 요청 (워커 간 공유 속도 제한 토큰을 받은 뒤).
+    429 가 끝까지 오면 Retry-After 를 limiter 에 기록해 다른 워커도 그동안 OpenAI 를 부르지 않게 한다.
+    """
+    limiter = get_limiter('openai')
+    if limiter is not None:
+        limiter.acquire()
+    try:
+        return client.chat.completions.create(**kwargs)
+    except RateLimitError as e:
+        if limiter is not None:
+            try:
+                retry_after = float(e.response.headers.get("retry-after") or 1.0)
+            except ValueError:
+                retry_after = 1.0
+            limiter.penalize(retry_after)
+        raise
+
+
+def _chat(messages, model=MODEL, accept=None, **params):
+    """
+    chat completion 응답 본문(content).
+    같은 모델+프롬프트+옵션이면 캐시된 응답을 쓰고, 동시에 들어온 같은 요청은 upstream 호출 1번으로 합친다.
+    accept(content) 가 False 인 응답(형식이 틀린 JSON 등)은 캐시하지 않는다.
+    """
+    def call():
+        try:
+            response = _create(model=model, messages=messages, **params)
+        except Exception:
+            UPSTREAM_ERRORS.inc(upstream='openai')
+            raise
+        return response.choices[0].message.content
+
+    key = response_key(model, messages, **params)
+    return get_response_cache().get_or_call(key, call, accept=accept)
+
+
+_executors = {}
+_executors_lock = threading.Lock()
+
+
+def _get_executor(size):
+    with _executors_lock:
+        executor = _executors.get(size)
+        if executor is None:
+            executor = _executors[size] = ThreadPoolExecutor(max_workers=size, thread_name_prefix="gpt")
+        return executor
+
+
+def _capture(fn, item):
+    try:
+        return fn(item)
+    except Exception as e:
+        return e
+
+
+def gpt_map(fn, items, concurrency=None):
+    """
+    items 마다 fn(item) (GPT 호출)을 최대 concurrency(기본 config.GPT_MAX_CONCURRENCY) 개씩 동시에 실행해
+    입력 순서대로 결과 목록을 반환한다. 실패한 항목은 예외 객체가 결과에 들어간다 (호출한 쪽이 대체값을 정함).
+    스레드 풀은 프로세스 전체에서 공유하므로 동시 요청이 많아도 GPT 호출 수는 concurrency 를 넘지 않는다.
+    """
+    items = list(items)
+    if concurrency is None:
+        concurrency = getattr(config, 'GPT_MAX_CONCURRENCY', DEFAULT_MAX_CONCURRENCY)
+    if concurrency <= 1 or len(items) <= 1:
+        return [_capture(fn, item) for item in items]
+    executor = _get_executor(concurrency)
+    # 요청 컨텍스트(단계 시간, 속도 제한 우선순위)를 호출 스레드에도 넘긴다
+    futures = [executor.submit(contextvars.copy_context().run, _capture, fn, item) for item in items]
+    return [future.result() for future in futures]
+
+
+_CANDIDATE_PATTERN = re.compile(r'[가-힣]{2,}|[a-zA-Z0-9]{2,}')
+
+
+def input_candidates(news_data):
+    """입력(문자열 또는 기사 목록)에 나오는 단어 후보를 순서대로"""
+    # news_data가 str 또는 list[dict] 형태일 수 있으므로 분기 처리
+    if isinstance(news_data, str):
+        return _CANDIDATE_PATTERN.findall(news_data)
+    if isinstance(news_data, list) and len(news_data) > 0:
+        texts = []
+        for item in news_data:
+            for key in ['content', 'title', 'description']:
+                if key in item and isinstance(item[key], str):
+                    texts.append(item[key])
+        return _CANDIDATE_PATTERN.findall(' '.join(texts))
+    return []
+
+
+def normalize(s):
+    return s.replace(' ', '').strip().lower()
+
+
+class CandidateSpans:
+    """
+    후보 단어열의 모든 연속 구간(2-gram, 3-gram 등, 붙여쓰기/띄어쓰기)을 담은 집합과 같은 판정을 하는 색인.
+    정규화하면 띄어쓰기 형태도 붙여쓰기와 같아지므로, 구간 = 후보들을 이어 붙인 문자열에서
+    후보 경계에서 시작해 후보 경계에서 끝나는 부분 문자열이다.
+    조합을 모두 만들면 O(n^2) 개·O(n^3) 글자가 되므로, 이어 붙인 문자열(O(n))과 경계 위치만 두고
+    키워드가 나오는 위치마다 양끝이 경계인지 확인한다.
+    """
+
+    def __init__(self, candidates):
+        pieces = [normalize(x) for x in candidates]
+        self.text = ''.join(pieces)
+        self.bounds = {0}
+        offset = 0
+        for piece in pieces:
+            offset += len(piece)
+            self.bounds.add(offset)
+        self.size = len(pieces)
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, keyword):
+        needle = normalize(keyword)
+        if not needle:
+            return False
+        pos = self.text.find(needle)
+        while pos != -1:
+            if pos in self.bounds and pos + len(needle) in self.bounds:
+                return True
+            pos = self.text.find(needle, pos + 1)
+        return False
+
+
+def filter_input_keywords(gpt_keywords, news_data):
+    """GPT 키워드 중 입력에 그대로(연속 구간으로) 나오는 것은 빼고 최대 3개"""
+    candidate_spans = CandidateSpans(input_candidates(news_data))
+    if not candidate_spans:
+        return gpt_keywords[:3]
+    filtered = [kw for kw in gpt_keywords if kw not in candidate_spans]
+    # 만약 필터링 후 결과가 비어있으면, gpt_keywords에서 최소 1개는 반환
+    if not filtered and gpt_keywords:
+        return gpt_keywords[:1]
+    return filtered[:3]
+
+
+def _parse_keywords(raw_response):
+    """키워드 응답 JSON → 키워드 목록 (형식이 틀리면 json.JSONDecodeError)"""
+    # JSON 파싱 전처리
+    cleaned = raw_response.replace("'", '"').strip('` \n')
+    return json.loads(cleaned).get('keywords', [])
+
+
+def _is_keywords_reply(raw_response):
+    try:
+        _parse_keywords(raw_response)
+        return True
+    except (ValueError, AttributeError):
+        return False
+
+
+@timed('gpt_extract_keywords')
 def extract_keywords(news_data):
+    """입력에 없는 GPT 키워드 최대 3개. 응답이 JSON 이 아니면 [] (캐시하지 않음)"""
+    # 프롬프트에는 제목/본문 요약 필드만, 토큰 예산 안으로 (후보 필터링은 원본 news_data 기준)
+    payload, _ = build_payload(news_data, label='extract_keywords')
     try:
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
+        raw_response = _chat(
             messages=[{
                 "role": "system",
                 "content": 
@@ -17,60 +192,15 @@ def extract_keywords(news_data):
                 - JSON 포맷 준수 필수'''
             }, {
                 "role": "user",
-                "content": json.dumps(news_data, ensure_ascii=False)
+                "content": payload
             }],
-            response_format={"type": "json_object"}
+            response_format={"type": "json_object"},
+            accept=_is_keywords_reply
         )
-        raw_response = response.choices[0].message.content
-
-        
-        # JSON 파싱 전처리
-        cleaned = raw_response.replace("'", '"').strip('` \n') 
-        result = json.loads(cleaned)
+        gpt_keywords = _parse_keywords(raw_response)
         # candidates(입력 명사)와 중복되는 키워드는 제외
-        # news_data가 str 또는 list[dict] 형태일 수 있으므로 분기 처리
-        import re
-        if isinstance(news_data, str):
-            candidates = re.findall(r'[가-힣]{2,}|[a-zA-Z0-9]{2,}', news_data)
-            joined = ' '.join(candidates)
-        elif isinstance(news_data, list) and len(news_data) > 0:
-            texts = []
-            for item in news_data:
-                for key in ['content', 'title', 'description']:
-                    if key in item and isinstance(item[key], str):
-                        texts.append(item[key])
-            text = ' '.join(texts)
-            candidates = re.findall(r'[가-힣]{2,}|[a-zA-Z0-9]{2,}', text)
-            joined = ' '.join(candidates)
-        else:
-            candidates = []
-            joined = ''
-        # 모든 연속 조합(2-gram, 3-gram 등)도 후보에 포함
-        def normalize(s):
-            norm = s.replace(' ', '').strip().lower()
-
-            return norm
-
-
-        candidate_set = set([normalize(x) for x in candidates])
-        n = len(candidates)
-        # 붙여쓰기 및 띄어쓰기 조합 모두 포함 (정규화해서 set에 추가)
-        for i in range(n):
-            for j in range(i+1, n+1):
-                if j-i >= 2:
-                    candidate_set.add(normalize(''.join(candidates[i:j])))     # 붙여쓰기
-                    candidate_set.add(normalize(' '.join(candidates[i:j])))   # 띄어쓰기
-        gpt_keywords = result.get('keywords', [])
-
-
-        if not candidate_set:
-            return gpt_keywords[:3]
-        filtered = [kw for kw in gpt_keywords if normalize(kw) not in candidate_set]
-        # 만약 필터링 후 결과가 비어있으면, gpt_keywords에서 최소 1개는 반환
-        if not filtered and gpt_keywords:
-            return gpt_keywords[:1]
-        return filtered[:3]
-        
+        return filter_input_keywords(gpt_keywords, news_data)
+
     except json.JSONDecodeError as e:
 
         return []
@@ -79,45 +209,179 @@ def extract_keywords(news_data):
 # (테스트 코드 제거됨)
 
 #gpt요약        
+def chunk_articles(news_data, chunk_size):
+    """
+    map-reduce 요약용 기사 묶음 (각 chunk_size 개 이하).
+    cluster 라벨이 있으면 같은 클러스터 기사는 같은 묶음에 넣고(chunk_size 보다 큰 클러스터만 나눔),
+    없으면 받은 순서대로 자른다 (대표 기사는 클러스터 순으로 정렬돼 있어 비슷한 기사가 모인다).
+    기사 묶음(article_set_id)으로 읽은 기사도 cluster 를 담고 있다 (article_codec 버전 2).
+    """
+    groups = {}
+    for i, article in enumerate(news_data):
+        label = article.get('cluster') if isinstance(article, dict) else None
+        key = ('cluster', label) if label is not None and label != -1 else ('article', i)
+        groups.setdefault(key, []).append(article)
+    chunks, current = [], []
+    for group in groups.values():
+        for start in range(0, len(group), chunk_size):
+            part = group[start:start + chunk_size]
+            if current and len(current) + len(part) > chunk_size:
+                chunks.append(current)
+                current = []
+            current = current + part
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _summarize_chunk(chunk):
+    payload, _ = build_payload(chunk, label='summarize_chunk')
+    return _chat(messages=[
+        {
+            "role": "system",
+            "content": "다음 뉴스 기사 묶음을 3문장 이내로 요약해줘. 반드시 요약문만 응답해."
+        },
+        {
+            "role": "user",
+            "content": payload
+        }
+    ]).strip()
+
+
+def _reduce_messages(partials):
+    joined = "\n".join(f"{i}. {summary}" for i, summary in enumerate(partials, 1))
+    return [
+        {
+            "role": "system",
+            "content": "다음은 뉴스 기사 묶음별 부분 요약이야. 이를 합쳐 5문장 이내로 전체 흐름을 설명하듯 써줘. "
+                       "반드시 요약문만 응답해."
+        },
+        {
+            "role": "user",
+            "content": truncate_text(joined, token_budget())
+        }
+    ]
+
+
+def _summary_messages(news_data):
+    """
+    요약 호출 메시지. config.GPT_SUMMARY_MODE:
+      auto(기본): 기사 전체가 토큰 예산에 들어가면 한 번에, 넘치면(표본만 들어가면) map-reduce
+      single: 항상 한 번에 (예산을 넘으면 고르게 표본)
+      map_reduce: 기사가 GPT_SUMMARY_CHUNK 개보다 많으면 map-reduce
+    map-reduce 는 기사 묶음(chunk_articles)별 부분 요약을 동시에(gpt_map) 만든 뒤, 부분 요약을 합치는 메시지를 반환한다.
+    """
+    mode = getattr(config, 'GPT_SUMMARY_MODE', 'auto')
+    chunk_size = getattr(config, 'GPT_SUMMARY_CHUNK', DEFAULT_SUMMARY_CHUNK)
+    payload, report = build_payload(news_data, label='summarize_articles')
+    # 중복 제목만 빠진 경우는 넘친 것이 아니다 (예산 때문에 표본을 뽑았을 때만)
+    overflow = report['articles_in'] is not None and report['sampled']
+    if isinstance(news_data, list) and len(news_data) > chunk_size and (
+            mode == 'map_reduce' or (mode == 'auto' and overflow)):
+        chunks = chunk_articles(news_data, chunk_size)
+        with span('gpt_summarize_map'):
+            results = gpt_map(_summarize_chunk, chunks)
+        partials = [r for r in results if isinstance(r, str) and r]
+        failed = len(results) - len(partials)
+        if failed:
+            print(f"⚠️ 부분 요약 {failed}/{len(results)}개 실패, 나머지로 요약")
+        if not partials:
+            raise next(r for r in results if isinstance(r, Exception))
+        print(f"🧩 map-reduce 요약: 기사 {len(news_data)}건 → 묶음 {len(chunks)}개")
+        return _reduce_messages(partials)
+    return [
+        {
+            "role": "system",
+            "content": "다음 뉴스 기사 목록을 요약해줘. 5문장 이내로 전체 흐름을 설명하듯 써줘. 반드시 요약문만 응답해."
+        },
+        {
+            "role": "user",
+            "content": payload
+        }
+    ]
+
+
+@timed('gpt_summarize')
 def summarize_articles(news_data):
     try:
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "다음 뉴스 기사 목록을 요약해줘. 5문장 이내로 전체 흐름을 설명하듯 써줘. 반드시 요약문만 응답해."
-                },
-                {
-                    "role": "user",
-                    "content": json.dumps(news_data, ensure_ascii=False)
-                }
-            ]
-        )
-        summary = response.choices[0].message.content.strip()
+        summary = _chat(messages=_summary_messages(news_data)).strip()
 
         return summary
     except Exception as e:
 
         return "요약 생성 실패"
 
-def define_keywords(keywords, context):
+
+def summarize_articles_stream(news_data):
     """
-    각 키워드가 주어진 요약문(문맥)에서 어떤 의미인지 한 문장으로 정의해서 dict로 반환.
+    요약문 조각을 모델이 생성하는 대로 내보내는 generator (/summary/stream).
+    summarize_articles 와 같은 캐시 키를 쓰므로, 이미 요약한 기사 묶음이면 전체 요약을 한 번에 내보낸다.
     """
-    definitions = {}
-    for kw in keywords:
-        prompt = f"'{kw}'라는 단어가 아래 요약문 맥락에서 어떤 의미를 가지는지 한 문장으로 정의해줘.\n\n요약문: {context}"
+    messages = _summary_messages(news_data)
+
+    def stream():
         try:
-            response = client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": prompt}]
-            )
-            definitions[kw] = response.choices[0].message.content.strip()
-        except Exception as e:
+            response = _create(model=MODEL, messages=messages, stream=True)
+        except Exception:
+            UPSTREAM_ERRORS.inc(upstream='openai')
+            raise
+        for chunk in response:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                yield delta
+
+    key = response_key(MODEL, messages)
+    with span('gpt_summarize_stream'):
+        yield from get_response_cache().get_or_stream(key, stream)
 
-            definitions[kw] = "정의 생성 실패"
-    return definitions
+def _define_one(kw, context):
+    prompt = f"'{kw}'라는 단어가 아래 요약문 맥락에서 어떤 의미를 가지는지 한 문장으로 정의해줘.\n\n요약문: {context}"
+    return _chat(messages=[{"role": "user", "content": prompt}]).strip()
+
+
+def _define_batch(keywords, context):
+    """호출 한 번으로 여러 키워드 정의 {키워드: 정의}. 응답에 빠졌거나 형식이 틀린 키워드는 결과에 없다"""
+    prompt = ("아래 키워드들이 요약문 맥락에서 각각 어떤 의미를 가지는지 한 문장씩 정의해줘.\n"
+              f"키워드: {json.dumps(keywords, ensure_ascii=False)}\n\n요약문: {context}")
+    try:
+        raw_response = _chat(
+            messages=[{
+                "role": "system",
+                "content": '반드시 JSON 형식으로 응답. 예시: {"definitions": {"키워드1": "한 문장 정의"}}'
+            }, {
+                "role": "user",
+                "content": prompt
+            }],
+            response_format={"type": "json_object"}
+        )
+        result = json.loads(raw_response.strip('` \n')).get('definitions', {})
+    except Exception as e:
+        print(f"⚠️ 키워드 정의 일괄 생성 실패, 키워드별 호출: {e}")
+        return {}
+    if not isinstance(result, dict):
+        return {}
+    return {kw: result[kw].strip() for kw in keywords if isinstance(result.get(kw), str) and result[kw].strip()}
+
+
+@timed('gpt_define_keywords')
+def define_keywords(keywords, context, mode=None):
+    """
+    각 키워드가 주어진 요약문(문맥)에서 어떤 의미인지 한 문장으로 정의해서 dict로 반환.
+    mode (기본 config.GPT_DEFINE_MODE):
+      batch(기본): 호출 한 번에 JSON 으로 모두 받고, 응답에 빠진 키워드만 키워드별로 동시에 호출
+      concurrent: 키워드마다 호출하되 동시에 (gpt_map)
+      sequential: 키워드마다 차례로 호출
+    """
+    mode = mode or getattr(config, 'GPT_DEFINE_MODE', 'batch')
+    context = truncate_text(context, token_budget())
+    pending = list(dict.fromkeys(keywords))
+    definitions = _define_batch(pending, context) if mode == 'batch' and pending else {}
+    pending = [kw for kw in pending if kw not in definitions]
+    results = gpt_map(lambda kw: _define_one(kw, context), pending,
+                      concurrency=1 if mode == 'sequential' else None)
+    for kw, result in zip(pending, results):
+        definitions[kw] = "정의 생성 실패" if isinstance(result, Exception) else result
+    return {kw: definitions[kw] for kw in keywords}
 
 # def generate_final_report(keywords, summary):
 #     """
@@ -138,16 +402,12 @@ def define_keywords(keywords, context):
 
 #         return "최종 보고 생성 실패"
 
-from openai import OpenAI
-from config import OPENAI_API_KEY
-import json
-
-client = OpenAI(api_key=OPENAI_API_KEY)
-
+@timed('gpt_final_report')
 def generate_final_report(keywords, summary):
     """
     키워드와 요약문을 받아, 정의 없이 자연스럽게 요약을 작성하는 보고서 생성.
     """
+    summary = truncate_text(summary, token_budget())
     prompt = (
         "다음은 뉴스 요약입니다. 아래 키워드들과 요약문을 참고하여 "
         "자연스러운 보고서 형태로 작성해주세요. "
@@ -156,11 +416,7 @@ def generate_final_report(keywords, summary):
         f"\n\n키워드: {', '.join(keywords)}\n요약문: {summary}"
     )
     try:
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[{"role": "user", "content": prompt}]
-        )
-        return response.choices[0].message.content.strip()
+        return _chat(messages=[{"role": "user", "content": prompt}]).strip()
     except Exception as e:
 
         return "최종 보고 생성 실패"
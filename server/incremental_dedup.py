@@ -0,0 +1,265 @@
+# incremental_dedup.py
+"""
+반복 검색어의 증분 갱신 (델타 수집 + 증분 클러스터링).
+- 전체 파이프라인(네이버 최대 500건 + DBSCAN 파라미터 탐색)을 돌린 검색어는 클러스터 상태를 delta:{정규형} 에 저장한다
+  (수집한 기사 corpus, 클러스터 라벨, 대표 기사 링크, 선택된 eps/min_samples/nc, TF-IDF 어휘/idf)
+- 결과 캐시가 만료된 뒤 다시 검색하면 네이버를 date 순으로 한 페이지씩 받아
+  이미 가진 originallink 가 나오는 곳까지만 읽는다 (news_processor.process_news_stream)
+- 새 기사는 저장된 TF-IDF 로 벡터화해, 클러스터에 속한 기존 기사 중 가장 가까운 기사와의 코사인 거리가
+  eps 이내면 그 클러스터에 붙이고 (DBSCAN 의 도달 기준), 나머지는 기존 노이즈 기사와 함께
+  같은 eps/min_samples 로 새 클러스터를 만들거나 노이즈로 둔다
+- 마지막 전체 클러스터링 이후 증분으로 붙인 기사 비율(drift)이 threshold 를 넘으면 합친 corpus 로 전체 클러스터링
+- 품질 drift: 전체 클러스터링 때의 클러스터 수 / 실루엣 점수(baseline)를 저장해 두고, 증분 결과의 클러스터 수가
+  cluster_change 비율 넘게 달라지거나 실루엣이 silhouette_drop 넘게 떨어지면 붙인 기사 수와 상관없이 전체 클러스터링
+  (증분은 저장된 eps/min_samples 를 그대로 쓰므로, corpus 가 바뀌어 파라미터 탐색 결과가 달라질 상황을 잡는다)
+- 대표 기사는 기존 대표를 유지하고, 새 클러스터나 대표가 빠진 클러스터만 새로 고른다 (corpus 순서 = 최신순)
+config: DELTA_FETCH(True), DELTA_DRIFT_THRESHOLD(0.3), DELTA_CLUSTER_CHANGE(0.2), DELTA_SILHOUETTE_DROP(0.05)
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics import silhouette_score
+
+from article_codec import NEWS_FIELDS, pack_articles, unpack_articles
+from metrics import Counter
+
+STATE_VERSION = 2  # 2: 전체 클러스터링 품질(baseline) 포함
+DEFAULT_DRIFT_THRESHOLD = 0.3
+DEFAULT_CLUSTER_CHANGE = 0.2
+DEFAULT_SILHOUETTE_DROP = 0.05
+
+DELTA_REFRESH = Counter('newshive_delta_refresh_total',
+                        '반복 검색 갱신 방식 (incremental: 증분, unchanged: 새 기사 없음, '
+                        'reclustered: drift 초과로 전체 클러스터링, reclustered_quality: 품질 drift 로 전체 클러스터링, '
+                        'full: 델타 불가)', ('outcome',))
+NAVER_PAGES_SAVED = Counter('newshive_naver_pages_saved_total', '델타 수집으로 생략한 네이버 페이지 요청 수')
+
+
+def _dbscan(distances, eps, min_samples):
+    """작은 거리 행렬(dense)용 DBSCAN 라벨 (dedup_engine.DedupEngine.labels 와 같은 정의)"""
+    n = distances.shape[0]
+    labels = np.full(n, -1, dtype=np.intp)
+    adjacency = distances <= eps
+    core = adjacency.sum(axis=1) >= min_samples
+    core_idx = np.flatnonzero(core)
+    if not len(core_idx):
+        return labels
+    _, components = connected_components(sparse.csr_matrix(adjacency[np.ix_(core_idx, core_idx)]),
+                                         directed=False)
+    labels[core_idx] = components
+    border_idx = np.flatnonzero(~core)
+    if len(border_idx):
+        dist = distances[np.ix_(border_idx, core_idx)]
+        nearest = dist.argmin(axis=1)
+        reachable = dist[np.arange(len(border_idx)), nearest] <= eps
+        labels[border_idx[reachable]] = components[nearest[reachable]]
+    return labels
+
+
+def _cosine_distances(vectors):
+    distances = np.clip(1.0 - (vectors @ vectors.T).toarray(), 0.0, 2.0)
+    np.fill_diagonal(distances, 0.0)
+    return distances
+
+
+def _quality(vectors, labels):
+    """{"clusters": 클러스터 수, "silhouette": 노이즈 제외 실루엣 (dedup_engine 과 같은 정의, 못 구하면 None)}"""
+    mask = labels != -1
+    clusters = len(set(labels[mask].tolist()))
+    score = None
+    if clusters > 1 and np.sum(mask) > 1:
+        idx = np.flatnonzero(mask)
+        try:
+            score = float(silhouette_score(_cosine_distances(vectors[idx]), labels[mask], metric='precomputed'))
+        except ValueError:
+            score = None
+    return {"clusters": clusters, "silhouette": score}
+
+
+class ClusterState:
+    def __init__(self, articles, labels, representatives, params, vocabulary, idf, max_results, added=0,
+                 baseline=None, quality=None):
+        """
+        Args:
+            articles (list[dict]): 수집한 기사 corpus (최신순, NEWS_FIELDS)
+            labels (list[int]): 기사별 클러스터 라벨 (-1 노이즈)
+            representatives (list[str]): 대표 기사 링크
+            params (dict): 전체 클러스터링에서 고른 eps / min_samples / nc
+            vocabulary (list[str]): TF-IDF 어휘 (열 순서)
+            idf (list[float]): 어휘별 idf
+            max_results (int): corpus 최대 기사 수 (네이버 max_results)
+            added (int): 마지막 전체 클러스터링 이후 증분으로 붙인 기사 수
+            baseline (dict): 마지막 전체 클러스터링 결과의 품질 {"clusters", "silhouette"}
+            quality (dict): 지금 라벨의 품질 (증분으로 붙인 뒤, 없으면 baseline 과 같음)
+        """
+        self.articles = articles
+        self.labels = np.asarray(labels, dtype=np.intp)
+        self.representatives = list(representatives)
+        self.params = params
+        self.vocabulary = list(vocabulary)
+        self.idf = np.asarray(idf, dtype=np.float32)
+        self.max_results = max_results
+        self.added = added
+        self.baseline = baseline or {"clusters": 0, "silhouette": None}
+        self.quality = quality or self.baseline
+        self.link_set = {a.get('originallink') for a in articles}
+
+    @classmethod
+    def build(cls, articles_df, clusters, params, deduplicated_df, max_results):
+        """전체 클러스터링 결과로 상태를 만든다 (TF-IDF 는 같은 설정으로 다시 학습)"""
+        vectorizer = TfidfVectorizer(dtype=np.float32)
+        vectors = vectorizer.fit_transform(articles_df['processed_text'].tolist())
+        vocabulary = [None] * len(vectorizer.vocabulary_)
+        for token, column in vectorizer.vocabulary_.items():
+            vocabulary[column] = token
+        articles = [{f: article.get(f) for f in NEWS_FIELDS} for article in articles_df.to_dict('records')]
+        labels = np.asarray(clusters, dtype=np.intp)
+        return cls(articles, labels, deduplicated_df['originallink'].tolist(),
+                   {k: params[k] for k in ('eps', 'min_samples', 'nc')},
+                   vocabulary, vectorizer.idf_, max_results, baseline=_quality(vectors, labels))
+
+    @property
+    def drift(self):
+        return self.added / max(1, len(self.articles))
+
+    def quality_drift(self):
+        """baseline 대비 (클러스터 수 변화 비율, 실루엣 하락폭). 실루엣을 못 구하면 하락폭 0"""
+        base, now = self.baseline, self.quality
+        change = abs(now["clusters"] - base["clusters"]) / max(1, base["clusters"])
+        drop = 0.0
+        if base["silhouette"] is not None and now["silhouette"] is not None:
+            drop = base["silhouette"] - now["silhouette"]
+        return change, drop
+
+    def recluster_reason(self, drift_threshold=DEFAULT_DRIFT_THRESHOLD, cluster_change=DEFAULT_CLUSTER_CHANGE,
+                         silhouette_drop=DEFAULT_SILHOUETTE_DROP):
+        """전체 클러스터링이 필요하면 (DELTA_REFRESH outcome, 설명), 아니면 None"""
+        if self.drift > drift_threshold:
+            return 'reclustered', f"drift {self.drift:.0%} > {drift_threshold:.0%}"
+        change, drop = self.quality_drift()
+        if change > cluster_change:
+            return 'reclustered_quality', (f"클러스터 수 {self.baseline['clusters']} → {self.quality['clusters']} "
+                                           f"({change:.0%} > {cluster_change:.0%})")
+        if drop > silhouette_drop:
+            return 'reclustered_quality', (f"실루엣 {self.baseline['silhouette']:.3f} → {self.quality['silhouette']:.3f} "
+                                           f"(하락 {drop:.3f} > {silhouette_drop})")
+        return None
+
+    def to_dict(self):
+        return {
+            "version": STATE_VERSION,
+            "articles": pack_articles(self.articles, NEWS_FIELDS),
+            "labels": self.labels.tolist(),
+            "representatives": self.representatives,
+            "params": self.params,
+            "vocabulary": self.vocabulary,
+            "idf": [round(float(v), 5) for v in self.idf],
+            "max_results": self.max_results,
+            "added": self.added,
+            "baseline": self.baseline,
+            "quality": self.quality,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get("version") != STATE_VERSION:
+            raise ValueError(f"지원하지 않는 클러스터 상태 버전: {data.get('version')}")
+        return cls(unpack_articles(data["articles"]), data["labels"], data["representatives"], data["params"],
+                   data["vocabulary"], data["idf"], data["max_results"], data.get("added", 0),
+                   data.get("baseline"), data.get("quality"))
+
+    def _vectorizer(self):
+        vectorizer = TfidfVectorizer(dtype=np.float32,
+                                     vocabulary={token: i for i, token in enumerate(self.vocabulary)})
+        vectorizer.idf_ = self.idf
+        return vectorizer
+
+    def merge(self, new_articles):
+        """
+        새 기사(최신순, processed_text 포함)를 붙인 새 ClusterState 와 통계를 반환한다 (self 는 그대로).
+        corpus 는 최신 max_results 건만 남긴다.
+        """
+        seen, fresh = set(self.link_set), []
+        for article in new_articles:
+            link = article.get('originallink')
+            if link not in seen:
+                seen.add(link)
+                fresh.append({f: article.get(f) for f in NEWS_FIELDS})
+        stats = {"new": len(fresh), "assigned": 0, "new_clusters": 0, "noise": 0, "dropped": 0}
+        if not fresh:
+            return self, stats
+
+        eps, min_samples = float(self.params['eps']), int(self.params['min_samples'])
+        vectorizer = self._vectorizer()
+        old_vectors = vectorizer.transform([a.get('processed_text') or '' for a in self.articles])
+        new_vectors = vectorizer.transform([a.get('processed_text') or '' for a in fresh])
+        new_labels = np.full(len(fresh), -1, dtype=np.intp)
+
+        # 1) 클러스터에 속한 기존 기사 중 가장 가까운 기사가 eps 이내면 그 클러스터로
+        clustered = np.flatnonzero(self.labels != -1)
+        if len(clustered):
+            similarity = (new_vectors @ old_vectors[clustered].T).toarray()
+            nearest = similarity.argmax(axis=1)
+            close = 1.0 - similarity[np.arange(len(fresh)), nearest] <= eps
+            new_labels[close] = self.labels[clustered[nearest[close]]]
+        stats["assigned"] = int(np.sum(new_labels != -1))
+
+        # 2) 남은 새 기사 + 기존 노이즈 기사로 새 클러스터
+        labels = self.labels.copy()
+        pending = np.flatnonzero(new_labels == -1)
+        noise = np.flatnonzero(labels == -1)
+        if len(pending):
+            candidates = sparse.vstack([new_vectors[pending], old_vectors[noise]]).tocsr()
+            grouped = _dbscan(_cosine_distances(candidates), eps, min_samples)
+            next_label = int(labels.max(initial=-1)) + 1
+            for group in sorted(set(grouped) - {-1}):
+                members = np.flatnonzero(grouped == group)
+                if not np.any(members < len(pending)):
+                    continue  # 기존 노이즈끼리만 묶인 경우는 그대로 둔다
+                new_labels[pending[members[members < len(pending)]]] = next_label
+                labels[noise[members[members >= len(pending)] - len(pending)]] = next_label
+                next_label += 1
+                stats["new_clusters"] += 1
+        stats["noise"] = int(np.sum(new_labels == -1))
+
+        articles = fresh + self.articles
+        labels = np.concatenate([new_labels, labels])
+        vectors = sparse.vstack([new_vectors, old_vectors]).tocsr()
+        if len(articles) > self.max_results:
+            stats["dropped"] = len(articles) - self.max_results
+            articles, labels = articles[:self.max_results], labels[:self.max_results]
+            vectors = vectors[:self.max_results]
+        representatives = self._pick_representatives(articles, labels)
+        merged = ClusterState(articles, labels, representatives, self.params, self.vocabulary, self.idf,
+                              self.max_results, self.added + len(fresh), self.baseline, _quality(vectors, labels))
+        return merged, stats
+
+    def _pick_representatives(self, articles, labels):
+        """기존 대표는 유지하고, 클러스터마다 min(nc, 크기) 개가 되도록 최신 기사부터 채운다"""
+        nc = int(self.params['nc'])
+        previous = set(self.representatives)
+        chosen = {}
+        for i in np.flatnonzero(labels != -1):
+            if articles[i].get('originallink') in previous:
+                chosen.setdefault(int(labels[i]), []).append(i)
+        for i in np.flatnonzero(labels != -1):
+            members = chosen.setdefault(int(labels[i]), [])
+            if len(members) < nc and i not in members:
+                members.append(i)
+        return [articles[i].get('originallink') for label in sorted(chosen) for i in sorted(chosen[label])[:nc]]
+
+    def frame(self):
+        """corpus DataFrame (text 복원, cluster 라벨 포함)"""
+        df = pd.DataFrame(self.articles, columns=list(NEWS_FIELDS))
+        df['text'] = df['title'].fillna('') + ' ' + df['description'].fillna('')
+        df['cluster'] = self.labels
+        return df
+
+    def deduplicated_frame(self):
+        """대표 기사 DataFrame (select_representatives 처럼 cluster 순)"""
+        df = self.frame()
+        df = df[df['originallink'].isin(set(self.representatives)) & (df['cluster'] != -1)]
+        return df.sort_values('cluster', kind='stable').reset_index(drop=True)
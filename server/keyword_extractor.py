@@ -4,50 +4,181 @@
 - 기존 로직에 영향 없이 별도 파일로 관리
 - 형태소 분석기(konlpy의 Okt 등) 또는 간단한 규칙 기반 추출 지원
 - 외부 라이브러리 미설치 환경도 고려해 fallback 제공
+- Okt(JVM)는 import 시점이 아니라 처음 쓸 때 / startup warm-up 에서 띄운다.
+  config.KEYWORD_EXTRACTOR: 'auto'(기본, Okt 준비 전까지는 정규식), 'okt', 'regex'
+- 같은 문장은 LRU memo 에서 바로 반환, 여러 문장은 extract_keywords_batch 로 한 번에 분석
 """
 
-from typing import List
-
-# 우선 konlpy가 있으면 사용하는 방식, 없으면 fallback
-try:
-    from konlpy.tag import Okt
-    okt = Okt()
-    # 불용어 리스트 (OKT에서도 활용)
-    stopwords = set([
-        '어떻게', '왜', '뭐', '무엇', '누구', '언제', '어디',
-        '는', '가', '을', '를', '이', '에', '의', '도', '로', '으로', '에서', '부터', '까지',
-        '그리고', '그러나', '하지만', '그래서', '그러면', '그런데', '또한', '또', '및', '등', '등등'
-    ])
-    def extract_keywords(text: str, top_k: int = 10) -> List[str]:
-        # 명사만 추출 후, 길이 1 이상 & 불용어 제거
-        nouns = okt.nouns(text)
-        keywords = [n for n in nouns if len(n) > 1 and n not in stopwords]
-        # 중복 제거 및 top_k개 반환
-        keywords = list(dict.fromkeys(keywords))
-        return keywords[:top_k]
-except ImportError:
-    import re
-    # 불용어 리스트(필요시 확장)
-    stopwords = set([
-        '어떻게', '왜', '뭐', '무엇', '누구', '언제', '어디',
-        '는', '가', '을', '를', '이', '가', '에', '의', '도', '로', '으로', '에서', '부터', '까지',
-        '에게', '한테', '밖에', '마다', '까지', '처럼', '보다', '하고', '및', '과', '와', '든지', '이나', '나', '라도', '조차', '마저', '만큼', '씩', '밖에', '뿐', '이나마', '이나마', '커녕', '조차', '까지도', '이라도', '이라곤', '이라면', '이지만', '인데', '이고', '이며', '이자', '이어서', '이든', '이라든', '이란', '이랑', '이래서', '이래도', '이랬다', '이랬던', '이랬으면', '이랬으니', '이랬으니까', '이랬을까', '이랬을텐데', '이랬을지', '이랬으리라', '이랬으리니', '이랬으리만큼', '이랬으리만치', '이랬으리만은', '이랬으리만도', '이랬으리만큼은', '이랬으리만치도', '이랬으리만은', '이랬으리만도', '이랬으리만큼은', '이랬으리만치도', '이랬으리만은', '이랬으리만도', '이랬으리만큼은', '이랬으리만치도', '이랬으리만은', '이랬으리만도', '이랬으리만큼은', '이랬으리만치도', '이랬으리만은', '이랬으리만도', '이랬으리만큼은', '이랬으리만치도', '이랬으리만은', '이랬으리만도', '이랬으리만큼은', '이랬으리만치도',
-        '그리고', '그러나', '하지만', '그래서', '그러면', '그런데', '또한', '또', '및', '등', '등등'
-    ])
-    def extract_keywords(text: str, top_k: int = 10) -> List[str]:
-        # 한글/영문/숫자 단어 추출 (2글자 이상)
-        candidates = re.findall(r'[가-힣]{2,}|[a-zA-Z0-9]{2,}', text)
-        # 불용어/질문어 리스트
-        stopwords = set([
-            '어떻게', '왜', '뭐', '무엇', '누구', '언제', '어디',
-            '는', '가', '을', '를', '이', '에', '의', '도', '로', '으로', '에서', '부터', '까지',
-            '그리고', '그러나', '하지만', '그래서', '그러면', '그런데', '또한', '또', '및', '등', '등등'
-        ])
-        question_words = set(['어떻게', '왜', '뭐', '무엇', '누구', '언제', '어디', '될까', '되나', '되니', '되냐', '되나요', '되었나', '되었나요', '궁금', '알려줘', '알고싶', '싶다', '싶어요', '싶니', '싶나요', '있나요', '있니', '있나'])
-        # 후보 중 불용어/질문어 제거 및 중복 제거
-        filtered = [w for w in candidates if w not in stopwords and w not in question_words]
-        filtered = list(dict.fromkeys(filtered))
-        return filtered[:top_k]
+import importlib.util
+import re
+import threading
+from collections import OrderedDict
+from typing import List, Optional
+
+MEMO_SIZE = 4096
+
+# 불용어 리스트(필요시 확장)
+stopwords = set([
+    '어떻게', '왜', '뭐', '무엇', '누구', '언제', '어디',
+    '는', '가', '을', '를', '이', '에', '의', '도', '로', '으로', '에서', '부터', '까지',
+    '그리고', '그러나', '하지만', '그래서', '그러면', '그런데', '또한', '또', '및', '등', '등등'
+])
+question_words = set(['어떻게', '왜', '뭐', '무엇', '누구', '언제', '어디', '될까', '되나', '되니', '되냐', '되나요', '되었나', '되었나요', '궁금', '알려줘', '알고싶', '싶다', '싶어요', '싶니', '싶나요', '있나요', '있니', '있나'])
+# 정규식 경로: 단어 끝의 조사를 떼어 낸다 (긴 것부터, 남는 부분이 2글자 이상일 때만)
+josa = set(['의', '에', '에서', '에게', '도', '만', '까지', '부터', '보다', '처럼', '이나', '하고',
+            '에서의', '으로의', '에는', '에도', '과의', '와의'])
+# 받침 유무로 갈리는 조사: 받침 있는 글자 뒤에만 / 받침 없는 글자 뒤에만 붙는다 ('전문가' 의 '가' 는 조사가 아님)
+josa_after_batchim = set(['은', '이', '을', '과', '으로', '이랑', '이란'])
+josa_after_vowel = set(['는', '가', '를', '와', '로', '랑', '란'])
+
+_CANDIDATE = re.compile(r'[가-힣]{2,}|[a-zA-Z0-9]{2,}')
+_BATCH_SEPARATOR = ';;;'  # Okt 배치 분석 시 문장 경계 (Punctuation 토큰 하나로 분리됨)
+
+_okt = None
+_okt_lock = threading.Lock()
+_memo = OrderedDict()
+_memo_lock = threading.Lock()
+
+
+def okt_available() -> bool:
+    return importlib.util.find_spec('konlpy') is not None
+
+
+def get_okt():
+    """Okt 인스턴스 (처음 호출 시 JVM 기동). konlpy 가 없으면 None"""
+    global _okt
+    if _okt is None and okt_available():
+        with _okt_lock:
+            if _okt is None:
+                from konlpy.tag import Okt
+                _okt = Okt()
+    return _okt
+
+
+def _mode():
+    try:
+        import config
+        return getattr(config, 'KEYWORD_EXTRACTOR', 'auto')
+    except ImportError:
+        return 'auto'
+
+
+def _use_okt(mode):
+    if mode == 'regex':
+        return False
+    if mode == 'okt':
+        return get_okt() is not None
+    return _okt is not None  # auto: warm-up 이 끝난 뒤에만 (JVM 기동을 요청이 기다리지 않도록)
+
+
+def _filter(words, top_k):
+    keywords = [w for w in words if len(w) > 1 and w not in stopwords and w not in question_words]
+    # 중복 제거 및 top_k개 반환
+    return list(dict.fromkeys(keywords))[:top_k]
+
+
+def _has_batchim(char):
+    code = ord(char) - 0xAC00
+    return 0 <= code <= 11171 and code % 28 != 0
+
+
+def _strip_josa(word):
+    for size in (3, 2, 1):
+        stem, suffix = word[:-size], word[-size:]
+        if len(stem) < 2:
+            continue
+        if suffix in josa:
+            if suffix == '의' and stem.endswith('주'):  # 민주주의, 자본주의
+                continue
+            return stem
+        if suffix in josa_after_batchim and _has_batchim(stem[-1]):
+            return stem
+        if suffix in josa_after_vowel and not _has_batchim(stem[-1]):
+            return stem
+    return word
+
+
+def regex_keywords(text: str, top_k: int = 10) -> List[str]:
+    """정규식 fast path: 한글/영문/숫자 2글자 이상 단어에서 조사·불용어·질문어 제거"""
+    return _filter([_strip_josa(w) for w in _CANDIDATE.findall(text)], top_k)
+
+
+def okt_keywords(text: str, top_k: int = 10) -> List[str]:
+    """Okt 명사 추출 (konlpy 필요)"""
+    return _filter(get_okt().nouns(text), top_k)
+
+
+def _okt_batch(texts, top_k):
+    """여러 문장을 Okt 한 번 호출로 분석. 문장 경계가 어긋나면 한 문장씩 다시 분석"""
+    if len(texts) == 1 or any(_BATCH_SEPARATOR in t for t in texts):
+        return [okt_keywords(t, top_k) for t in texts]
+    groups = [[]]
+    for word, tag in get_okt().pos(f' {_BATCH_SEPARATOR} '.join(texts)):
+        if tag == 'Punctuation' and word == _BATCH_SEPARATOR:
+            groups.append([])
+        elif tag == 'Noun':
+            groups[-1].append(word)
+    if len(groups) != len(texts):
+        return [okt_keywords(t, top_k) for t in texts]
+    return [_filter(nouns, top_k) for nouns in groups]
+
+
+def _memo_key(text, top_k, use_okt):
+    return (' '.join(str(text).split()), top_k, use_okt)
+
+
+def _memo_get(key):
+    with _memo_lock:
+        value = _memo.get(key)
+        if value is not None:
+            _memo.move_to_end(key)
+        return value
+
+
+def _memo_set(key, value):
+    with _memo_lock:
+        _memo[key] = value
+        _memo.move_to_end(key)
+        while len(_memo) > MEMO_SIZE:
+            _memo.popitem(last=False)
+
+
+def extract_keywords(text: str, top_k: int = 10, mode: Optional[str] = None) -> List[str]:
+    return extract_keywords_batch([text], top_k, mode)[0]
+
+
+def extract_keywords_batch(texts: List[str], top_k: int = 10, mode: Optional[str] = None) -> List[List[str]]:
+    """문장 리스트 → 문장별 키워드 리스트. memo 에 없는 문장만 모아 한 번에 분석한다."""
+    use_okt = _use_okt(mode or _mode())
+    keys = [_memo_key(t, top_k, use_okt) for t in texts]
+    results = [_memo_get(key) for key in keys]
+    missing = {}
+    for i, key in enumerate(keys):
+        if results[i] is None:
+            missing.setdefault(key, []).append(i)
+    if missing:
+        sentences = [key[0] for key in missing]
+        if use_okt:
+            analysed = _okt_batch(sentences, top_k)
+        else:
+            analysed = [regex_keywords(s, top_k) for s in sentences]
+        for key, keywords in zip(missing, analysed):
+            _memo_set(key, tuple(keywords))
+            for i in missing[key]:
+                results[i] = tuple(keywords)
+    return [list(r) for r in results]
+
+
+def warm_up():
+    """Okt JVM 기동 (konlpy 가 있을 때만). startup warm-up 스레드에서 호출"""
+    if get_okt() is not None:
+        okt_keywords("삼성전자 주가는 어떻게 돼?")
+
+
+def clear_memo():
+    with _memo_lock:
+        _memo.clear()
+
 
 if __name__ == "__main__":
     # 테스트용
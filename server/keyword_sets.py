@@ -0,0 +1,81 @@
+# keyword_sets.py
+"""
+검색어(단어)별 기사 집합과 집합 연산으로 답하는 조합 검색.
+- 단어 하나짜리 검색이 네이버에서 기사를 가져오면 kwset:{단어} ZSET 에 기사 링크를 넣는다
+  (점수 = pubDate 를 YYYYMMDDHHMM 정수로, 최신 KEYWORD_SET_MAX 건만 유지)
+- 여러 단어 조합(["삼성전자", "반도체"])은 단어별 집합이 모두 있으면 네이버 대신
+  Redis 안에서 ZINTERSTORE(AND, 점수 MAX = 최신순) 또는 ZUNIONSTORE(OR, 점수 SUM = 많이 겹친 기사 먼저,
+  같은 수면 최신순)로 합쳐 상위 limit 건만 읽는다. 중복 제거는 합친 작은 집합에만 돈다
+- 조합 검색이 집합만으로 답했는지는 stats:combined_query (redis_manager) 와
+  newshive_combined_queries_total 로 센다
+config: KEYWORD_SETS(True), KEYWORD_SET_OP('and'/'or'), KEYWORD_SET_MIN_RESULTS(30)
+"""
+
+import re
+import uuid
+
+from redis_manager import RESULT_TTL
+
+KEYWORD_SET_TTL = RESULT_TTL  # kwset:* 만료 — 합친 결과가 결과 캐시 신선 기간보다 오래되지 않도록
+KEYWORD_SET_MAX = 1000        # 단어마다 유지하는 최신 기사 수
+TEMP_TTL = 60                 # 집합 연산 임시 키 (같은 트랜잭션에서 지우지만 혹시 남을 때 대비)
+
+_PUBDATE = re.compile(r"(\d{4})\.(\d{2})\.(\d{2})\. (오전|오후) (\d{1,2}):(\d{2})")
+
+
+def pubdate_score(pub_date):
+    """'2025.01.01. 오후 1:05' (text_ingest.format_pubdate 형식) → 202501011305. 읽지 못하면 0"""
+    m = _PUBDATE.fullmatch(pub_date) if isinstance(pub_date, str) else None
+    if not m:
+        return 0
+    year, month, day, ampm, hour, minute = m.groups()
+    hour = int(hour) % 12 + (12 if ampm == "오후" else 0)
+    return int(f"{year}{month}{day}{hour:02}{minute}")
+
+
+class KeywordSets:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def add_articles(self, keyword, articles, ttl=KEYWORD_SET_TTL):
+        """단어 하나의 검색 결과 기사를 kwset:{단어} 에 넣고 만료 시간을 새로 건다 (왕복 1회)"""
+        members = {}
+        for article in articles:
+            link = article.get('originallink')
+            if isinstance(link, str) and link.startswith('http'):
+                members[link] = pubdate_score(article.get('pubDate'))
+        if not members:
+            return 0
+        key = f"kwset:{keyword}"
+        pipe = self.conn.pipeline(transaction=True)
+        pipe.zadd(key, members)
+        pipe.zremrangebyrank(key, 0, -(KEYWORD_SET_MAX + 1))
+        pipe.expire(key, ttl)
+        pipe.execute()
+        return len(members)
+
+    def compose(self, keywords, op="and", limit=500):
+        """
+        단어별 집합을 합친 기사 링크 (점수 높은 순, 최대 limit 개).
+        단어 중 하나라도 집합이 없으면(아직 수집 안 했거나 만료) None → 네이버 호출.
+        EXISTS 확인과 집합 연산, 임시 키 삭제를 MULTI 한 번(왕복 1회)에 한다.
+        """
+        if op not in ("and", "or"):
+            raise ValueError(f"알 수 없는 집합 연산: {op}")
+        keys = [f"kwset:{keyword}" for keyword in sorted(set(keywords))]
+        if not keys:
+            return None
+        dest = f"tmp:kwset:{uuid.uuid4().hex}"
+        pipe = self.conn.pipeline(transaction=True)
+        pipe.exists(*keys)
+        if op == "and":
+            pipe.zinterstore(dest, keys, aggregate="MAX")
+        else:
+            pipe.zunionstore(dest, keys, aggregate="SUM")
+        pipe.expire(dest, TEMP_TTL)
+        pipe.zrevrange(dest, 0, limit - 1)
+        pipe.unlink(dest)
+        existing, _, _, links, _ = pipe.execute()
+        if existing < len(keys):
+            return None
+        return links
@@ -0,0 +1,202 @@
+# metrics.py
+"""
+프로세스 내 지표 수집 + Prometheus 텍스트 형식 출력 (GET /metrics).
+- span(stage): 단계 소요 시간 → newshive_stage_duration_seconds{stage} 히스토그램
+  요청 처리 중(start_trace 이후)이면 같은 요청의 단계 시간을 모아 요청 끝에 한 줄로 남긴다
+- 카운터: 캐시 hit/miss, upstream(네이버/OpenAI/Redis) 오류, 기사 수
+- 라우트별 요청 시간 히스토그램은 app.py 의 before/after_request 에서 기록
+prometheus_client 없이 표준 라이브러리만 사용한다 (serve.py 는 단일 프로세스 + 스레드라 프로세스 간 집계는 없음).
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _format_labels(labelnames, values, extra=()):
+    pairs = list(zip(labelnames, values)) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in pairs)
+    return '{' + ','.join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = 'untyped'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name}: 라벨 {sorted(labels)} != {list(self.labelnames)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _samples(self):
+        """(접미사, 라벨 값, 추가 라벨, 값) 목록"""
+        with self._lock:
+            return [('', key, (), value) for key, value in sorted(self._values.items())]
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, key, extra, value in self._samples():
+            lines.append(f"{self.name}{suffix}{_format_labels(self.labelnames, key, extra)} {_format_value(value)}")
+        return '\n'.join(lines)
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels):
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+
+class Gauge(Counter):
+    kind = 'gauge'
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = {'counts': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry['counts'][i] += 1
+                    break
+            entry['sum'] += value
+            entry['count'] += 1
+
+    def _samples(self):
+        samples = []
+        with self._lock:
+            for key, entry in sorted(self._values.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, entry['counts']):
+                    cumulative += count
+                    samples.append(('_bucket', key, (('le', _format_value(bound)),), cumulative))
+                samples.append(('_sum', key, (), entry['sum']))
+                samples.append(('_count', key, (), entry['count']))
+        return samples
+
+
+REGISTRY = []
+
+REQUEST_SECONDS = Histogram('newshive_http_request_duration_seconds',
+                            '라우트별 요청 처리 시간 (스트리밍 응답은 헤더까지)', ('method', 'route', 'status'))
+STAGE_SECONDS = Histogram('newshive_stage_duration_seconds',
+                          '파이프라인 단계 / GPT 호출 소요 시간', ('stage',))
+CACHE_REQUESTS = Counter('newshive_cache_requests_total',
+                         '캐시 조회 수 (cache: result/keyword_sets/local_index/gpt, result: hit/miss)', ('cache', 'result'))
+COMBINED_QUERIES = Counter('newshive_combined_queries_total',
+                           '여러 단어 조합 검색의 기사 출처 (result_cache/keyword_sets/local_index/naver)', ('source',))
+UPSTREAM_ERRORS = Counter('newshive_upstream_errors_total',
+                          'upstream 호출 실패 수 (naver/openai/redis)', ('upstream',))
+ARTICLES = Counter('newshive_articles_total',
+                   '처리한 기사 수 (fetched: 수집, deduplicated: 중복 제거 후 대표 기사)', ('stage',))
+INFLIGHT = Gauge('newshive_inflight_requests', 'serve.py 에서 처리 중인 요청 수')
+ADMISSION = Counter('newshive_admission_total',
+                    'serve.py 입장 제어 결과 (admitted/rejected/timed_out)', ('outcome',))
+
+
+# ---------- 단계 시간 ----------
+_trace = ContextVar('newshive_trace', default=None)
+
+
+def start_trace():
+    """현재 요청(컨텍스트)의 단계 시간 기록을 시작한다."""
+    return _trace.set([])
+
+
+def finish_trace(token=None):
+    """start_trace 이후 기록된 [(stage, 초)] 를 돌려주고 기록을 끝낸다."""
+    spans = _trace.get() or []
+    if token is not None:
+        _trace.reset(token)
+    else:
+        _trace.set(None)
+    return spans
+
+
+@contextmanager
+def span(stage):
+    """with span('tokenize'): ... — 소요 시간을 히스토그램과 현재 요청 기록에 남긴다 (예외가 나도 기록)."""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - t0
+        STAGE_SECONDS.observe(elapsed, stage=stage)
+        spans = _trace.get()
+        if spans is not None:
+            spans.append((stage, elapsed))
+
+
+def timed(stage):
+    """함수 전체를 span(stage) 로 감싸는 데코레이터"""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def format_spans(spans):
+    """[(stage, 초)] → 'naver_fetch 812ms, tokenize 61ms, naver_page×5 790ms' (같은 단계는 합산)"""
+    totals = {}
+    for stage, elapsed in spans:
+        count, total = totals.get(stage, (0, 0.0))
+        totals[stage] = (count + 1, total + elapsed)
+    return ', '.join(f"{stage}{f'×{count}' if count > 1 else ''} {total * 1000:.0f}ms"
+                     for stage, (count, total) in totals.items())
+
+
+def render():
+    """Prometheus 텍스트 형식 (text/plain; version=0.0.4)"""
+    return '\n'.join(metric.render() for metric in REGISTRY) + '\n'
+
+
+def reset():
+    """모든 지표 초기화 (벤치마크용)"""
+    for metric in REGISTRY:
+        metric.clear()
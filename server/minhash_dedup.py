@@ -0,0 +1,136 @@
+# minhash_dedup.py
+"""
+MinHash / LSH 기반 근접 중복 기사 묶기 (DBSCAN 파라미터 탐색 대체 백엔드).
+- processed_text(soynlp 토큰) 의 연속 토큰 shingle 로 MinHash 서명을 만든다.
+- 서명을 band 로 나눠 같은 버킷에 들어온 기사만 후보 쌍으로 비교한다 → 기사 수에 선형.
+- 결과는 dedup_engine.cluster_articles 와 같은 (clusters, params) 형태라
+  select_representatives 로 같은 'cluster' 컬럼 / 대표 기사 출력을 만든다.
+"""
+
+import zlib
+
+import numpy as np
+
+# 2^31 - 1 (메르센 소수) — a*h + b 가 uint64 범위를 넘지 않도록 해시를 31비트로 자른다
+_PRIME = np.uint64((1 << 31) - 1)
+
+
+class MinHashLSH:
+    def __init__(self, num_perm=128, bands=64, shingle_size=2, threshold=0.3, seed=1):
+        """
+        Args:
+            num_perm (int): MinHash 서명 길이 (bands 의 배수)
+            bands (int): LSH band 수. rows = num_perm // bands
+            shingle_size (int): 연속 토큰 shingle 길이
+            threshold (float): 후보 쌍을 같은 묶음으로 볼 추정 Jaccard 유사도 하한
+            seed (int): 해시 계수 난수 시드 (결과 재현용)
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm 은 bands 의 배수여야 합니다.")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.threshold = threshold
+
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, int(_PRIME), size=num_perm).astype(np.uint64)
+        self._b = rng.randint(0, int(_PRIME), size=num_perm).astype(np.uint64)
+
+    def shingles(self, text):
+        """토큰 k-gram 해시 (31비트). 토큰이 k개보다 적으면 토큰 자체를 쓴다."""
+        tokens = str(text).split()
+        k = self.shingle_size
+        if len(tokens) >= k:
+            grams = (' '.join(tokens[i:i + k]) for i in range(len(tokens) - k + 1))
+        else:
+            grams = tokens
+        hashes = {zlib.crc32(g.encode('utf-8')) & 0x7FFFFFFF for g in grams}
+        return np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+
+    def signatures(self, texts, chunk_size=20000):
+        """문서별 MinHash 서명 (n x num_perm, uint64). 빈 문서는 최댓값으로 채운다."""
+        shingle_sets = [self.shingles(t) for t in texts]
+        n = len(shingle_sets)
+        sigs = np.full((n, self.num_perm), _PRIME, dtype=np.uint64)
+
+        # 여러 문서의 shingle 을 이어붙여 chunk 단위로 한 번에 해시 → reduceat 으로 문서별 최소값
+        doc = 0
+        while doc < n:
+            docs, total = [], 0
+            while doc < n and (not docs or total + len(shingle_sets[doc]) <= chunk_size):
+                if len(shingle_sets[doc]):
+                    docs.append(doc)
+                    total += len(shingle_sets[doc])
+                doc += 1
+            if not docs:
+                continue
+            flat = np.concatenate([shingle_sets[d] for d in docs])
+            offsets = np.cumsum([0] + [len(shingle_sets[d]) for d in docs[:-1]])
+            hashed = (self._a[:, None] * flat[None, :] + self._b[:, None]) % _PRIME
+            sigs[docs] = np.minimum.reduceat(hashed, offsets, axis=1).T
+        return sigs
+
+    @staticmethod
+    def _band_keys(band_sigs):
+        """band 의 row 값들을 uint64 하나로 합친 버킷 키 (오버플로는 해시로 취급)"""
+        keys = np.zeros(len(band_sigs), dtype=np.uint64)
+        for col in band_sigs.T:
+            keys = keys * np.uint64(0x9E3779B1) + col
+        return keys
+
+    def cluster(self, texts, min_cluster_size=2):
+        """
+        근접 중복 묶음 라벨. 묶음 크기가 min_cluster_size 미만이면 -1 (DBSCAN 노이즈와 동일 취급).
+        """
+        sigs = self.signatures(texts)
+        n = len(sigs)
+        parent = list(range(n))
+
+        def find(x):
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        empty = (sigs == _PRIME).all(axis=1)
+        candidates = np.flatnonzero(~empty)
+        for band in range(self.bands):
+            keys = self._band_keys(sigs[candidates, band * self.rows:(band + 1) * self.rows])
+            order = np.argsort(keys, kind='stable')
+            sorted_keys = keys[order]
+            # 같은 버킷(키가 같은 연속 구간)의 첫 문서와 나머지 문서를 후보 쌍으로
+            starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+            heads = np.repeat(starts, np.diff(np.r_[starts, len(order)]))
+            for head, other in zip(candidates[order[heads]], candidates[order]):
+                if head == other:
+                    continue
+                ra, rb = find(head), find(other)
+                if ra == rb:
+                    continue
+                # band 충돌(후보)만으로 묶지 않고 서명 일치율로 Jaccard 를 추정해 확인
+                if np.mean(sigs[head] == sigs[other]) >= self.threshold:
+                    parent[rb] = ra
+
+        roots = np.array([find(i) for i in range(n)])
+        _, inverse, counts = np.unique(roots, return_inverse=True, return_counts=True)
+        clusters = np.full(n, -1, dtype=np.intp)
+        keep = counts[inverse] >= min_cluster_size
+        # 등장 순서대로 0부터 번호를 다시 매긴다
+        relabel = {}
+        for i in np.flatnonzero(keep):
+            clusters[i] = relabel.setdefault(roots[i], len(relabel))
+        return clusters
+
+
+def cluster_articles_minhash(texts, min_cluster_size=2, **lsh_params):
+    """
+    dedup_engine.cluster_articles 와 같은 형태의 (clusters, params) 반환.
+    대표 기사 수(nc) 규칙도 같다: 묶음이 4개 미만이면 2개, 아니면 1개.
+    """
+    lsh = MinHashLSH(**lsh_params)
+    clusters = lsh.cluster(texts, min_cluster_size=min_cluster_size)
+    num_clusters = len(set(clusters)) - (1 if -1 in clusters else 0)
+    nc = 2 if num_clusters < 4 else 1
+    return clusters, {'backend': 'minhash', 'threshold': lsh.threshold,
+                      'min_samples': min_cluster_size, 'num_clusters': num_clusters, 'nc': nc}
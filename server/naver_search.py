@@ -1,46 +1,164 @@
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
 import requests
-import json
-from typing import Dict, Any
+from requests.adapters import HTTPAdapter
+
+from metrics import UPSTREAM_ERRORS, timed
+from rate_limiter import RateLimited
+
+NAVER_NEWS_URL = "https://openapi.naver.com/v1/search/news.json"
+MAX_START = 1000  # 네이버 검색 API start 최대값
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
 
 class NaverSearch:
-    def __init__(self, client_id: str, client_secret: str):
+    def __init__(self, client_id: str, client_secret: str, base_url: str = NAVER_NEWS_URL,
+                 fan_out: int = 5, max_retries: int = 3, backoff: float = 0.3, timeout: float = 5.0,
+                 limiter=None):
+        """
+        Args:
+            client_id (str): 네이버 API Client ID
+            client_secret (str): 네이버 API Client Secret
+            base_url (str): 뉴스 검색 API 주소 (로컬 가짜 서버 테스트 시 변경)
+            fan_out (int): 동시에 요청할 페이지 수 (커넥션 풀 크기와 같다)
+            max_retries (int): 페이지별 재시도 횟수
+            backoff (float): 재시도 대기 기본값(초). 시도마다 2배씩 늘어난다.
+            timeout (float): 요청 타임아웃(초)
+            limiter: 워커 간 공유 속도 제한 (rate_limiter.RateLimiter). 요청마다 토큰을 받고, 429 면 모두 멈춘다
+        """
         self.client_id = client_id
         self.client_secret = client_secret
-        self.base_url = "https://openapi.naver.com/v1/search/news.json"
-        
+        self.base_url = base_url
+        self.fan_out = max(1, fan_out)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.limiter = limiter
+
+        # keep-alive 커넥션을 재사용하는 세션 (스레드 간 공유)
+        self.session = requests.Session()
+        self.session.headers.update({
+            "X-Naver-Client-Id": self.client_id,
+            "X-Naver-Client-Secret": self.client_secret
+        })
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.fan_out)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._executor = ThreadPoolExecutor(max_workers=self.fan_out, thread_name_prefix="naver")
+
+    @timed('naver_page')
     def search(self, query: str, display: int = 10, start: int = 1, sort: str = "sim") -> Dict[str, Any]:
         """
         네이버 뉴스 검색 API를 사용하여 검색을 수행합니다.
-        
+        연결 오류 / 429 / 5xx 응답은 backoff 후 max_retries 번까지 다시 시도합니다.
+        limiter 가 있으면 요청 전에 토큰을 받고, 429 의 Retry-After 는 limiter 에 기록해 다른 워커도 함께 기다립니다.
+
         Args:
             query (str): 검색어
             display (int): 한 번에 표시할 검색 결과 개수 (최대 100)
             start (int): 검색 시작 위치 (최대 1000)
             sort (str): 정렬 방식 (sim: 정확도순, date: 날짜순)
-            
+
         Returns:
-            Dict[str, Any]: 검색 결과
+            Dict[str, Any]: 검색 결과 (실패 시 {"error": ...})
         """
-        headers = {
-            "X-Naver-Client-Id": self.client_id,
-            "X-Naver-Client-Secret": self.client_secret
-        }
-        
         params = {
             "query": query,
             "display": display,
             "start": start,
             "sort": sort
         }
-        
-        try:
-            response = requests.get(
-                self.base_url,
-                headers=headers,
-                params=params
-            )
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            print(f"검색 중 오류 발생: {e}")
-            return {"error": str(e)} 
\ No newline at end of file
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                if self.limiter is not None:
+                    self.limiter.acquire()
+                response = self.session.get(self.base_url, params=params, timeout=self.timeout)
+                if response.status_code in RETRY_STATUS and attempt < self.max_retries:
+                    delay = self._retry_delay(attempt, response.headers.get("Retry-After"))
+                    if response.status_code == 429 and self.limiter is not None:
+                        self.limiter.penalize(delay)  # 다음 acquire 가 모든 워커에서 delay 만큼 기다림
+                    else:
+                        time.sleep(delay)
+                    continue
+                response.raise_for_status()
+                return response.json()
+            except RateLimited as e:
+                print(f"검색 요청 제한: {e}")
+                return {"error": str(e)}
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if attempt < self.max_retries:
+                    time.sleep(self._retry_delay(attempt))
+                    continue
+                print(f"검색 중 오류 발생: {e}")
+                return {"error": str(e)}
+            except requests.exceptions.RequestException as e:
+                print(f"검색 중 오류 발생: {e}")
+                return {"error": str(e)}
+        return {"error": "재시도 횟수 초과"}
+
+    def _retry_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Retry-After 헤더가 있으면 따르고, 없으면 지수 backoff"""
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        return self.backoff * (2 ** attempt)
+
+    def iter_pages(self, query: str, max_results: int = 500, display: int = 100,
+                   sort: str = "date", fan_out: Optional[int] = None) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+        """
+        여러 페이지를 fan_out 개씩 동시에 요청하고, 페이지가 도착하는 대로 (start, items) 를 내보냅니다.
+        - 어떤 페이지가 display 보다 적게 돌아오거나 total 을 넘으면 다음 묶음은 요청하지 않습니다.
+        - 실패한 페이지는 건너뜁니다 (부분 결과 허용).
+        """
+        fan_out = max(1, min(fan_out or self.fan_out, self.fan_out))
+        starts = [s for s in range(1, max_results + 1, display) if s <= MAX_START]
+
+        failed = []
+        for i in range(0, len(starts), fan_out):
+            wave = starts[i:i + fan_out]
+            # 요청 컨텍스트(metrics 의 단계 기록)를 페이지 요청 스레드에도 넘긴다
+            futures = {self._executor.submit(contextvars.copy_context().run,
+                                             self.search, query, display, start, sort): start
+                       for start in wave}
+            done = False
+            for future in as_completed(futures):
+                start = futures[future]
+                result = future.result()
+                if "error" in result:
+                    failed.append(start)
+                    UPSTREAM_ERRORS.inc(upstream='naver')
+                    continue
+                items = result.get("items", [])
+                total = result.get("total")
+                if len(items) < display or (total is not None and start + display > total):
+                    done = True
+                yield start, items[:max_results - start + 1]
+            if done:
+                break
+
+        if failed:
+            print(f"⚠️ 네이버 페이지 {len(failed)}개 실패 (start={sorted(failed)}), 부분 결과 사용")
+
+    def fetch_news(self, query: str, max_results: int = 500, display: int = 100,
+                   sort: str = "date", fan_out: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        iter_pages 로 받은 페이지를 기사 리스트로 합칩니다.
+
+        Returns:
+            List[Dict[str, Any]]: start 순서대로 이어붙인 items
+        """
+        pages = dict(self.iter_pages(query, max_results, display, sort, fan_out))
+        all_items = []
+        for start in sorted(pages):
+            all_items.extend(pages[start])
+        return all_items[:max_results]
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        self.session.close()
@@ -1,217 +1,436 @@
-def process_news(query_list, is_initial=True, max_results=500):
-    from gpt_processor import extract_keywords
-    import numpy as np
-    import pandas as pd
-    import html
-    import re
-    import json
-    import urllib.request
-    import urllib.parse
-    from soynlp.word import WordExtractor
-    from soynlp.tokenizer import LTokenizer
-    from sklearn.metrics import silhouette_score
-    from sklearn.feature_extraction.text import TfidfVectorizer
-    from sklearn.cluster import DBSCAN
-    from config import NAVER_CLIENT_ID, NAVER_CLIENT_SECRET
-    from redis_manager import RedisManager
-    from datetime import datetime
+# 무거운 모듈은 요청마다가 아니라 import 시점(서버 시작 시)에 한 번만 로드
+import pandas as pd
 
+import config
+from cpu_pool import cluster_texts
+from dedup_engine import select_representatives
+from gpt_processor import extract_keywords
+from incremental_dedup import (ClusterState, DEFAULT_CLUSTER_CHANGE, DEFAULT_DRIFT_THRESHOLD,
+                               DEFAULT_SILHOUETTE_DROP, DELTA_REFRESH, NAVER_PAGES_SAVED)
+from naver_search import NaverSearch, NAVER_NEWS_URL
+from rate_limiter import get_limiter
+from article_index import ArticleIndex, query_tokens
+from keyword_sets import KeywordSets
+from metrics import ARTICLES, CACHE_REQUESTS, COMBINED_QUERIES, UPSTREAM_ERRORS, span, timed
+from redis_manager import RedisManager, canonical_query
+from refresher import get_refresher
+from text_ingest import normalize_frame
+from word_model import get_word_model, update_and_snapshot
+
+_naver_client = None
+
+
+def get_naver_client():
+    """프로세스 전체에서 공유하는 NaverSearch (커넥션 풀 재사용)"""
+    global _naver_client
+    if _naver_client is None:
+        _naver_client = NaverSearch(
+            config.NAVER_CLIENT_ID,
+            config.NAVER_CLIENT_SECRET,
+            base_url=getattr(config, 'NAVER_API_URL', NAVER_NEWS_URL),
+            fan_out=getattr(config, 'NAVER_FAN_OUT', 5),
+            limiter=get_limiter('naver'),
+        )
+    return _naver_client
+
+
+def merge_query_keywords(query_list, raw_keywords):
+    """GPT 키워드 앞에 검색어(조합일 경우 전체 문자열)를 넣고 최대 3개로 자른다."""
+    # 🔥 핵심 수정: 항상 검색어(query) 자체를 첫 번째 키워드로 포함, 최대 3개 제한
+    if not (isinstance(raw_keywords, list) and all(isinstance(kw, str) for kw in raw_keywords)):
+        print(f"⚠️ 잘못된 키워드 형식: {type(raw_keywords)}")
+        return []
+    base_query = " ".join(query_list).strip()
+    keywords = [base_query] if base_query and base_query not in raw_keywords else []
+    for kw in raw_keywords:
+        if kw != base_query:
+            keywords.append(kw)
+        if len(keywords) >= 3:
+            break
+    return keywords
+
+
+@timed('clean')
+def clean_page(items):
+    """네이버 items 한 페이지 → 정리한 DataFrame (title/description/pubDate/originallink/text)"""
+    # 제목/설명 HTML 정리, pubDate 변환, text 컬럼을 묶음 단위로 (이미 정리한 링크는 재사용)
+    return normalize_frame(items)
+
+
+def iter_article_pages(query, max_results=500, display=100, sort="date", fan_out=None):
+    """네이버 페이지가 도착하는 대로 (start, 정리한 DataFrame). fan_out=1 이면 한 페이지씩 (델타 수집)"""
+    # 공용 NaverSearch: keep-alive 커넥션 풀 + 페이지 동시 요청 + 페이지별 재시도
+    for start, items in get_naver_client().iter_pages(query, max_results=max_results, display=display,
+                                                      sort=sort, fan_out=fan_out):
+        if items:
+            yield start, clean_page(items)
+
+
+def tokenize_articles(pages):
+    """
+    {start: 페이지 DataFrame} 를 start 순으로 합치고 processed_text 를 붙인 DataFrame.
+    기사가 없으면 None.
+    """
+    if not pages:
+        return None
+    articles_df = pd.concat([pages[start] for start in sorted(pages)], ignore_index=True)
+
+    # 2. 형태소 분석 (soynlp 기반) — 장기 유지 단어 점수 모델을 이번 기사로 갱신 후 토큰화
+    #    (이미 본 기사 텍스트는 memo 에서 재사용)
+    texts = articles_df['text'].tolist()
+    with span('tokenizer_train'):
+        word_model = update_and_snapshot(texts)
+    with span('tokenize'):
+        articles_df['processed_text'] = word_model.tokenize_batch(texts)
+    return articles_df
+
+
+def fetch_articles(query, max_results=500, display=100, sort="date"):
+    """
+    네이버에서 기사를 가져와 정리·토큰화한 DataFrame (title/description/pubDate/originallink/text/processed_text).
+    가져온 기사가 없으면 None.
+    """
+    return tokenize_articles(dict(iter_article_pages(query, max_results, display, sort)))
+
+
+def search_local_corpus(query_list, redis_mgr, min_results=None):
+    """
+    역색인(idx:{토큰})에서 모든 검색어 토큰을 포함하는 기사를 찾는다.
+    min_results(기본 config.LOCAL_INDEX_MIN_RESULTS) 이상이면 DataFrame, 아니면 None (→ 네이버 호출).
+    """
+    if min_results is None:
+        min_results = getattr(config, 'LOCAL_INDEX_MIN_RESULTS', 30)
+    try:
+        with span('local_index'):
+            tokens = query_tokens(query_list, get_word_model().tokenize)
+            links = ArticleIndex(redis_mgr.conn).lookup(tokens)
+            articles = redis_mgr.get_news_articles(links) if len(links) >= min_results else None
+    except Exception as e:
+        print(f"⚠️ 로컬 색인 조회 실패, 네이버 호출: {e}")
+        UPSTREAM_ERRORS.inc(upstream='redis')
+        return None
+    if articles is None:
+        print(f"🔴 로컬 색인 결과 부족 ({len(links)}건 < {min_results}), 네이버 호출")
+    if articles is None or len(articles) < min_results:
+        CACHE_REQUESTS.inc(cache='local_index', result='miss')
+        return None
+    CACHE_REQUESTS.inc(cache='local_index', result='hit')
+    print(f"🟢 로컬 색인 HIT: 토큰 {sorted(tokens)}, 기사 {len(articles)}건")
+    articles_df = pd.DataFrame(articles).drop(columns=['cluster'], errors='ignore')
+    # SINTER 결과는 집합이라 순서가 매번 달라지므로 링크 순으로 고정
+    return articles_df.sort_values('originallink').reset_index(drop=True)
+
+
+def search_keyword_sets(words, redis_mgr, max_results=500, min_results=None):
+    """
+    단어별 기사 집합(kwset:{단어})을 Redis 안에서 합쳐 조합 검색에 답한다 (keyword_sets.py).
+    모든 단어의 집합이 있고 합친 기사가 min_results(기본 config.KEYWORD_SET_MIN_RESULTS) 이상이면
+    점수(최신순) 순 DataFrame, 아니면 None (→ 로컬 색인 / 네이버 호출).
+    """
+    if min_results is None:
+        min_results = getattr(config, 'KEYWORD_SET_MIN_RESULTS', 30)
+    op = getattr(config, 'KEYWORD_SET_OP', 'and')
+    try:
+        with span('keyword_sets'):
+            links = KeywordSets(redis_mgr.conn).compose(words, op, limit=max_results)
+            articles = redis_mgr.get_news_articles(links) if links and len(links) >= min_results else None
+    except Exception as e:
+        print(f"⚠️ 단어별 기사 집합 조회 실패: {e}")
+        UPSTREAM_ERRORS.inc(upstream='redis')
+        return None
+    if articles is None or len(articles) < min_results:
+        CACHE_REQUESTS.inc(cache='keyword_sets', result='miss')
+        if links is not None:
+            print(f"🔴 단어별 집합 {op.upper()} 결과 부족 ({len(links)}건 < {min_results})")
+        return None
+    CACHE_REQUESTS.inc(cache='keyword_sets', result='hit')
+    print(f"🟢 단어별 집합 {op.upper()} HIT: {words}, 기사 {len(articles)}건")
+    return pd.DataFrame(articles).drop(columns=['cluster'], errors='ignore')
+
+
+def save_keyword_set(redis_mgr, word, articles, news=None):
+    """
+    단어 하나짜리 검색의 수집 기사를 kwset:{단어} 에 저장한다. news 는 news:* 에 먼저 저장할 새 기사.
+    news 를 저장했으면 True (최초 검색의 keyword/idx 저장 단계가 다시 저장하지 않도록)
+    """
+    try:
+        if news:
+            redis_mgr.save_news_articles(news)
+        KeywordSets(redis_mgr.conn).add_articles(word, articles)
+        return bool(news)
+    except Exception as e:
+        print(f"❌ 단어별 기사 집합 저장 실패: {str(e)}")
+        UPSTREAM_ERRORS.inc(upstream='redis')
+        return False
+
+
+def record_combined_query(redis_mgr, source):
+    """조합 검색이 어디서 답했는지 (result_cache/keyword_sets/local_index/naver)"""
+    COMBINED_QUERIES.inc(source=source)
+    try:
+        redis_mgr.record_combined_query(source)
+    except Exception as e:
+        print(f"⚠️ 조합 검색 통계 저장 실패: {e}")
+
+
+def load_cluster_state(redis_mgr, query_list, max_results, dedup_backend):
+    """
+    증분 갱신에 쓸 저장된 클러스터 상태 (incremental_dedup.ClusterState).
+    dbscan 백엔드가 아니거나, config.DELTA_FETCH 가 꺼져 있거나, 상태가 없거나 max_results 가 다르면 None.
+    """
+    if dedup_backend != 'dbscan' or not getattr(config, 'DELTA_FETCH', True):
+        return None
+    try:
+        data = redis_mgr.get_cluster_state(query_list)
+        state = ClusterState.from_dict(data) if data else None
+    except Exception as e:
+        print(f"⚠️ 클러스터 상태 조회 실패, 전체 수집: {e}")
+        return None
+    if state is None or state.max_results != max_results:
+        return None
+    return state
+
+
+def save_cluster_state(redis_mgr, query_list, state):
+    try:
+        redis_mgr.save_cluster_state(query_list, state.to_dict())
+    except Exception as e:
+        print(f"❌ 클러스터 상태 저장 실패: {str(e)}")
+        UPSTREAM_ERRORS.inc(upstream='redis')
+
+
+def save_article_set(redis_mgr, articles, keywords=None):
+    """
+    /keywords, /summary, /final_report 가 기사 목록 대신 받을 묶음 ID.
+    저장에 실패하면 None (클라이언트는 기존처럼 기사 목록을 보낸다).
+    """
+    try:
+        return redis_mgr.save_article_set(articles, keywords)
+    except Exception as e:
+        print(f"❌ 기사 묶음 저장 실패: {str(e)}")
+        UPSTREAM_ERRORS.inc(upstream='redis')
+        return None
+
+
+def process_news(query_list, is_initial=True, max_results=500, dedup_backend=None, use_cache=True):
+    """검색 결과 {"articles", "keywords", "article_set_id"} (process_news_stream 의 마지막 result 이벤트)"""
+    for event, data in process_news_stream(query_list, is_initial, max_results, dedup_backend, use_cache):
+        if event == "result":
+            return data
+
+
+def process_news_stream(query_list, is_initial=True, max_results=500, dedup_backend=None, use_cache=True):
+    """
+    검색 파이프라인을 단계별 (이벤트, 데이터) 로 내보내는 generator.
+    - raw_articles: 네이버 페이지 하나를 정리한 기사 (페이지 도착 순, 중복 제거 전)
+    - articles: 중복 제거된 대표 기사와 기사 묶음 ID (결과 캐시 / 로컬 색인 hit 이면 바로)
+    - keywords: 최초 검색의 키워드
+    - result: process_news 반환값과 같은 최종 결과
+    use_cache=False: 결과 캐시를 읽지 않고 다시 계산해 저장 (refresher 의 백그라운드 갱신)
+    여러 단어 조합은 단어별 기사 집합 → (파생 검색이면) 로컬 색인 → 네이버 순으로 기사를 구한다.
+    """
     if isinstance(query_list, str):
         # 기존 단일 query 입력도 허용
         query_list = [query_list]
     query = " ".join(query_list)
     display = 100
     sort = "date"
-    max_results = 500  # 가져올 뉴스의 수
 
-    # ====== Redis 캐시 체크 (키워드 조합) ======
+    # ====== Redis 결과 캐시 체크 (정규화된 키워드 조합, 최초/파생 검색 공용) ======
     redis_mgr = RedisManager()
-    search_key = "keyword:" + query
-    cached_links = redis_mgr.conn.smembers(search_key)
-    articles_from_cache = []
-    if cached_links:
-        print(f"🟢 Redis HIT: {search_key}, 기사 {len(cached_links)}건")
-        for link in cached_links:
-            article = redis_mgr.conn.hgetall(f"news:{link}")
-            if article:
-                articles_from_cache.append(article)
-        if articles_from_cache:
-            keywords = extract_keywords(articles_from_cache)
-            return {"articles": articles_from_cache, "keywords": keywords}
-        else:
-            print(f"⚠️ 링크는 있으나 기사 본문 없음 (news:{{link}})")
-    else:
-        print(f"🔴 Redis MISS: {search_key}")
-
-    # ------ 네이버 뉴스 수집 (캐시 miss 시에만) ------
-    encText = urllib.parse.quote(query)
-    all_results = []
+    search_key = "result:" + canonical_query(query_list)
+    words = canonical_query(query_list).split()
+    combined = len(words) > 1
+    cached = None
+    if use_cache:
+        refresher = get_refresher()
+        try:
+            with span('cache_lookup'):
+                cached = redis_mgr.get_search_result(query_list)
+                refresher.record(query_list)
+        except Exception as e:
+            print(f"⚠️ Redis 조회 실패, 캐시 없이 진행: {e}")
+            UPSTREAM_ERRORS.inc(upstream='redis')
+        CACHE_REQUESTS.inc(cache='result', result='miss' if cached is None else 'hit')
+    if cached is not None:
+        print(f"🟢 Redis HIT: {search_key}, 기사 {len(cached['articles'])}건")
+        if combined:
+            record_combined_query(redis_mgr, 'result_cache')
+        if cached.get("stale"):
+            # stale-while-revalidate: 지난 결과로 바로 응답하고 갱신은 백그라운드에서
+            print(f"🔄 stale 결과 응답, 백그라운드 갱신 요청: {search_key}")
+            refresher.request_refresh(query_list)
+        raw_keywords = cached.get("keywords")
+        set_id = save_article_set(redis_mgr, cached["articles"], raw_keywords)
+        yield "articles", {"articles": cached["articles"], "article_set_id": set_id}
+        if not is_initial:
+            yield "result", {"articles": cached["articles"], "keywords": [], "article_set_id": set_id}
+            return
+        if raw_keywords is None and cached["articles"]:
+            # 파생 검색으로 저장된 결과 → 이번에 한 번만 키워드 추출 후 캐시 갱신
+            raw_keywords = extract_keywords(cached["articles"])
+            redis_mgr.save_search_result(query_list, cached["articles"], raw_keywords)
+            if set_id:
+                redis_mgr.save_article_set_field(set_id, "keywords", raw_keywords)
+        keywords = merge_query_keywords(query_list, raw_keywords) if raw_keywords else []
+        yield "keywords", {"keywords": keywords}
+        yield "result", {"articles": cached["articles"], "keywords": keywords, "article_set_id": set_id}
+        return
+    print(f"🔴 Redis MISS: {search_key}")
 
-    for start in range(1, max_results + 1, display):
-        url = f"https://openapi.naver.com/v1/search/news.json?query={encText}&display={display}&start={start}&sort={sort}"
-        request = urllib.request.Request(url)
-        request.add_header("X-Naver-Client-Id", NAVER_CLIENT_ID)
-        request.add_header("X-Naver-Client-Secret", NAVER_CLIENT_SECRET)
+    # ------ 조합 검색: 단어별 기사 집합을 Redis 안에서 교집합/합집합 ------
+    articles_df = None
+    source = 'naver'
+    if combined and getattr(config, 'KEYWORD_SETS', True):
+        articles_df = search_keyword_sets(words, redis_mgr, max_results)
+        source = 'keyword_sets'
+    # ------ 파생 검색: 이미 수집한 기사 역색인에서 먼저 찾기 ------
+    if articles_df is None and not is_initial:
+        articles_df = search_local_corpus(query_list, redis_mgr)
+        source = 'local_index'
 
+    # ------ 네이버 뉴스 수집 (캐시 miss + 로컬 결과 부족 시에만) ------
+    from_naver = articles_df is None
+    if from_naver:
+        source = 'naver'
+    if combined:
+        record_combined_query(redis_mgr, source)
+    if dedup_backend is None:
+        dedup_backend = getattr(config, 'DEDUP_BACKEND', 'dbscan')
+    # 전에 수집·클러스터링한 검색어면 새 기사만 받아 기존 클러스터에 붙인다 (incremental_dedup)
+    state = load_cluster_state(redis_mgr, query_list, max_results, dedup_backend) if from_naver else None
+    if from_naver:
+        pages = {}
+        requested = 0
+        reached_known = False
+        with span('naver_fetch'):
+            # 증분 갱신은 date 순으로 한 페이지씩 받다가 이미 가진 기사가 나오면 멈춘다
+            page_iter = iter_article_pages(query, max_results, display, sort, fan_out=1 if state else None)
+            for start, page_df in page_iter:
+                requested += 1
+                if state is not None:
+                    known = page_df['originallink'].isin(state.link_set).to_numpy()
+                    if known.any():
+                        reached_known = True
+                        page_df = page_df.iloc[:int(known.argmax())]
+                if len(page_df):
+                    pages[start] = page_df
+                    yield "raw_articles", {"start": start, "articles": page_df.to_dict('records'),
+                                           "fetched": sum(len(p) for p in pages.values())}
+                if reached_known:
+                    page_iter.close()
+                    break
+        if state is not None and not reached_known:
+            print("🔴 저장된 기사까지 닿지 않음, 전체 클러스터링")
+            DELTA_REFRESH.inc(outcome='full')
+            state = None
+        articles_df = tokenize_articles(pages)
+    if articles_df is None and state is None:
+        print("뉴스를 가져오기 실패")
         try:
-            response = urllib.request.urlopen(request)
-            rescode = response.getcode()
-            if rescode == 200:
-                response_body = response.read()
-                result = json.loads(response_body.decode('utf-8'))
-                for item in result.get("items", []):
-                    all_results.append({
-                        "title": item.get("title"),
-                        "description": item.get("description"),
-                        "pubDate": item.get("pubDate"),
-                        "originallink": item.get("originallink")
-                    })
-            else:
-                print(f"Error Code: {rescode}")
-                break
+            redis_mgr.save_search_result(query_list, [], [])  # 짧게 negative 캐시
         except Exception as e:
-            print(f"Error during API call: {e}")
-            break
+            print(f"❌ 저장 실패: {str(e)}")
+            UPSTREAM_ERRORS.inc(upstream='redis')
+        yield "result", {"articles": [], "keywords": [], "article_set_id": None}
+        return
 
-    if not all_results:
-        print("뉴스를 가져오기 실패")
-        exit()
-
-    # ------ 함수 정의 ------
-    def convert_pubdate(date_str):
-        dt = datetime.strptime(date_str, "%a, %d %b %Y %H:%M:%S %z")
-        hour = dt.hour
-        ampm = "오전" if hour < 12 else "오후"
-        hour_12 = hour if 1 <= hour <= 12 else abs(
-            hour - 12) if hour != 0 else 12
-        return f"{dt.year}.{dt.month:02}.{dt.day:02}. {ampm} {hour_12}:{dt.minute:02}"
-
-    def clean_html(raw_text):
-        decoded_text = html.unescape(str(raw_text))
-        clean_text = re.sub(r'<.*?>', '', decoded_text)
-        return clean_text
-
-    def preprocess_text(text, tokenizer):
-        tokens = tokenizer.tokenize(text)
-        return ' '.join(tokens)
-
-    # 평가 지표
-
-    def compute_dbscan_results(texts, eps_values, min_samples_values):
-        vectorizer = TfidfVectorizer()
-        tfidf_matrix = vectorizer.fit_transform(texts)
-        tfidf_array = tfidf_matrix.toarray()
-        results = []
-
-        for eps in eps_values:
-            for min_samples in min_samples_values:
-                dbscan = DBSCAN(eps=eps, min_samples=int(
-                    min_samples), metric='cosine')
-                clusters = dbscan.fit_predict(tfidf_array)
-                num_clusters = len(set(clusters)) - \
-                    (1 if -1 in clusters else 0)
-                mask = clusters != -1
-                if num_clusters > 1 and np.sum(mask) > 1:
-                    try:
-                        score = silhouette_score(
-                            tfidf_array[mask], clusters[mask], metric='cosine')
-                    except ValueError:
-                        score = None
-                else:
-                    score = None
-                results.append({'eps': eps, 'min_samples': int(min_samples),
-                                'num_clusters': num_clusters, 'silhouette_score': score})
-        return pd.DataFrame(results)
-
-    # 중복 제거
-
-    def deduplicate_articles(df, eps, min_samples, nc):
-        vectorizer = TfidfVectorizer()
-        tfidf_matrix = vectorizer.fit_transform(df['processed_text'])
-        dbscan = DBSCAN(eps=eps, min_samples=min_samples, metric='cosine')
-        clusters = dbscan.fit_predict(tfidf_matrix.toarray())
-        df['cluster'] = clusters
-        unique_docs = df[df['cluster'] != -
-                         1].groupby('cluster', group_keys=False).apply(lambda x: x.sample(nc))
-        return unique_docs.reset_index(drop=True)
-
-    # 1. 데이터프레임
-    articles_df = pd.DataFrame(all_results)
-    articles_df['title'] = articles_df['title'].apply(clean_html)
-    articles_df['description'] = articles_df['description'].apply(clean_html)
-    articles_df['text'] = articles_df['title'] + \
-        " " + articles_df['description']
-    articles_df['pubDate'] = articles_df['pubDate'].apply(convert_pubdate)
-
-    # 2. 형태소 분석 (soynlp 기반)
-    word_extractor = WordExtractor()
-    word_extractor.train(articles_df['text'].tolist())
-    word_scores = word_extractor.extract()
-    word_score_dict = {word: score.cohesion_forward for word,
-                       score in word_scores.items()}
-    l_tokenizer = LTokenizer(scores=word_score_dict)
-    articles_df['processed_text'] = articles_df['text'].apply(
-        lambda x: preprocess_text(x, l_tokenizer))
-
-    # 3. 최적 파라미터 찾기
-    eps_values = np.arange(0.2, 1.0, 0.1)
-    min_samples_values = list(range(2, 11))
-    results_df = compute_dbscan_results(
-        articles_df['processed_text'], eps_values, min_samples_values)
-    ranked = results_df.dropna().sort_values(
-        by='silhouette_score', ascending=False)
-
-    if len(ranked) >= 2:
-        second_best = ranked.iloc[1]
-        epsInput = float(second_best['eps'])
-        min_samplesInput = int(second_best['min_samples'])
-    else:
-        print("유효한 실루엣 점수가 충분하지 않아 기본 파라미터 사용")
-        epsInput = 0.2
-        min_samplesInput = 2
-    # 3. 중복 제거
-    num_cu = 1
-    if (second_best['num_clusters'] < 4):
-        num_cu = 2
-    deduplicated_df = deduplicate_articles(
-        articles_df, epsInput, min_samplesInput, num_cu)
+    # 3. 중복 제거 — dbscan: 파라미터 탐색(TF-IDF/이웃 그래프 1회 계산, 탐색 라벨 재사용)
+    #               minhash: MinHash/LSH 근접 중복 묶음
+    #    (serve.py 로 실행하면 프로세스 풀에서 실행 → 다른 요청의 I/O 를 막지 않음)
+    ARTICLES.inc(0 if articles_df is None else len(articles_df), stage='fetched')
+    corpus_df = articles_df
+    if state is not None:
+        with span('dedup_incremental'):
+            merged, delta_stats = state.merge([] if articles_df is None else articles_df.to_dict('records'))
+        full_pages = len(range(1, max_results + 1, display))
+        NAVER_PAGES_SAVED.inc(max(0, full_pages - requested))
+        print(f"♻️ 증분 갱신: 네이버 {requested}/{full_pages} 페이지, 새 기사 {delta_stats['new']}건 "
+              f"(기존 클러스터 {delta_stats['assigned']}, 새 클러스터 {delta_stats['new_clusters']}, "
+              f"노이즈 {delta_stats['noise']}), drift {merged.drift:.0%}")
+        recluster = merged.recluster_reason(
+            getattr(config, 'DELTA_DRIFT_THRESHOLD', DEFAULT_DRIFT_THRESHOLD),
+            getattr(config, 'DELTA_CLUSTER_CHANGE', DEFAULT_CLUSTER_CHANGE),
+            getattr(config, 'DELTA_SILHOUETTE_DROP', DEFAULT_SILHOUETTE_DROP))
+        if recluster:
+            # 증분으로 붙인 기사가 많아지거나 클러스터 품질이 달라지면
+            # 합친 corpus 로 파라미터 탐색부터 다시 (네이버 재호출 없음)
+            print(f"🔁 {recluster[1]}, 전체 클러스터링")
+            DELTA_REFRESH.inc(outcome=recluster[0])
+            corpus_df = merged.frame().drop(columns=['cluster'])
+            state = None
+        else:
+            DELTA_REFRESH.inc(outcome='incremental' if delta_stats['new'] else 'unchanged')
+            state = merged
+            deduplicated_df = merged.deduplicated_frame()
+            if delta_stats['new']:
+                save_cluster_state(redis_mgr, query_list, merged)
+    if state is None:
+        with span('dedup_sweep'):
+            clusters, params = cluster_texts(
+                corpus_df['processed_text'].tolist(), dedup_backend)
+        with span('dedup_select'):
+            deduplicated_df = select_representatives(corpus_df, clusters, params['nc'])
+        if from_naver and params['backend'] == 'dbscan' and getattr(config, 'DELTA_FETCH', True):
+            with span('delta_state'):
+                state = ClusterState.build(corpus_df, clusters, params, deduplicated_df, max_results)
+                save_cluster_state(redis_mgr, query_list, state)
+    ARTICLES.inc(len(deduplicated_df), stage='deduplicated')
     print(f"[DEBUG] deduplicated 뉴스 개수: {len(deduplicated_df)}")
     # 4. 결과
+    deduplicated_articles = deduplicated_df.to_dict(orient='records')
     result = {
-        "articles": deduplicated_df.to_dict(orient='records'),
-        "keywords": []
+        "articles": deduplicated_articles,
+        "keywords": [],
+        # /keywords·/summary 는 기사 목록 대신 이 ID 로 호출할 수 있다
+        "article_set_id": None,
     }
+    news_saved = False
+    with span('redis_write'):
+        result["article_set_id"] = save_article_set(redis_mgr, deduplicated_articles)
+        # 단어 하나짜리 검색은 수집한 corpus 전체를 단어별 집합에 (이후 조합 검색이 여기서 답함)
+        if from_naver and not combined and words and getattr(config, 'KEYWORD_SETS', True):
+            news_saved = save_keyword_set(
+                redis_mgr, words[0], state.articles if state is not None else corpus_df.to_dict('records'),
+                news=None if articles_df is None else articles_df.to_dict('records'))
+    yield "articles", {"articles": result["articles"], "article_set_id": result["article_set_id"]}
 
+    cached_keywords = None  # None: 키워드 미추출 (다음 최초 검색 hit 때 추출)
     if is_initial:
         try:
             print(f"[DEBUG] GPT 호출 시 뉴스 개수: {len(deduplicated_df)}")
             raw_keywords = extract_keywords(deduplicated_df.to_dict('records'))
-            # 🔥 핵심 수정: 항상 검색어(query) 자체를 첫 번째 키워드로 포함, 최대 3개 제한
-            if isinstance(raw_keywords, list) and all(isinstance(kw, str) for kw in raw_keywords):
-                # 검색어(조합일 경우 전체 문자열) 포함
-                base_query = " ".join(query_list).strip()
-                keywords = [
-                    base_query] if base_query and base_query not in raw_keywords else []
-                for kw in raw_keywords:
-                    if kw != base_query:
-                        keywords.append(kw)
-                    if len(keywords) >= 3:
-                        break
-            else:
-                print(f"⚠️ 잘못된 키워드 형식: {type(raw_keywords)}")
-                keywords = []
-            result["keywords"] = keywords
-
-            # Redis 저장 로직 (최초 검색어 조합에만 저장)
-            redis_mgr = RedisManager()
+            result["keywords"] = merge_query_keywords(query_list, raw_keywords)
+            cached_keywords = raw_keywords  # 검색어 순서와 무관하게 재사용하도록 GPT 원본 저장
+            yield "keywords", {"keywords": result["keywords"]}
+            if result["article_set_id"]:
+                # /keywords 가 같은 묶음으로 GPT 를 다시 호출하지 않도록
+                redis_mgr.save_article_set_field(result["article_set_id"], "keywords", raw_keywords)
+
+            # 기존 keyword:/news: 저장 (최초 검색어 조합에만 저장)
             news_links = deduplicated_df['originallink'].tolist()
             valid_links = [link for link in news_links if isinstance(
                 link, str) and link.startswith('http')]
             search_key = " ".join(query_list)
-            redis_mgr.save_keywords([search_key], valid_links)
-            articles = deduplicated_df.to_dict('records')
-            redis_mgr.save_news_articles(articles)
+            with span('redis_write'):
+                redis_mgr.save_keywords([search_key], valid_links)
+                # 대표 기사뿐 아니라 수집한 전체 기사를 저장·색인해
+                # 이후 파생 검색이 네이버 대신 로컬 코퍼스에서 답할 수 있게 한다
+                if from_naver and articles_df is not None:
+                    # (증분 갱신이면 새로 받은 기사만)
+                    articles = articles_df.to_dict('records')
+                    if not news_saved:
+                        redis_mgr.save_news_articles(articles)
+                    ArticleIndex(redis_mgr.conn).add_articles(articles)
         except Exception as e:
             print(f"❌ 저장 실패: {str(e)}")
-    # 파생/조합 검색 시에는 기사만 반환, 키워드 추출X, 저장X
-    return result
+
+    # 결과 캐시는 최초/파생 검색 모두 저장
+    try:
+        with span('redis_write'):
+            redis_mgr.save_search_result(query_list, result["articles"], cached_keywords)
+    except Exception as e:
+        print(f"❌ 저장 실패: {str(e)}")
+        UPSTREAM_ERRORS.inc(upstream='redis')
+    # 파생/조합 검색 시에는 기사만 반환, 키워드 추출X
+    yield "result", result
@@ -0,0 +1,147 @@
+# prompt_payload.py
+"""
+GPT 프롬프트에 넣을 기사 묶음(payload) 만들기.
+- 프롬프트에 필요한 필드(title, description, content)만 남긴다
+  (processed_text / cluster / pubDate / originallink 등은 버림)
+- 말머리([속보] 등)·문장부호·띄어쓰기·단어 순서만 다른 제목은 하나만 남긴다
+- 토큰 수를 로컬에서 세고(tiktoken 이 있으면 사용, 없으면 근사) 예산을 넘으면
+  목록 전체에서 고르게 표본을 뽑는다 (기사는 묶음 순으로 정렬돼 있어 앞부분만 자르면 주제가 치우침)
+- 호출마다 줄어든 토큰 수를 로그로 남긴다
+"""
+
+import json
+import re
+
+import config
+
+PROMPT_FIELDS = ('title', 'description', 'content')
+DEFAULT_TOKEN_BUDGET = 6000
+
+# 우선 tiktoken 이 있으면 사용하는 방식, 없으면 근사치
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("cl100k_base")
+
+    def count_tokens(text):
+        return len(_encoding.encode(text))
+except ImportError:
+    _ascii_word = re.compile(r'[\x21-\x7e]+')
+
+    def count_tokens(text):
+        # cl100k 기준 한글 음절은 대략 1토큰, 영문/숫자/기호는 4글자당 1토큰 정도
+        ascii_chars = sum(len(w) for w in _ascii_word.findall(text))
+        other_chars = sum(1 for ch in text if ord(ch) > 0x7e)
+        return other_chars + (ascii_chars + 3) // 4
+
+_prefix = re.compile(r'^\s*(\[[^\]]*\]|【[^】]*】|\([^)]*\))\s*')
+_non_word = re.compile(r'[^0-9a-zA-Z가-힣]+')
+
+
+def title_key(title):
+    """근접 중복 판단용 제목 키: 말머리 제거, 문장부호/공백 무시, 단어 순서 무시"""
+    text = str(title or '')
+    while True:
+        stripped = _prefix.sub('', text, count=1)
+        if stripped == text:
+            break
+        text = stripped
+    words = _non_word.sub(' ', text).lower().split()
+    return ' '.join(sorted(set(words)))
+
+
+def compact_articles(news_data, fields=PROMPT_FIELDS):
+    """필요한 필드만 남기고, 제목이 사실상 같은 기사는 처음 것만 남긴다."""
+    seen = set()
+    compact = []
+    for item in news_data:
+        if not isinstance(item, dict):
+            continue
+        key = title_key(item.get('title'))
+        if key and key in seen:
+            continue
+        seen.add(key)
+        article = {f: ' '.join(item[f].split()) for f in fields if isinstance(item.get(f), str) and item[f].strip()}
+        if article:
+            compact.append(article)
+    return compact
+
+
+def _serialize(value):
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+def _sample_evenly(items, k):
+    if k >= len(items):
+        return list(items)
+    if k <= 0:
+        return []
+    step = len(items) / k
+    return [items[int(i * step)] for i in range(k)]
+
+
+def truncate_text(text, budget):
+    """문자열을 토큰 예산 안으로 자른다."""
+    if count_tokens(text) <= budget:
+        return text
+    lo, hi = 0, len(text)
+    while lo < hi:  # 예산 안에 드는 가장 긴 접두사 (이분 탐색)
+        mid = (lo + hi + 1) // 2
+        if count_tokens(text[:mid]) <= budget:
+            lo = mid
+        else:
+            hi = mid - 1
+    return text[:lo]
+
+
+def token_budget():
+    return getattr(config, 'GPT_PROMPT_TOKEN_BUDGET', DEFAULT_TOKEN_BUDGET)
+
+
+def build_payload(news_data, budget=None, label='gpt'):
+    """
+    GPT user 메시지에 넣을 문자열과 토큰 보고서.
+
+    Args:
+        news_data (list[dict] | str): 기사 목록 또는 원문 문자열
+        budget (int): 토큰 예산 (기본 config.GPT_PROMPT_TOKEN_BUDGET)
+        label (str): 로그에 찍을 호출 이름
+
+    Returns:
+        (str, dict): payload, {'articles_in', 'articles_out', 'sampled', 'tokens_before', 'tokens_after', 'tokens_saved'}
+            articles_out 은 중복 제목을 뺀 뒤 남은 기사 수, sampled 는 예산 때문에 표본만(문자열이면 앞부분만) 넣었는지
+    """
+    if budget is None:
+        budget = token_budget()
+    original = news_data if isinstance(news_data, str) else json.dumps(news_data, ensure_ascii=False, default=str)
+    tokens_before = count_tokens(original)
+
+    if isinstance(news_data, str):
+        payload = truncate_text(news_data, budget)
+        articles_in = articles_out = None
+        sampled = len(payload) < len(news_data)
+    else:
+        articles = compact_articles(news_data)
+        articles_in = len(news_data)
+        payload = _serialize(articles)
+        tokens = count_tokens(payload)
+        k = len(articles)
+        while tokens > budget and k > 0:
+            # 기사당 평균 토큰으로 줄일 개수를 정하고, 그래도 넘으면 한 개씩 더 줄인다
+            k = min(k - 1, int(k * budget / tokens))
+            payload = _serialize(_sample_evenly(articles, k))
+            tokens = count_tokens(payload)
+        articles_out = k
+        sampled = k < len(articles)
+
+    tokens_after = count_tokens(payload)
+    report = {
+        'articles_in': articles_in,
+        'articles_out': articles_out,
+        'sampled': sampled,
+        'tokens_before': tokens_before,
+        'tokens_after': tokens_after,
+        'tokens_saved': tokens_before - tokens_after,
+    }
+    print(f"🧾 {label} 입력 토큰 {tokens_before} → {tokens_after} ({report['tokens_saved']} 절약"
+          + (f", 기사 {articles_in} → {articles_out}건)" if articles_in is not None else ")"))
+    return payload, report
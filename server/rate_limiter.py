@@ -0,0 +1,246 @@
+# rate_limiter.py
+"""
+upstream(네이버 / OpenAI) 호출 속도 제한 — Redis 토큰 버킷을 모든 워커 프로세스가 함께 쓴다.
+- ratelimit:{이름} 해시(tokens, ts): 초당 rate 개씩 burst 개까지 차는 버킷. 호출 한 번에 토큰 하나
+  Lua 스크립트 대신 WATCH/MULTI 낙관적 트랜잭션으로 읽고-계산하고-쓴다 (다른 워커와 겹치면 다시 시도)
+- 하루 한도(daily_quota): ratelimit:{이름}:day:{YYYYMMDD} 카운터. 다 쓰면 자정까지 QuotaExceeded
+- 우선순위: interactive(사용자 검색, 기본) > background(refresher 갱신, `with priority(BACKGROUND)`)
+  background 는 버킷에 burst × reserve 개 넘게 남아 있을 때만 가져가고,
+  같은 프로세스에서 interactive 요청이 기다리는 동안에는 양보한다
+- 대기열: 프로세스마다 max_waiters 개까지만 기다리고 넘으면 바로 RateLimited (스레드가 쌓이지 않게)
+  우선순위별 timeout(deadline) 안에 토큰을 받지 못할 것 같으면 기다리지 않고 바로 RateLimited
+- 429 응답의 Retry-After 는 penalize() 가 ratelimit:{이름}:blocked 에 기록해 모든 워커가 그때까지 멈춘다
+- Redis 를 쓸 수 없으면 제한 없이 통과한다 (fail-open, upstream 쪽 재시도/backoff 에 맡김)
+config: RATE_LIMIT(True), NAVER_RATE(10/초), NAVER_BURST(10), NAVER_DAILY_QUOTA(25000),
+        OPENAI_RATE(5/초), OPENAI_BURST(10), RATE_LIMIT_MAX_WAITERS(64),
+        RATE_LIMIT_TIMEOUT(10초), RATE_LIMIT_BACKGROUND_TIMEOUT(30초)
+"""
+
+import contextlib
+import datetime
+import threading
+import time
+from contextvars import ContextVar
+
+from redis.exceptions import WatchError
+
+from metrics import Counter, Histogram, UPSTREAM_ERRORS
+
+INTERACTIVE = 'interactive'
+BACKGROUND = 'background'
+BACKGROUND_RESERVE = 0.5  # background 가 남겨 둬야 하는 버킷 비율 (interactive 몫)
+POLL_MAX = 0.25           # 기다리는 동안 Redis 버킷을 다시 확인하는 최대 간격(초)
+
+DEFAULTS = {
+    # 네이버 검색 API: 초당 호출 제한 + 하루 25,000회
+    'naver': {'rate': 10, 'burst': 10, 'daily_quota': 25000},
+    'openai': {'rate': 5, 'burst': 10, 'daily_quota': None},
+}
+
+RATE_LIMIT = Counter('newshive_rate_limit_total',
+                     'upstream 호출 속도 제한 결과 (immediate/waited/rejected/timeout/quota/bypassed/penalized)',
+                     ('upstream', 'priority', 'outcome'))
+RATE_LIMIT_WAIT = Histogram('newshive_rate_limit_wait_seconds', 'upstream 호출 전 토큰을 기다린 시간',
+                            ('upstream', 'priority'))
+
+_priority = ContextVar('newshive_priority', default=INTERACTIVE)
+
+
+class RateLimited(Exception):
+    """deadline 안에 토큰을 받지 못함 (retry_after: 다시 시도할 수 있을 때까지 초)"""
+
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class QuotaExceeded(RateLimited):
+    """하루 호출 한도 소진"""
+
+
+@contextlib.contextmanager
+def priority(name):
+    """with 블록 안의 upstream 호출 우선순위 (스레드 풀로 넘길 때는 contextvars.copy_context 로 전달)"""
+    token = _priority.set(name)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority():
+    return _priority.get()
+
+
+def _seconds_until_midnight(now):
+    today = datetime.datetime.fromtimestamp(now)
+    midnight = datetime.datetime.combine(today.date() + datetime.timedelta(days=1), datetime.time())
+    return (midnight - today).total_seconds()
+
+
+class RateLimiter:
+    def __init__(self, name, rate, burst=None, daily_quota=None, max_waiters=64, timeouts=None,
+                 reserve=BACKGROUND_RESERVE, conn=None):
+        """
+        Args:
+            name (str): upstream 이름 (Redis 키와 지표 라벨)
+            rate (float): 초당 토큰 수 (모든 워커 합계)
+            burst (int): 버킷 크기 (한 번에 몰아 쓸 수 있는 호출 수, 기본 rate)
+            daily_quota (int): 하루 호출 한도 (None 이면 없음)
+            max_waiters (int): 이 프로세스에서 동시에 기다릴 수 있는 호출 수
+            timeouts (dict): 우선순위별 최대 대기 시간(초)
+            reserve (float): background 가 남겨 둬야 하는 버킷 비율
+            conn: 사용할 Redis 클라이언트 (없으면 공용 풀)
+        """
+        self.name = name
+        self.rate = float(rate)
+        self.burst = float(burst or rate)
+        self.daily_quota = daily_quota
+        self.max_waiters = max(1, max_waiters)
+        self.timeouts = {INTERACTIVE: 10.0, BACKGROUND: 30.0, **(timeouts or {})}
+        self.reserve = reserve
+        self.key = f"ratelimit:{name}"
+        self.block_key = f"ratelimit:{name}:blocked"
+        self.ttl = int(self.burst / self.rate) + 60  # 버킷이 가득 찰 시간이 지나면 키가 없어도 같은 상태
+        self._conn = conn
+        self._cond = threading.Condition()
+        self._waiting = {INTERACTIVE: 0, BACKGROUND: 0}
+
+    @property
+    def conn(self):
+        if self._conn is None:
+            from redis_manager import RedisManager
+            self._conn = RedisManager().conn
+        return self._conn
+
+    def _take(self, prio):
+        """토큰 하나를 가져오면 0, 아니면 다시 시도할 때까지의 초. 하루 한도를 넘었으면 QuotaExceeded"""
+        floor = self.burst * self.reserve if prio == BACKGROUND else 0.0
+        with self.conn.pipeline() as pipe:
+            while True:
+                now = time.time()
+                day_key = f"{self.key}:day:{time.strftime('%Y%m%d', time.localtime(now))}"
+                try:
+                    pipe.watch(self.key, day_key)
+                    blocked = pipe.pttl(self.block_key)
+                    if blocked and blocked > 0:
+                        return blocked / 1000
+                    tokens, updated = pipe.hmget(self.key, ["tokens", "ts"])
+                    if tokens is None:
+                        tokens = self.burst
+                    else:
+                        tokens = min(self.burst, float(tokens) + max(0.0, now - float(updated)) * self.rate)
+                    if self.daily_quota and int(pipe.get(day_key) or 0) >= self.daily_quota:
+                        raise QuotaExceeded(f"{self.name} 하루 호출 한도({self.daily_quota}) 소진",
+                                            _seconds_until_midnight(now))
+                    if tokens - 1 < floor:
+                        return (floor + 1 - tokens) / self.rate
+                    pipe.multi()
+                    pipe.hset(self.key, mapping={"tokens": tokens - 1, "ts": now})
+                    pipe.expire(self.key, self.ttl)
+                    if self.daily_quota:
+                        pipe.incr(day_key)
+                        pipe.expire(day_key, 2 * 86400)
+                    pipe.execute()
+                    return 0.0
+                except WatchError:
+                    continue
+
+    def acquire(self, timeout=None):
+        """
+        upstream 호출 한 번 전에 토큰을 받는다 (필요하면 기다림). 기다린 시간(초)을 반환한다.
+        대기열이 가득 찼거나 timeout(기본: 현재 우선순위의 timeout) 안에 받을 수 없으면 RateLimited.
+        """
+        prio = current_priority()
+        timeout = self.timeouts.get(prio, self.timeouts[INTERACTIVE]) if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+        with self._cond:
+            if sum(self._waiting.values()) >= self.max_waiters:
+                RATE_LIMIT.inc(upstream=self.name, priority=prio, outcome='rejected')
+                raise RateLimited(f"{self.name} 호출 대기열이 가득 참 ({self.max_waiters})", 1.0)
+            self._waiting[prio] += 1
+        waited = False
+        try:
+            while True:
+                with self._cond:
+                    # 같은 프로세스에서 interactive 가 기다리는 동안 background 는 양보
+                    yielding = prio == BACKGROUND and self._waiting[INTERACTIVE] > 0
+                wait = POLL_MAX if yielding else self._take(prio)
+                if wait <= 0:
+                    break
+                if time.monotonic() + wait > deadline:
+                    RATE_LIMIT.inc(upstream=self.name, priority=prio, outcome='timeout')
+                    raise RateLimited(f"{self.name} 호출 제한: {timeout:.0f}초 안에 차례가 오지 않음", wait)
+                waited = True
+                with self._cond:
+                    self._cond.wait(min(wait, POLL_MAX))
+        except QuotaExceeded:
+            RATE_LIMIT.inc(upstream=self.name, priority=prio, outcome='quota')
+            raise
+        except RateLimited:
+            raise
+        except Exception as e:
+            print(f"⚠️ 속도 제한 Redis 조회 실패, 제한 없이 호출: {e}")
+            UPSTREAM_ERRORS.inc(upstream='redis')
+            RATE_LIMIT.inc(upstream=self.name, priority=prio, outcome='bypassed')
+            return 0.0
+        finally:
+            with self._cond:
+                self._waiting[prio] -= 1
+                self._cond.notify_all()
+        elapsed = time.monotonic() - started
+        RATE_LIMIT.inc(upstream=self.name, priority=prio, outcome='waited' if waited else 'immediate')
+        RATE_LIMIT_WAIT.observe(elapsed, upstream=self.name, priority=prio)
+        return elapsed
+
+    def penalize(self, retry_after):
+        """upstream 이 429 + Retry-After 를 보냈을 때: 모든 워커가 retry_after 초 동안 호출을 멈춘다"""
+        RATE_LIMIT.inc(upstream=self.name, priority=current_priority(), outcome='penalized')
+        try:
+            self.conn.set(self.block_key, 1, px=max(1, int(retry_after * 1000)))
+        except Exception as e:
+            print(f"⚠️ 속도 제한 대기 기록 실패: {e}")
+            UPSTREAM_ERRORS.inc(upstream='redis')
+
+    def get_stats(self):
+        """남은 토큰(추정), 막힌 시간(ms), 오늘 호출 수, 이 프로세스에서 기다리는 호출 수"""
+        now = time.time()
+        pipe = self.conn.pipeline(transaction=False)
+        pipe.hmget(self.key, ["tokens", "ts"])
+        pipe.pttl(self.block_key)
+        pipe.get(f"{self.key}:day:{time.strftime('%Y%m%d', time.localtime(now))}")
+        (tokens, updated), blocked, used = pipe.execute()
+        if tokens is not None:
+            tokens = min(self.burst, float(tokens) + max(0.0, now - float(updated)) * self.rate)
+        with self._cond:
+            waiting = dict(self._waiting)
+        return {"tokens": round(self.burst if tokens is None else tokens, 2),
+                "blocked_ms": max(0, blocked or 0), "used_today": int(used or 0),
+                "daily_quota": self.daily_quota, "waiting": waiting}
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(name):
+    """프로세스 전체에서 공유하는 upstream 별 RateLimiter (config.RATE_LIMIT=False 면 None)"""
+    import config
+    if not getattr(config, 'RATE_LIMIT', True):
+        return None
+    with _limiters_lock:
+        limiter = _limiters.get(name)
+        if limiter is None:
+            prefix = name.upper()
+            defaults = DEFAULTS[name]
+            limiter = _limiters[name] = RateLimiter(
+                name,
+                rate=getattr(config, f'{prefix}_RATE', defaults['rate']),
+                burst=getattr(config, f'{prefix}_BURST', defaults['burst']),
+                daily_quota=getattr(config, f'{prefix}_DAILY_QUOTA', defaults['daily_quota']),
+                max_waiters=getattr(config, 'RATE_LIMIT_MAX_WAITERS', 64),
+                timeouts={INTERACTIVE: getattr(config, 'RATE_LIMIT_TIMEOUT', 10.0),
+                          BACKGROUND: getattr(config, 'RATE_LIMIT_BACKGROUND_TIMEOUT', 30.0)},
+            )
+        return limiter
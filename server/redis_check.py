@@ -1,17 +1,14 @@
-import redis
+# redis_check.py
+# 저장된 키워드별 뉴스 링크와 기사 정보 조회 (SCAN 으로 조금씩, 키워드 20개까지)
+# 네임스페이스별 키 수/메모리는 python redis_maintenance.py report
+from redis_maintenance import RedisMaintenance
 
-r = redis.Redis(host='localhost', port=6379, decode_responses=True)
-
-# 저장된 모든 키워드별 뉴스 링크 조회
-keys = r.keys("keyword:*")
-for key in keys:
+maint = RedisMaintenance()
+for key, articles in maint.iter_keyword_articles(limit=20):
     print(f"🟢 키: {key}")
-    news_links = r.smembers(key)
-    print(f"   📄 관련 뉴스: {news_links}")
+    print(f"   📄 관련 뉴스: {len(articles)}건")
     # 각 링크별로 뉴스 기사 전체 정보 출력
-    for link in news_links:
-        article_key = f"news:{link}"
-        article = r.hgetall(article_key)
+    for link, article in articles:
         print(f"      🔗 {link}")
         if article:
             print(f"         제목: {article.get('title')}")
@@ -19,4 +16,4 @@ for key in keys:
             print(f"         날짜: {article.get('pubDate')}")
             print(f"         원본링크: {article.get('originallink')}")
         else:
-            print("         (기사 정보 없음)")
\ No newline at end of file
+            print("         (기사 정보 없음)")
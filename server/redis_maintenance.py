@@ -0,0 +1,371 @@
+# redis_maintenance.py
+"""
+Redis 점검/정리 도구 (KEYS 대신 SCAN, 키 하나씩 DEL 대신 파이프라인 UNLINK).
+- report: 네임스페이스(키의 첫 ':' 앞)별 키 수, TTL 없는 키 수, 메모리 사용량
+  메모리는 네임스페이스마다 최대 sample 개 키의 MEMORY USAGE 평균 × 키 수로 추정한다
+  (MEMORY 명령이 없는 서버(fakeredis 등)에서는 DUMP 크기로 대신 추정)
+- gc: 아무도 가리키지 않는 news:* 해시(고아 기사) 회수
+  news:* 는 7일, 이를 가리키는 keyword:* 는 10분이라 keyword 가 만료되면 기사만 남는다.
+  참조로 보는 것: keyword:* 집합, idx:* 역색인 ZSET(만료 시각이 지나지 않은 링크만), kwset:* 단어별 기사 ZSET,
+  (예전 형식) articleset:* 의 links (idx/kwset/articleset 도 news:* 본문을 읽으므로 함께 확인).
+  막 저장된 기사는 min_age 초 동안 건너뛴다.
+  기사를 지운 뒤 idx:* 에서 만료됐거나 news:* 가 없는 링크도 지운다 (색인이 사라진 기사를 계속 가리키지 않도록)
+- clear: 패턴에 맞는 키 삭제 (기존 clear_redis.py)
+- check: 키워드별 기사 링크/본문 확인 (기존 redis_check.py, limit 개까지)
+- migrate: 예전 형식(필드별 문자열 해시) news:* 를 article_codec 값으로 다시 저장 (남은 TTL 유지)
+모든 명령은 SCAN 커서로 조금씩 읽어 Redis 를 오래 막지 않는다.
+
+실행: cd server && python redis_maintenance.py report
+      cd server && python redis_maintenance.py gc --dry-run
+      cd server && python redis_maintenance.py clear "keyword:*" "news:*"
+      cd server && python redis_maintenance.py migrate
+"""
+
+import argparse
+import json
+import time
+
+from redis import ConnectionPool, Redis
+from redis.exceptions import ResponseError
+
+from article_codec import encode_news
+from redis_manager import NEWS_TTL, KEYWORD_TTL, RedisManager
+
+SCAN_COUNT = 1000   # SCAN 한 번에 살펴볼 키 수 (COUNT 힌트)
+BATCH_SIZE = 500    # 파이프라인 한 번에 보내는 명령 수
+REFERENCE_SOURCES = ("keyword", "idx", "kwset", "articleset")
+
+
+def namespace_of(key):
+    return key.split(":", 1)[0] if ":" in key else "(none)"
+
+
+def _batches(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+class RedisMaintenance:
+    def __init__(self, conn=None, scan_count=SCAN_COUNT, batch_size=BATCH_SIZE):
+        """
+        Args:
+            conn: Redis 클라이언트 (decode_responses=True). 없으면 RedisManager 공용 풀
+        """
+        self.manager = RedisManager(conn)
+        self.conn = self.manager.conn
+        self.scan_count = scan_count
+        self.batch_size = batch_size
+
+    # ---------- SCAN / UNLINK ----------
+    def scan_batches(self, pattern="*"):
+        """SCAN 커서를 따라가며 키 목록을 조금씩 내보낸다 (SCAN 특성상 같은 키가 두 번 나올 수 있음)"""
+        cursor = 0
+        while True:
+            cursor, keys = self.conn.scan(cursor, match=pattern, count=self.scan_count)
+            if keys:
+                yield keys
+            if cursor == 0:
+                break
+
+    def scan_keys(self, pattern="*"):
+        """패턴에 맞는 키 집합 (중복 제거)"""
+        keys = set()
+        for batch in self.scan_batches(pattern):
+            keys.update(batch)
+        return keys
+
+    def unlink(self, keys):
+        """키들을 batch_size 개씩 파이프라인 UNLINK (메모리 해제는 Redis 백그라운드 스레드). 삭제된 키 수 반환"""
+        deleted = 0
+        for batch in _batches(list(keys), self.batch_size):
+            pipe = self.conn.pipeline(transaction=False)
+            pipe.unlink(*batch)
+            deleted += sum(pipe.execute())
+        return deleted
+
+    def clear(self, patterns, dry_run=False):
+        """패턴별로 SCAN 한 키를 바로바로 UNLINK. {패턴: 삭제(또는 대상) 키 수}"""
+        counts = {}
+        for pattern in patterns:
+            counts[pattern] = 0
+            for batch in self.scan_batches(pattern):
+                counts[pattern] += len(batch) if dry_run else self.unlink(batch)
+        return counts
+
+    # ---------- 메모리/키 수 ----------
+    def _binary_conn(self):
+        """DUMP(바이너리) 용: 같은 서버를 decode_responses 없이 가리키는 클라이언트"""
+        pool = self.conn.connection_pool
+        kwargs = dict(pool.connection_kwargs, decode_responses=False)
+        return Redis(connection_pool=ConnectionPool(connection_class=pool.connection_class, **kwargs))
+
+    def _memory_usage(self, keys):
+        """키별 메모리(바이트). MEMORY USAGE 를 못 쓰면 DUMP 크기로 대신한다. (값 목록, 방식)"""
+        pipe = self.conn.pipeline(transaction=False)
+        for key in keys:
+            pipe.memory_usage(key)
+        try:
+            return pipe.execute(), "memory_usage"
+        except ResponseError:
+            pipe = self._binary_conn().pipeline(transaction=False)
+            for key in keys:
+                pipe.dump(key)
+            return [len(v) if v else None for v in pipe.execute()], "dump"
+
+    def namespace_report(self, sample=200):
+        """
+        네임스페이스별 {"keys", "no_ttl", "sampled", "bytes"(추정)} 와 메모리 측정 방식.
+        키 목록을 들고 있지 않으므로 SCAN 중복(리해시 중)만큼 키 수가 조금 많게 나올 수 있다.
+        sample: 네임스페이스마다 메모리를 직접 재는 키 수 (0 이면 메모리 생략)
+        """
+        report, samples = {}, {}
+        for batch in self.scan_batches("*"):
+            pipe = self.conn.pipeline(transaction=False)
+            for key in batch:
+                pipe.ttl(key)
+            for key, ttl in zip(batch, pipe.execute()):
+                if ttl == -2:  # SCAN 과 TTL 사이에 만료됨
+                    continue
+                ns = namespace_of(key)
+                row = report.setdefault(ns, {"keys": 0, "no_ttl": 0, "sampled": 0, "bytes": 0})
+                row["keys"] += 1
+                row["no_ttl"] += ttl == -1
+                if len(samples.setdefault(ns, [])) < sample:
+                    samples[ns].append(key)
+
+        method = None
+        for ns, keys in samples.items():
+            sizes, method = [], None
+            for batch in _batches(keys, self.batch_size):
+                values, method = self._memory_usage(batch)
+                sizes.extend(v for v in values if v is not None)
+            row = report[ns]
+            row["sampled"] = len(sizes)
+            row["bytes"] = round(sum(sizes) / len(sizes) * row["keys"]) if sizes else 0
+        return report, method
+
+    def used_memory(self):
+        """INFO memory 의 used_memory (바이트). 지원하지 않으면 None"""
+        try:
+            return self.conn.info("memory").get("used_memory")
+        except ResponseError:
+            return None
+
+    # ---------- 고아 기사 ----------
+    def referenced_links(self, sources=REFERENCE_SOURCES):
+        """keyword:* / idx:*(만료 전) / kwset:* 멤버와 articleset:* links 에 들어 있는 기사 링크 전체"""
+        links = set()
+        now = time.time()
+        for source in sources:
+            for batch in self.scan_batches(f"{source}:*"):
+                pipe = self.conn.pipeline(transaction=False)
+                for key in batch:
+                    if source == "articleset":
+                        pipe.hget(key, "links")
+                    elif source == "idx":
+                        pipe.zrangebyscore(key, f"({now}", "+inf")  # 점수 = 링크 만료 시각 (article_index)
+                    elif source == "kwset":
+                        pipe.zrange(key, 0, -1)
+                    else:
+                        pipe.smembers(key)
+                for value in pipe.execute(raise_on_error=False):
+                    if isinstance(value, ResponseError):
+                        continue  # 예전 SET 형식 idx:* (article_index 는 만료된 색인으로 취급)
+                    if source == "articleset":
+                        links.update(json.loads(value) if value else [])
+                    else:
+                        links.update(value)
+        return links
+
+    def find_orphans(self, sources=REFERENCE_SOURCES, min_age=KEYWORD_TTL, candidates=None):
+        """
+        참조가 없는 news:* 키 목록.
+        news:* 를 먼저 훑고 참조를 나중에 모으므로, 그 사이 새로 저장된 기사는 후보에 없거나 참조에 잡힌다.
+        저장된 지 min_age 초가 안 된 기사(남은 TTL > NEWS_TTL - min_age)는 참조 저장 전일 수 있어 제외한다.
+        (keyword/idx/kwset/articleset 을 저장할 때마다 news:* 도 다시 저장되어 TTL 이 새로 시작된다)
+        """
+        if candidates is None:
+            candidates = self.scan_keys("news:*")
+        referenced = self.referenced_links(sources)
+        unreferenced = [key for key in candidates if key[len("news:"):] not in referenced]
+        orphans = []
+        for batch in _batches(unreferenced, self.batch_size):
+            pipe = self.conn.pipeline(transaction=False)
+            for key in batch:
+                pipe.ttl(key)
+            for key, ttl in zip(batch, pipe.execute()):
+                if ttl == -2:
+                    continue
+                if ttl == -1 or ttl <= NEWS_TTL - min_age:
+                    orphans.append(key)
+        return orphans
+
+    def prune_index(self, dry_run=False):
+        """
+        idx:* 에서 만료 시각이 지났거나 news:* 본문이 없는 링크를 지운다. 지운(dry_run 이면 대상) 링크 수.
+        빈 집합이 된 키는 Redis 가 알아서 지운다.
+        """
+        pruned = 0
+        for batch in self.scan_batches("idx:*"):
+            now = time.time()
+            pipe = self.conn.pipeline(transaction=False)
+            for key in batch:
+                pipe.zrange(key, 0, -1, withscores=True)
+            postings = {}
+            for key, members in zip(batch, pipe.execute(raise_on_error=False)):
+                if isinstance(members, ResponseError):
+                    continue  # 예전 SET 형식 (다음 색인 때 article_index 가 다시 만듦)
+                postings[key] = members
+            links = sorted({link for members in postings.values() for link, _ in members})
+            alive = set()
+            for link_batch in _batches(links, self.batch_size):
+                pipe = self.conn.pipeline(transaction=False)
+                for link in link_batch:
+                    pipe.exists(f"news:{link}")
+                alive.update(link for link, exists in zip(link_batch, pipe.execute()) if exists)
+            pipe = self.conn.pipeline(transaction=False)
+            for key, members in postings.items():
+                dead = [link for link, expires in members if expires <= now or link not in alive]
+                pruned += len(dead)
+                if dead and not dry_run:
+                    pipe.zrem(key, *dead)
+            pipe.execute()
+        return pruned
+
+    def gc(self, sources=REFERENCE_SOURCES, min_age=KEYWORD_TTL, dry_run=False):
+        """고아 기사 회수 후 idx:* 정리. {"news", "orphans", "deleted", "index_pruned"}"""
+        candidates = self.scan_keys("news:*")
+        orphans = self.find_orphans(sources, min_age, candidates)
+        deleted = 0 if dry_run else self.unlink(orphans)
+        return {"news": len(candidates), "orphans": len(orphans), "deleted": deleted,
+                "index_pruned": self.prune_index(dry_run) if "idx" in sources else 0}
+
+    # ---------- 형식 변환 ----------
+    def migrate_news(self, dry_run=False):
+        """예전 해시 형식 news:* → article_codec 값. {"news", "migrated"}"""
+        total = migrated = 0
+        for batch in self.scan_batches("news:*"):
+            total += len(batch)
+            pipe = self.conn.pipeline(transaction=False)
+            for key in batch:
+                pipe.type(key)
+            legacy = [key for key, kind in zip(batch, pipe.execute()) if kind == "hash"]
+            if not legacy or dry_run:
+                migrated += len(legacy)
+                continue
+            pipe = self.conn.pipeline(transaction=False)
+            for key in legacy:
+                pipe.hgetall(key)
+                pipe.pttl(key)
+            values = pipe.execute()
+            pipe = self.manager.raw.pipeline(transaction=False)
+            for key, article, pttl in zip(legacy, values[::2], values[1::2]):
+                if not article:  # 그 사이 만료됨
+                    continue
+                pipe.set(key, encode_news(article), px=pttl if pttl > 0 else NEWS_TTL * 1000)
+                migrated += 1
+            pipe.execute()
+        return {"news": total, "migrated": migrated}
+
+    # ---------- 내용 확인 ----------
+    def iter_keyword_articles(self, limit=20):
+        """(keyword 키, [(링크, 기사 dict 또는 {})]) 를 limit 개 키워드까지"""
+        shown = 0
+        for batch in self.scan_batches("keyword:*"):
+            for key in batch:
+                if shown >= limit:
+                    return
+                links = sorted(self.conn.smembers(key))
+                articles = self.manager.get_news_by_link(links)
+                yield key, [(link, article or {}) for link, article in zip(links, articles)]
+                shown += 1
+
+
+def _format_bytes(size):
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f}{unit}" if unit == "B" else f"{size:.1f}{unit}"
+        size /= 1024
+
+
+def print_report(maint, sample):
+    report, method = maint.namespace_report(sample)
+    print(f"{'namespace':<14} {'keys':>9} {'no TTL':>7} {'memory(est)':>12}")
+    for ns, row in sorted(report.items(), key=lambda item: -item[1]["bytes"]):
+        print(f"{ns:<14} {row['keys']:>9,} {row['no_ttl']:>7,} {_format_bytes(row['bytes']):>12}")
+    total_keys = sum(row["keys"] for row in report.values())
+    total_bytes = sum(row["bytes"] for row in report.values())
+    print(f"{'(total)':<14} {total_keys:>9,} {'':>7} {_format_bytes(total_bytes):>12}")
+    used = maint.used_memory()
+    if method:
+        print(f"\n📏 메모리: 네임스페이스당 최대 {sample}개 키의 {method} 평균 × 키 수"
+              + (f", 서버 used_memory {_format_bytes(used)}" if used else ""))
+
+
+def print_check(maint, limit):
+    for key, articles in maint.iter_keyword_articles(limit):
+        print(f"🟢 키: {key} (기사 {len(articles)}건)")
+        for link, article in articles:
+            print(f"      🔗 {link}")
+            if article:
+                print(f"         제목: {article.get('title')}")
+                print(f"         날짜: {article.get('pubDate')}")
+            else:
+                print("         (기사 정보 없음)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", help="Redis 호스트 (기본: config.REDIS_HOST)")
+    parser.add_argument("--port", type=int, default=6379)
+    parser.add_argument("--db", type=int, default=0)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    report = sub.add_parser("report", help="네임스페이스별 키 수 / 메모리")
+    report.add_argument("--sample", type=int, default=200, help="네임스페이스당 메모리를 재는 키 수")
+
+    gc = sub.add_parser("gc", help="참조 없는 news:* 회수")
+    gc.add_argument("--dry-run", action="store_true")
+    gc.add_argument("--min-age", type=int, default=KEYWORD_TTL, help="저장된 지 이 시간(초)이 안 된 기사는 건너뜀")
+    gc.add_argument("--sources", nargs="+", default=list(REFERENCE_SOURCES), choices=REFERENCE_SOURCES,
+                    help="참조로 볼 네임스페이스")
+
+    clear = sub.add_parser("clear", help="패턴에 맞는 키 삭제")
+    clear.add_argument("patterns", nargs="*", default=["keyword:*", "news:*"])
+    clear.add_argument("--dry-run", action="store_true")
+
+    migrate = sub.add_parser("migrate", help="예전 해시 형식 news:* 를 article_codec 값으로 변환")
+    migrate.add_argument("--dry-run", action="store_true")
+
+    check = sub.add_parser("check", help="키워드별 기사 링크 / 본문 확인")
+    check.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    conn = None
+    if args.host:
+        conn = Redis(host=args.host, port=args.port, db=args.db, decode_responses=True)
+    maint = RedisMaintenance(conn)
+
+    if args.command == "report":
+        print_report(maint, args.sample)
+    elif args.command == "gc":
+        result = maint.gc(args.sources, args.min_age, args.dry_run)
+        verb = "삭제 대상" if args.dry_run else "삭제"
+        print(f"🧹 news:* {result['news']}개 중 고아 {result['orphans']}개, {verb} "
+              f"{result['orphans'] if args.dry_run else result['deleted']}개, "
+              f"idx:* 만료/끊긴 링크 {result['index_pruned']}개 {verb}")
+    elif args.command == "clear":
+        counts = maint.clear(args.patterns, args.dry_run)
+        for pattern, count in counts.items():
+            print(f"🗑 {pattern}: {count}개" + (" (dry-run)" if args.dry_run else ""))
+        print(f"\n✅ 삭제 완료: 총 {sum(counts.values())}개 키" + (" 대상" if args.dry_run else " 삭제됨"))
+    elif args.command == "migrate":
+        result = maint.migrate_news(args.dry_run)
+        print(f"🔁 news:* {result['news']}개 중 예전 형식 {result['migrated']}개"
+              + (" (dry-run)" if args.dry_run else " 변환 완료"))
+    elif args.command == "check":
+        print_check(maint, args.limit)
+
+
+if __name__ == "__main__":
+    main()
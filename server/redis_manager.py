@@ -1,40 +1,349 @@
 # server/redis_manager.py
-from redis import Redis
+import hashlib
+import json
+import time
+
+from redis import Redis, ConnectionPool
+from redis.exceptions import ResponseError
 from config import REDIS_HOST, REDIS_PORT, REDIS_DB
 
-class RedisManager:
-    def __init__(self):
-        self.conn = Redis(
+from article_codec import (decode_articles, decode_news, dumps, encode_articles, encode_news, loads,
+                           pack_articles, unpack_articles)
+
+KEYWORD_TTL = 600      # keyword:* 만료 (10분)
+NEWS_TTL = 604800      # news:* 만료 (7일)
+RESULT_TTL = 600       # result:* 검색 결과 캐시 신선 기간 (10분)
+RESULT_STALE_TTL = 1800  # 신선 기간 이후 stale 로 응답하며 백그라운드 갱신하는 기간 (30분)
+NEGATIVE_TTL = 60      # 결과 없음(빈 검색) 캐시 만료 (1분)
+ARTICLE_SET_TTL = 3600  # articleset:* 기사 묶음 핸들 만료 (1시간, 사용할 때마다 연장)
+DELTA_TTL = 86400      # delta:* 증분 갱신용 클러스터 상태 만료 (1일)
+CACHE_STATS_KEY = "stats:result_cache"
+COMBINED_STATS_KEY = "stats:combined_query"  # 조합 검색의 기사 출처별 횟수 (keyword_sets.py)
+COMBINED_SOURCES = ("result_cache", "keyword_sets", "local_index", "naver")
+POPULAR_KEY = "popular:queries"  # 검색어 조합(정규형) → 인기 점수 ZSET
+POPULAR_QUERY_LISTS_KEY = "popular:query_lists"  # 정규형 → 사용자가 마지막으로 보낸 검색어 목록(JSON) 해시
+NEGATIVE_PREFIX = "negative:"  # 빈 결과가 나온 검색어 조합 표시 (백그라운드 갱신 보류)
+NEGATIVE_REFRESH_BACKOFF = RESULT_STALE_TTL  # 빈 결과 검색어를 백그라운드로 다시 갱신하지 않는 기간 (30분)
+
+_pool = None
+_binary_pools = {}  # id(문자열 풀) → (문자열 풀, 같은 서버의 bytes 풀)
+
+
+def canonical_query(query_list):
+    """
+    검색어 조합의 정규형. 공백/대소문자를 정리하고 순서와 중복을 무시한다.
+    예) ["삼성전자 ", "반도체"], ["반도체  삼성전자"] → "반도체 삼성전자"
+    """
+    if isinstance(query_list, str):
+        query_list = [query_list]
+    words = {word.lower() for term in query_list for word in str(term).split()}
+    return " ".join(sorted(words))
+
+
+def article_set_id(articles):
+    """기사 묶음 ID: 링크 목록(순서 포함)의 해시 → 같은 검색 결과면 같은 ID"""
+    links = [a.get('originallink') for a in articles if isinstance(a.get('originallink'), str)]
+    return hashlib.sha1("\n".join(links).encode("utf-8")).hexdigest()[:16]
+
+
+def get_pool():
+    """프로세스 전체에서 공유하는 Redis 커넥션 풀"""
+    global _pool
+    if _pool is None:
+        _pool = ConnectionPool(
             host=REDIS_HOST,
             port=REDIS_PORT,
             db=REDIS_DB,
             decode_responses=True
         )
-    
+    return _pool
+
+
+def get_binary_pool(pool):
+    """pool 과 같은 서버를 decode_responses 없이 가리키는 풀 (article_codec 값은 bytes 로 읽어야 함)"""
+    entry = _binary_pools.get(id(pool))
+    if entry is None or entry[0] is not pool:
+        kwargs = dict(pool.connection_kwargs, decode_responses=False)
+        entry = _binary_pools[id(pool)] = (pool, ConnectionPool(connection_class=pool.connection_class, **kwargs))
+    return entry[1]
+
+
+class RedisManager:
+    def __init__(self, conn=None):
+        """
+        Args:
+            conn: 사용할 Redis 클라이언트 (테스트/벤치마크용 fakeredis 등). 없으면 공용 풀 사용.
+        """
+        self.conn = conn if conn is not None else Redis(connection_pool=get_pool())
+        self._raw = None
+
+    @property
+    def raw(self):
+        """bytes 로 읽고 쓰는 클라이언트 (news:*, result:*, articleset:* 의 articles 값)"""
+        if self._raw is None:
+            self._raw = Redis(connection_pool=get_binary_pool(self.conn.connection_pool))
+        return self._raw
+
     def save_keywords(self, keywords, news_links):
-        """키워드-뉴스 링크 매핑 저장"""
+        """키워드-뉴스 링크 매핑 저장 (키워드 수와 무관하게 왕복 1회)"""
         if not isinstance(keywords, list) or not all(isinstance(k, str) for k in keywords):
             raise ValueError("키워드는 문자열 리스트여야 합니다.")
-    
+
         cleaned_links = [link for link in news_links if link.startswith('http')]
         print(f"🧹 유효한 링크 {len(cleaned_links)}개 필터링 완료")
-    
+        if not cleaned_links:
+            return
+
+        # MULTI/EXEC: sadd 와 expire 가 함께 적용되도록
+        pipe = self.conn.pipeline(transaction=True)
         for keyword in keywords:
             key = f"keyword:{keyword.strip()}"
-            self.conn.sadd(key, *cleaned_links)
-            self.conn.expire(key, 600) # 1시간
+            pipe.sadd(key, *cleaned_links)
+            pipe.expire(key, KEYWORD_TTL)
+        pipe.execute()
+
+    def get_keyword_links(self, keyword):
+        """키워드에 매핑된 뉴스 링크 집합"""
+        return self.conn.smembers(f"keyword:{keyword.strip()}")
 
     def save_news_articles(self, articles):
         """
         뉴스 기사 전체 저장. articles: [{originallink, title, description, pubDate, ...}, ...]
+        기사마다 article_codec 값 하나 (NEWS_FIELDS 만). 기사 수와 무관하게 파이프라인 왕복 1회.
         """
+        pipe = self.raw.pipeline(transaction=False)
         for article in articles:
             link = article.get('originallink')
             if link and link.startswith('http'):
-                key = f"news:{link}"
-                self.conn.hmset(key, article)
-                self.conn.expire(key, 604800)  # 7일 만료(필요시 조정)
-            
+                # SET 은 기존 해시(예전 형식) 키도 덮어쓴다
+                pipe.set(f"news:{link}", encode_news(article), ex=NEWS_TTL)
+        pipe.execute()
+
+    def get_news_by_link(self, links):
+        """
+        링크 순서대로 기사 (없으면 None). 왕복 1회, 예전 형식(해시) 기사가 섞여 있으면 1회 더.
+        """
+        links = list(links)
+        if not links:
+            return []
+        pipe = self.raw.pipeline(transaction=False)
+        for link in links:
+            pipe.get(f"news:{link}")
+        values = pipe.execute(raise_on_error=False)
+        articles = [decode_news(v) if isinstance(v, bytes) else None for v in values]
+        # WRONGTYPE: 예전 hset 으로 저장된 기사 (redis_maintenance.py migrate 전까지)
+        legacy = [i for i, v in enumerate(values) if isinstance(v, ResponseError)]
+        if legacy:
+            pipe = self.conn.pipeline(transaction=False)
+            for i in legacy:
+                pipe.hgetall(f"news:{links[i]}")
+            for i, article in zip(legacy, pipe.execute()):
+                article.pop('cluster', None)
+                articles[i] = article or None
+        return articles
+
+    def get_news_articles(self, links):
+        """
+        링크 목록에 해당하는 기사들을 읽어온다 (get_news_by_link).
+        저장된 본문이 없는 링크는 건너뛴다.
+        """
+        return [article for article in self.get_news_by_link(links) if article]
+
+    def get_search_result(self, query_list):
+        """
+        정규화된 검색어 조합의 최종 결과(중복 제거된 기사 + 키워드) 조회.
+        hit/miss 는 stats:result_cache 에 누적된다 (워커 간 공유).
+
+        Returns:
+            dict | None: {"articles": [...], "keywords": [...] | None, "cached_at": ..., "stale": bool}
+                         keywords 는 GPT 가 뽑은 원본 키워드. None 이면 아직 추출하지 않은 결과
+                         (파생 검색으로 저장됨)
+                         stale 이면 신선 기간이 지난 결과 (응답은 하되 갱신이 필요)
+        """
+        result = self._load_result(self.raw.get(f"result:{canonical_query(query_list)}"))
+        if result is None:
+            field = "miss"
+        elif not result.get("articles"):
+            field = "negative_hit"
+        else:
+            fresh_until = result.get("fresh_until", result.get("cached_at", 0) + RESULT_TTL)
+            result["stale"] = time.time() >= fresh_until
+            field = "stale_hit" if result["stale"] else "hit"
+        self.conn.hincrby(CACHE_STATS_KEY, field, 1)
+        return result
+
+    def peek_search_result(self, query_list):
+        """hit/miss 통계 없이 저장된 결과만 조회 (백그라운드 갱신용)"""
+        return self._load_result(self.raw.get(f"result:{canonical_query(query_list)}"))
+
+    @staticmethod
+    def _load_result(raw):
+        """article_codec 값 또는 예전 JSON 문자열 → 결과 dict"""
+        if not raw:
+            return None
+        result = loads(raw)
+        result["articles"] = unpack_articles(result["articles"])
+        return result
+
+    def save_search_result(self, query_list, articles, keywords=None):
+        """
+        검색 결과 저장. RESULT_TTL 동안 신선, 이후 RESULT_STALE_TTL 동안 stale 로 보관한다.
+        기사가 없으면 NEGATIVE_TTL 동안만 보관한다 (stale 기간 없음).
+        keywords=None 은 '키워드 미추출' 을 뜻한다 ([] 와 구분).
+        기사는 ARTICLE_FIELDS 만 열 형식으로, 결과 전체를 article_codec 값 하나로 저장한다.
+        빈 결과면 negative:{정규형} 도 남겨 NEGATIVE_REFRESH_BACKOFF 동안 refresher 가 다시 갱신하지 않게 한다.
+        """
+        now = time.time()
+        canonical = canonical_query(query_list)
+        fresh = RESULT_TTL if articles else NEGATIVE_TTL
+        payload = {"articles": pack_articles(articles), "keywords": keywords,
+                   "cached_at": now, "fresh_until": now + fresh}
+        ttl = fresh + (RESULT_STALE_TTL if articles else 0)
+        pipe = self.raw.pipeline(transaction=False)
+        pipe.set(f"result:{canonical}", dumps(payload), ex=ttl)
+        if articles:
+            pipe.delete(NEGATIVE_PREFIX + canonical)
+        else:
+            pipe.set(NEGATIVE_PREFIX + canonical, 1, ex=NEGATIVE_REFRESH_BACKOFF)
+        pipe.execute()
+
+    def result_fresh_seconds(self, canonicals):
+        """
+        검색어 조합(정규형)별 남은 신선 기간(초). 결과가 없으면 None, stale 이면 0 이하.
+        최근 빈 결과가 나온 조합(negative:*)은 갱신 대상이 아니므로 inf
+        (빈 결과는 stale 기간 없이 NEGATIVE_TTL 만 보관해 TTL 로는 신선 기간을 알 수 없다).
+        TTL / EXISTS 만 읽는다 (왕복 1회).
+        """
+        pipe = self.conn.pipeline(transaction=False)
+        for canonical in canonicals:
+            pipe.ttl(f"result:{canonical}")
+            pipe.exists(NEGATIVE_PREFIX + canonical)
+        values = pipe.execute()
+        fresh = []
+        for ttl, negative in zip(values[::2], values[1::2]):
+            if negative:
+                fresh.append(float('inf'))
+            else:
+                fresh.append(None if ttl is None or ttl < 0 else ttl - RESULT_STALE_TTL)
+        return fresh
+
+    # ---------- 증분 갱신 상태 ----------
+    def save_cluster_state(self, query_list, state):
+        """incremental_dedup.ClusterState.to_dict() 를 delta:{정규형} 에 저장"""
+        self.raw.set(f"delta:{canonical_query(query_list)}", dumps(state), ex=DELTA_TTL)
+
+    def get_cluster_state(self, query_list):
+        raw = self.raw.get(f"delta:{canonical_query(query_list)}")
+        return loads(raw) if raw else None
+
+    # ---------- 인기 검색어 ----------
+    def record_query(self, query_list, amount=1):
+        """인기 점수 + amount. 갱신할 때 같은 검색어로 네이버를 부르도록 보낸 검색어 목록도 함께 저장"""
+        if isinstance(query_list, str):
+            query_list = [query_list]
+        canonical = canonical_query(query_list)
+        pipe = self.conn.pipeline(transaction=False)
+        pipe.zincrby(POPULAR_KEY, amount, canonical)
+        pipe.hset(POPULAR_QUERY_LISTS_KEY, canonical, json.dumps(list(query_list), ensure_ascii=False))
+        pipe.execute()
+
+    def popular_queries(self, limit=20):
+        """[(정규형 검색어, 점수)] 점수 높은 순"""
+        return self.conn.zrevrange(POPULAR_KEY, 0, limit - 1, withscores=True)
+
+    def popular_query_lists(self, canonicals):
+        """정규형별 사용자가 보낸 검색어 목록. 저장된 게 없으면 정규형을 단어로 나눈 목록"""
+        if not canonicals:
+            return []
+        raws = self.conn.hmget(POPULAR_QUERY_LISTS_KEY, list(canonicals))
+        return [json.loads(raw) if raw else canonical.split() for canonical, raw in zip(canonicals, raws)]
+
+    def decay_popularity(self, factor=0.9, min_score=0.5):
+        """모든 점수에 factor 를 곱하고 min_score 미만은 지운다 (오래된 인기 검색어가 빠지도록)"""
+        pipe = self.conn.pipeline()
+        pipe.zunionstore(POPULAR_KEY, {POPULAR_KEY: factor})
+        pipe.zrangebyscore(POPULAR_KEY, "-inf", f"({min_score}")
+        pipe.zremrangebyscore(POPULAR_KEY, "-inf", f"({min_score}")
+        _, dropped, _ = pipe.execute()
+        if dropped:
+            self.conn.hdel(POPULAR_QUERY_LISTS_KEY, *dropped)
+
+    # ---------- 기사 묶음 핸들 ----------
+    # /search 결과 기사 묶음을 articleset:{ID} 해시로 가리킨다.
+    #   articles: 기사 목록 (article_codec 값 하나, 순서 유지)
+    #   links: (예전 형식) 기사 링크 목록(JSON) — 본문은 news:{링크} 에서 읽는다
+    #   keywords / summary: 이 묶음으로 이미 계산한 결과 (있으면 /keywords, /summary 가 재사용)
+    def save_article_set(self, articles, keywords=None):
+        """
+        기사 묶음을 저장하고 ID 를 반환한다. 이미 있는 묶음이면 만료 시간만 연장 (왕복 1회).
+        keywords: GPT 원본 키워드 (이미 추출한 경우)
+        """
+        if not articles:
+            return None
+        set_id = article_set_id(articles)
+        key = f"articleset:{set_id}"
+        if self.conn.expire(key, ARTICLE_SET_TTL):
+            if keywords is not None:
+                self.conn.hsetnx(key, "keywords", json.dumps(keywords, ensure_ascii=False))
+            return set_id
+
+        mapping = {"articles": encode_articles(articles)}
+        if keywords is not None:
+            mapping["keywords"] = json.dumps(keywords, ensure_ascii=False)
+        pipe = self.raw.pipeline(transaction=False)
+        pipe.hset(key, mapping=mapping)
+        pipe.expire(key, ARTICLE_SET_TTL)
+        pipe.execute()
+        return set_id
+
+    def get_article_set(self, set_id):
+        """기사 묶음의 기사 목록 (저장 순서). 만료됐거나 없는 ID 면 None"""
+        key = f"articleset:{set_id}"
+        pipe = self.raw.pipeline(transaction=False)
+        pipe.hmget(key, ["articles", "links"])
+        pipe.expire(key, ARTICLE_SET_TTL)
+        (packed, raw_links), _ = pipe.execute()
+        if packed:
+            return decode_articles(packed) or None
+        if not raw_links:
+            return None
+        articles = self.get_news_articles(json.loads(raw_links))
+        return articles or None
+
+    def get_article_set_field(self, set_id, field):
+        """묶음에 저장해 둔 계산 결과 (keywords/summary). 없으면 None"""
+        raw = self.conn.hget(f"articleset:{set_id}", field)
+        return json.loads(raw) if raw else None
+
+    def save_article_set_field(self, set_id, field, value):
+        key = f"articleset:{set_id}"
+        pipe = self.conn.pipeline(transaction=False)
+        pipe.hset(key, field, json.dumps(value, ensure_ascii=False))
+        pipe.expire(key, ARTICLE_SET_TTL)
+        pipe.execute()
+
+    def get_cache_stats(self):
+        """검색 결과 캐시 hit/miss 카운터와 적중률"""
+        stats = {k: int(v) for k, v in self.conn.hgetall(CACHE_STATS_KEY).items()}
+        for field in ("hit", "stale_hit", "negative_hit", "miss"):
+            stats.setdefault(field, 0)
+        hits = stats["hit"] + stats["stale_hit"] + stats["negative_hit"]
+        total = hits + stats["miss"]
+        stats["hit_ratio"] = round(hits / total, 4) if total else 0.0
+        return stats
+
+    def record_combined_query(self, source):
+        self.conn.hincrby(COMBINED_STATS_KEY, source, 1)
+
+    def get_combined_stats(self):
+        """조합 검색 출처별 횟수와 네이버를 부르지 않고 답한 비율"""
+        stats = {k: int(v) for k, v in self.conn.hgetall(COMBINED_STATS_KEY).items()}
+        for source in COMBINED_SOURCES:
+            stats.setdefault(source, 0)
+        total = sum(stats[source] for source in COMBINED_SOURCES)
+        stats["upstream_avoided_ratio"] = round(1 - stats["naver"] / total, 4) if total else 0.0
+        return stats
+
     def test_connection(self):
         """Redis 연결 테스트"""
-        return self.conn.ping()
\ No newline at end of file
+        return self.conn.ping()
@@ -0,0 +1,199 @@
+# refresher.py
+"""
+인기 검색어 결과 캐시 미리 갱신 (stale-while-revalidate + 백그라운드 prefetch).
+- 검색할 때마다 popular:queries ZSET 점수 +1, 스케줄러가 주기마다 감쇠시킨다
+  갱신은 사용자가 보낸 검색어 목록(popular:query_lists)으로 다시 검색한다 (정규형은 소문자·정렬된 키일 뿐)
+- result:* 는 RESULT_TTL 동안 신선, 이후 RESULT_STALE_TTL 동안은 stale 결과로 바로 응답하면서 갱신을 요청한다
+- 스케줄러(start)는 interval 초마다 인기 상위 top_n 검색어 중 신선 기간이 refresh_ahead 초 이하로 남았거나
+  결과가 없는 검색어를 미리 갱신한다 → 인기 검색어 사용자는 cold 파이프라인(네이버/토큰화/DBSCAN/GPT)을 기다리지 않음
+  빈 결과가 나온 검색어는 NEGATIVE_REFRESH_BACKOFF 동안 갱신하지 않는다 (주기마다 네이버를 다시 부르지 않도록)
+- 동시에 도는 갱신 작업은 max_concurrent 개까지 (넘으면 이번에는 건너뜀)
+  같은 검색어는 Redis 락(refresh:lock:*)으로 워커 프로세스 간에도 한 번만 갱신
+- 갱신 작업의 네이버/OpenAI 호출은 background 우선순위로 속도 제한 토큰을 받는다 (rate_limiter.py)
+config: REFRESH_MAX_CONCURRENT(2), REFRESH_TOP_N(20), REFRESH_INTERVAL(60초), REFRESH_AHEAD(120초), POPULARITY_DECAY(0.9)
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from metrics import Counter
+from rate_limiter import BACKGROUND, priority
+from redis_manager import RedisManager, canonical_query
+
+LOCK_PREFIX = "refresh:lock:"
+
+REFRESH_JOBS = Counter('newshive_refresh_total',
+                       '검색 결과 캐시 갱신 (outcome: scheduled/completed/failed/skipped_busy/skipped_locked)',
+                       ('outcome',))
+
+
+def refresh_query(query_list, is_initial):
+    """결과 캐시를 건너뛰고 파이프라인을 다시 실행해 result:* 를 새로 저장한다."""
+    from news_processor import process_news
+    return process_news(query_list, is_initial, use_cache=False)
+
+
+class Refresher:
+    def __init__(self, max_concurrent=2, top_n=20, interval=60.0, refresh_ahead=120.0,
+                 decay=0.9, lock_ttl=300, run=refresh_query, redis_factory=RedisManager):
+        """
+        Args:
+            max_concurrent (int): 동시에 실행하는 갱신 작업 수 상한
+            top_n (int): 스케줄러가 살펴보는 인기 검색어 수
+            interval (float): 스케줄러 주기(초)
+            refresh_ahead (float): 신선 기간이 이만큼(초) 이하로 남으면 미리 갱신
+            decay (float): 주기마다 인기 점수에 곱하는 값
+            lock_ttl (int): 갱신 락 유지 시간(초). 작업이 비정상 종료돼도 이 시간 뒤에 풀린다
+            run: 갱신 함수 (query_list, is_initial)
+        """
+        self.max_concurrent = max(1, max_concurrent)
+        self.top_n = top_n
+        self.interval = interval
+        self.refresh_ahead = refresh_ahead
+        self.decay = decay
+        self.lock_ttl = lock_ttl
+        self.run = run
+        self.redis_factory = redis_factory
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrent, thread_name_prefix="refresh")
+        self._inflight = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.stats = {"scheduled": 0, "completed": 0, "failed": 0, "skipped_busy": 0, "skipped_locked": 0}
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+        REFRESH_JOBS.inc(outcome=name)
+
+    def record(self, query_list):
+        """검색 1회 → 인기 점수 +1"""
+        self.redis_factory().record_query(query_list)
+
+    def request_refresh(self, query_list):
+        """
+        갱신 작업을 백그라운드로 넘긴다 (기다리지 않음).
+        이미 갱신 중이거나 동시 작업 수가 가득 찼거나 다른 워커가 갱신 중이면 False.
+        """
+        canonical = canonical_query(query_list)
+        with self._lock:
+            if canonical in self._inflight:
+                return False
+            if len(self._inflight) >= self.max_concurrent:
+                busy = True
+            else:
+                busy = False
+                self._inflight.add(canonical)
+        if busy:
+            self._count("skipped_busy")
+            return False
+
+        redis_mgr = self.redis_factory()
+        try:
+            locked = redis_mgr.conn.set(LOCK_PREFIX + canonical, "1", nx=True, ex=self.lock_ttl)
+        except Exception as e:
+            print(f"⚠️ 갱신 락 실패: {e}")
+            locked = False
+        if not locked:
+            with self._lock:
+                self._inflight.discard(canonical)
+            self._count("skipped_locked")
+            return False
+
+        self._count("scheduled")
+        self._executor.submit(self._refresh, canonical, list(query_list))
+        return True
+
+    def _refresh(self, canonical, query_list):
+        redis_mgr = self.redis_factory()
+        try:
+            # 키워드까지 뽑아 둔 결과(최초 검색)였으면 키워드도 다시 뽑는다
+            current = redis_mgr.peek_search_result(query_list)
+            is_initial = current is None or current.get("keywords") is not None
+            with priority(BACKGROUND):  # 네이버/OpenAI 토큰은 사용자 검색에 먼저
+                self.run(query_list, is_initial)
+            self._count("completed")
+            print(f"🔄 검색 결과 갱신 완료: {canonical}")
+        except Exception as e:
+            self._count("failed")
+            print(f"❌ 검색 결과 갱신 실패: {canonical} ({e})")
+        finally:
+            with self._lock:
+                self._inflight.discard(canonical)
+            try:
+                redis_mgr.conn.delete(LOCK_PREFIX + canonical)
+            except Exception:
+                pass
+
+    def tick(self):
+        """인기 검색어 중 곧 만료되거나 만료된 결과를 갱신 요청하고, 인기 점수를 감쇠시킨다. 요청한 검색어 반환"""
+        redis_mgr = self.redis_factory()
+        popular = [canonical for canonical, _ in redis_mgr.popular_queries(self.top_n)]
+        requested = []
+        if popular:
+            freshness = redis_mgr.result_fresh_seconds(popular)
+            query_lists = redis_mgr.popular_query_lists(popular)
+            for canonical, fresh, query_list in zip(popular, freshness, query_lists):
+                if fresh is None or fresh <= self.refresh_ahead:
+                    if self.request_refresh(query_list):
+                        requested.append(canonical)
+        redis_mgr.decay_popularity(self.decay)
+        return requested
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.tick()
+            except Exception as e:
+                print(f"⚠️ 갱신 스케줄러 실패: {e}")
+
+    def start(self):
+        """스케줄러 스레드 시작 (이미 실행 중이면 무시)"""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="refresh-scheduler", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, wait=True):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._executor.shutdown(wait=wait)
+
+    def wait_idle(self, timeout=None):
+        """진행 중인 갱신 작업이 끝날 때까지 대기 (테스트/벤치마크용). 끝났으면 True"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                if not self._inflight:
+                    return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+
+    def get_stats(self):
+        with self._lock:
+            return dict(self.stats, inflight=len(self._inflight), scheduler=self._thread is not None)
+
+
+_refresher = None
+_refresher_lock = threading.Lock()
+
+
+def get_refresher():
+    """프로세스 전체에서 공유하는 Refresher (스케줄러는 start() 를 호출해야 돈다)"""
+    global _refresher
+    with _refresher_lock:
+        if _refresher is None:
+            import config
+            _refresher = Refresher(
+                max_concurrent=getattr(config, 'REFRESH_MAX_CONCURRENT', 2),
+                top_n=getattr(config, 'REFRESH_TOP_N', 20),
+                interval=getattr(config, 'REFRESH_INTERVAL', 60),
+                refresh_ahead=getattr(config, 'REFRESH_AHEAD', 120),
+                decay=getattr(config, 'POPULARITY_DECAY', 0.9),
+            )
+        return _refresher
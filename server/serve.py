@@ -0,0 +1,187 @@
+# serve.py
+"""
+운영용 실행 모드 (app.py 의 debug 개발 서버 대신).
+    cd server && python serve.py --port 5001 --cluster-workers 4 --max-inflight 32 --timeout 30
+
+- 멀티스레드 WSGI 서버 (waitress 가 설치돼 있으면 사용, 없으면 werkzeug threaded 서버)
+  네이버 페이지 / Redis / OpenAI 응답 대기는 요청 스레드와 NaverSearch 의 페이지 동시 요청 스레드에서
+  GIL 을 놓은 채 겹쳐서 진행된다
+- 중복 제거(TF-IDF + DBSCAN 탐색)는 cpu_pool 프로세스 풀로 보내 GIL 경쟁을 없앤다
+- 입장 제어: 처리 중인 요청이 max_inflight 개면 queue_wait 초 기다렸다가 503 + Retry-After
+- 요청 타임아웃: timeout 초 안에 응답을 만들지 못하면 504. 작업은 백그라운드에서 마저 끝나며
+  그때까지 자리를 반납하지 않는다 (타임아웃이 나도 동시 작업 수는 max_inflight 를 넘지 않음)
+- SSE 스트리밍(/…/stream)은 입장 제어만, 상태 확인 경로는 둘 다 적용하지 않는다
+- 인기 검색어 결과 캐시를 만료 전에 미리 갱신하는 스케줄러(refresher)를 띄운다 (--refresh-interval 0 이면 끔)
+"""
+
+import argparse
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import cpu_pool
+import metrics
+
+EXEMPT_PATHS = ('/', '/ready', '/startup_report', '/cache_stats', '/serve_stats', '/metrics')
+
+
+def _json_response(start_response, status, body, headers=()):
+    payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+    start_response(status, [('Content-Type', 'application/json; charset=utf-8'),
+                            ('Content-Length', str(len(payload))), *headers])
+    return [payload]
+
+
+class _ReleasingBody:
+    """스트리밍 응답 본문: 클라이언트에게 다 보내거나 연결이 끊겨 close 될 때 자리를 반납한다."""
+
+    def __init__(self, body, release):
+        self._body = body
+        self._release = release
+
+    def __iter__(self):
+        return iter(self._body)
+
+    def close(self):
+        try:
+            if hasattr(self._body, 'close'):
+                self._body.close()
+        finally:
+            self._release()
+
+
+class GuardedApp:
+    """입장 제어 + 요청 타임아웃 WSGI 미들웨어 (app.wsgi_app 을 감싼다)"""
+
+    def __init__(self, wsgi_app, max_inflight=32, timeout=30.0, queue_wait=0.5, exempt_paths=EXEMPT_PATHS):
+        """
+        Args:
+            max_inflight (int): 동시에 처리하는 요청 수 상한
+            timeout (float): 요청 하나의 응답 제한 시간(초). 넘으면 504
+            queue_wait (float): 자리가 없을 때 기다리는 시간(초). 넘으면 503
+        """
+        self.wsgi_app = wsgi_app
+        self.max_inflight = max_inflight
+        self.timeout = timeout
+        self.queue_wait = queue_wait
+        self.exempt_paths = set(exempt_paths)
+        self._slots = threading.BoundedSemaphore(max_inflight)
+        self._executor = ThreadPoolExecutor(max_workers=max_inflight, thread_name_prefix='request')
+        self._lock = threading.Lock()
+        self.stats = {'inflight': 0, 'admitted': 0, 'rejected': 0, 'timed_out': 0}
+
+    def _count(self, name, delta=1):
+        with self._lock:
+            self.stats[name] += delta
+        if name == 'inflight':
+            metrics.INFLIGHT.inc(delta)
+        else:
+            metrics.ADMISSION.inc(delta, outcome=name)
+
+    def _release(self):
+        self._count('inflight', -1)
+        self._slots.release()
+
+    def __call__(self, environ, start_response):
+        path = environ.get('PATH_INFO', '')
+        if path == '/serve_stats':
+            with self._lock:
+                stats = dict(self.stats, max_inflight=self.max_inflight, timeout=self.timeout)
+            return _json_response(start_response, '200 OK', stats)
+        if path in self.exempt_paths or environ.get('REQUEST_METHOD') == 'OPTIONS':
+            return self.wsgi_app(environ, start_response)
+
+        if not self._slots.acquire(timeout=self.queue_wait):
+            self._count('rejected')
+            return _json_response(start_response, '503 Service Unavailable',
+                                  {'error': '요청이 많아 잠시 후 다시 시도해 주세요.'}, [('Retry-After', '1')])
+        self._count('admitted')
+        self._count('inflight')
+
+        if path.endswith('/stream'):
+            try:
+                body = self.wsgi_app(environ, start_response)
+            except BaseException:
+                self._release()
+                raise
+            return _ReleasingBody(body, self._release)
+
+        future = self._executor.submit(self._run, environ)
+        try:
+            status, headers, chunks = future.result(timeout=self.timeout)
+        except TimeoutError:
+            self._count('timed_out')
+            print(f"⏱️ 요청 타임아웃 ({self.timeout}s): {path}")
+            return _json_response(start_response, '504 Gateway Timeout',
+                                  {'error': '처리 시간이 초과되었습니다.'})
+        start_response(status, headers)
+        return chunks
+
+    def _run(self, environ):
+        """요청 스레드 풀에서 Flask 앱을 실행하고 응답 전체를 모은다. 끝나면 자리 반납."""
+        captured = {}
+
+        def capture(status, headers, exc_info=None):
+            captured['status'], captured['headers'] = status, headers
+            return captured.setdefault('writes', []).append
+
+        try:
+            body = self.wsgi_app(environ, capture)
+            try:
+                chunks = captured.get('writes', []) + list(body)
+            finally:
+                if hasattr(body, 'close'):
+                    body.close()
+            return captured['status'], captured['headers'], chunks
+        finally:
+            self._release()
+
+
+def create_app(cluster_workers=None, max_inflight=32, timeout=30.0, queue_wait=0.5, refresh_interval=None):
+    """
+    운영 모드 Flask 앱: 프로세스 풀을 띄우고 wsgi_app 을 GuardedApp 으로 감싼다.
+    refresh_interval: 인기 검색어 갱신 주기(초). None 이면 config.REFRESH_INTERVAL, 0 이면 스케줄러를 띄우지 않음
+    """
+    from app import app
+    from refresher import get_refresher
+    cpu_pool.configure(workers=cluster_workers if cluster_workers is not None else (os.cpu_count() or 1),
+                       timeout=timeout)
+    cpu_pool.get_pool()
+    refresher = get_refresher()
+    if refresh_interval is not None:
+        refresher.interval = refresh_interval
+    if refresher.interval > 0:
+        refresher.start()
+    app.wsgi_app = GuardedApp(app.wsgi_app, max_inflight=max_inflight, timeout=timeout, queue_wait=queue_wait)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NEWS-HIVE 운영 모드 서버")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=5001)
+    parser.add_argument("--threads", type=int, default=64, help="WSGI 서버 스레드 수 (waitress)")
+    parser.add_argument("--cluster-workers", type=int, default=None, help="클러스터링 프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--max-inflight", type=int, default=32)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--queue-wait", type=float, default=0.5)
+    parser.add_argument("--refresh-interval", type=float, default=None,
+                        help="인기 검색어 결과 캐시 갱신 주기(초, 기본: config.REFRESH_INTERVAL 또는 60). 0 이면 끔")
+    args = parser.parse_args()
+
+    app = create_app(args.cluster_workers, args.max_inflight, args.timeout, args.queue_wait, args.refresh_interval)
+    try:
+        from waitress import serve
+        print(f"🟢 waitress 서버 시작: http://{args.host}:{args.port}")
+        serve(app, host=args.host, port=args.port, threads=args.threads)
+    except ImportError:
+        from werkzeug.serving import run_simple
+        print(f"🟢 werkzeug threaded 서버 시작 (waitress 미설치): http://{args.host}:{args.port}")
+        run_simple(args.host, args.port, app, threaded=True, use_reloader=False, use_debugger=False)
+    finally:
+        cpu_pool.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+# startup.py
+"""
+Flask 서버 시작 단계: 무거운 모듈 preload + 구성 요소 warm-up.
+- preload(): numpy/pandas/soynlp/scikit-learn/openai/redis 와 서버 모듈을 import 하며 모듈별 소요 시간 기록
+- warm_up(): 토크나이저(konlpy, soynlp 단어 점수 모델 스냅샷 로드), TF-IDF·중복 제거 경로, Redis 커넥션 풀, OpenAI 클라이언트를 한 번씩 실행
+- report(): /ready, /startup_report 에서 쓰는 상태 (cold start 와 steady state 를 따로 측정하기 위함)
+"""
+
+import importlib
+import threading
+import time
+
+# import 순서 = 측정 순서. 서드파티를 먼저 재야 서버 모듈 시간에 섞이지 않는다.
+PRELOAD_MODULES = [
+    'numpy',
+    'pandas',
+    'scipy.sparse',
+    'sklearn.feature_extraction.text',
+    'sklearn.metrics',
+    'soynlp.tokenizer',
+    'redis',
+    'openai',
+    'requests',
+    'keyword_extractor',
+    'redis_manager',
+    'gpt_processor',
+    'dedup_engine',
+    'naver_search',
+    'word_model',
+    'article_index',
+    'news_processor',
+]
+
+WARMUP_TEXTS = [
+    "삼성전자 반도체 수출 실적 개선 전망",
+    "삼성전자 반도체 수출 실적 개선 기대",
+    "한국은행 기준금리 동결 결정 발표",
+    "한국은행 기준금리 동결 결정 배경",
+    "프로야구 개막전 관중 기록 경신",
+]
+
+_state = {
+    'ready': False,
+    'process_started_at': time.time(),
+    'import_times': {},
+    'warmup_times': {},
+    'errors': {},
+    'ready_at': None,
+}
+_lock = threading.Lock()
+_warmup_thread = None
+
+
+def preload(modules=PRELOAD_MODULES):
+    """모듈을 순서대로 import 하며 각 모듈의 import 시간(ms)을 기록한다."""
+    for name in modules:
+        t0 = time.perf_counter()
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            _state['errors'][f'import:{name}'] = str(e)
+            print(f"⚠️ preload 실패: {name} ({e})")
+        _state['import_times'][name] = round((time.perf_counter() - t0) * 1000, 1)
+    return _state['import_times']
+
+
+def _warm_tokenizer():
+    import keyword_extractor
+    keyword_extractor.warm_up()  # konlpy 가 있으면 Okt JVM 기동 (끝나기 전 검색어는 정규식 경로로 처리)
+
+    # 스냅샷(파일/Redis)에서 soynlp 단어 점수 모델을 불러와 LTokenizer 준비
+    from word_model import get_word_model
+    get_word_model().tokenize(WARMUP_TEXTS[0])
+
+
+def _warm_vectorizer():
+    from dedup_engine import cluster_articles
+    cluster_articles(WARMUP_TEXTS)
+
+
+def _warm_redis():
+    from redis_manager import RedisManager
+    RedisManager().test_connection()  # 공용 풀에 커넥션 1개를 미리 열어 둔다
+
+
+def _warm_openai():
+    import gpt_processor
+    # 클라이언트 생성 + HTTP 클라이언트 준비 (실제 API 호출은 하지 않음)
+    gpt_processor.client.chat.completions
+
+
+WARMUP_STEPS = [
+    ('tokenizer', _warm_tokenizer),
+    ('vectorizer', _warm_vectorizer),
+    ('redis_pool', _warm_redis),
+    ('openai_client', _warm_openai),
+]
+
+
+def warm_up(steps=WARMUP_STEPS):
+    """구성 요소를 한 번씩 실행해 첫 요청이 초기화 비용을 치르지 않게 한다. 실패해도 ready 로 전환."""
+    for name, step in steps:
+        t0 = time.perf_counter()
+        try:
+            step()
+        except Exception as e:
+            _state['errors'][f'warmup:{name}'] = str(e)
+            print(f"⚠️ warm-up 실패: {name} ({e})")
+        _state['warmup_times'][name] = round((time.perf_counter() - t0) * 1000, 1)
+    with _lock:
+        _state['ready'] = True
+        _state['ready_at'] = time.time()
+    print(f"🟢 서버 준비 완료 ({(_state['ready_at'] - _state['process_started_at']):.1f}s)")
+
+
+def start_warm_up():
+    """백그라운드 스레드에서 warm_up 실행 (이미 실행 중이면 무시)"""
+    global _warmup_thread
+    with _lock:
+        if _warmup_thread is not None:
+            return _warmup_thread
+        _warmup_thread = threading.Thread(target=warm_up, name='warm-up', daemon=True)
+    _warmup_thread.start()
+    return _warmup_thread
+
+
+def is_ready():
+    return _state['ready']
+
+
+def report():
+    """import / warm-up 소요 시간과 준비 상태"""
+    started = _state['process_started_at']
+    return {
+        'ready': _state['ready'],
+        'startup_seconds': round(_state['ready_at'] - started, 3) if _state['ready_at'] else None,
+        'import_ms': dict(_state['import_times']),
+        'import_total_ms': round(sum(_state['import_times'].values()), 1),
+        'warmup_ms': dict(_state['warmup_times']),
+        'errors': dict(_state['errors']),
+    }
@@ -0,0 +1,56 @@
+# tests/conftest.py
+"""
+pytest 공용 설정: 실제 config / Redis / upstream 없이 서버 모듈을 import 한다.
+- config: benchmark.offline 의 가짜 config 모듈 (테스트마다 값 복원)
+- Redis: 테스트마다 새 fakeredis 를 redis_manager 공용 풀로 끼운다
+실행: cd server && python -m pytest -q tests
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmark.offline import use_offline_config  # noqa: E402
+
+use_offline_config()
+
+import fakeredis  # noqa: E402
+import pytest  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def config():
+    """가짜 config 모듈. 테스트에서 바꾼 값은 끝나면 되돌린다"""
+    import config
+    saved = dict(vars(config))
+    yield config
+    for key in set(vars(config)) - set(saved):
+        delattr(config, key)
+    for key, value in saved.items():
+        setattr(config, key, value)
+
+
+@pytest.fixture
+def redis_conn():
+    import redis_manager
+    conn = fakeredis.FakeRedis(decode_responses=True)
+    saved = redis_manager._pool
+    redis_manager._pool = conn.connection_pool
+    yield conn
+    redis_manager._pool = saved
+
+
+@pytest.fixture
+def fake_openai(monkeypatch):
+    """gpt_processor 가 가리키는 가짜 OpenAI 서버 (응답 캐시는 비운 상태로 시작)"""
+    from openai import OpenAI
+
+    import gpt_processor
+    from benchmark.fake_openai import FakeOpenAIServer
+    from gpt_cache import get_response_cache
+    server = FakeOpenAIServer(latency=0).start()
+    monkeypatch.setattr(gpt_processor, 'client', OpenAI(api_key='sk-offline', base_url=server.base_url))
+    get_response_cache().clear()
+    yield server
+    server.stop()
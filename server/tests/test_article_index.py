@@ -0,0 +1,46 @@
+# tests/test_article_index.py
+"""로컬 역색인(idx:*)이 만료된 기사를 돌려주지 않고, 토큰마다 크기가 제한되는지"""
+
+import time
+
+import article_index
+from article_index import ArticleIndex
+
+
+def articles(n, text="삼성전자 반도체", start=0):
+    return [{"originallink": f"http://news.test/{i}", "processed_text": text} for i in range(start, start + n)]
+
+
+def test_lookup_skips_expired_postings(redis_conn):
+    index = ArticleIndex(redis_conn)
+    index.add_articles(articles(3))
+    assert index.lookup({"삼성전자", "반도체"}) == {f"http://news.test/{i}" for i in range(3)}
+
+    # news:* 와 함께 만료됐어야 할 링크
+    redis_conn.zadd("idx:반도체", {"http://news.test/0": time.time() - 1})
+    assert index.lookup({"삼성전자", "반도체"}) == {"http://news.test/1", "http://news.test/2"}
+
+    # 다음 색인 때 만료된 링크는 지워진다
+    index.add_articles(articles(1, start=10))
+    assert redis_conn.zscore("idx:반도체", "http://news.test/0") is None
+    assert not redis_conn.keys("tmp:*")
+
+
+def test_postings_are_capped(redis_conn, monkeypatch):
+    monkeypatch.setattr(article_index, "MAX_POSTINGS", 5)
+    index = ArticleIndex(redis_conn)
+    for start in range(0, 20, 4):
+        index.add_articles(articles(4, start=start))
+        time.sleep(0.01)  # 나중에 색인한 링크가 더 늦게 만료
+    assert redis_conn.zcard("idx:반도체") == 5
+    assert "http://news.test/19" in index.lookup({"반도체"})
+
+
+def test_legacy_set_is_rebuilt(redis_conn):
+    redis_conn.sadd("idx:반도체", "http://news.test/old")
+    index = ArticleIndex(redis_conn)
+    assert index.lookup({"반도체"}) == set()
+
+    index.add_articles(articles(2))
+    assert redis_conn.type("idx:반도체") == "zset"
+    assert index.lookup({"반도체"}) == {"http://news.test/0", "http://news.test/1"}
@@ -0,0 +1,46 @@
+# tests/test_incremental_dedup.py
+"""증분 클러스터링의 전체 클러스터링 전환 조건 (붙인 기사 비율 / 품질 drift)"""
+
+import numpy as np
+import pandas as pd
+
+from incremental_dedup import ClusterState
+
+
+def story(topic, n, start=0):
+    return [{"originallink": f"http://news.test/{topic}/{i}", "title": topic, "description": "",
+             "pubDate": "2025.01.01. 오후 1:05", "processed_text": f"{topic}a {topic}b {topic}c 기사{i}"}
+            for i in range(start, start + n)]
+
+
+def build(articles, labels):
+    df = pd.DataFrame(articles)
+    labels = np.asarray(labels)
+    reps = df[labels != -1].groupby(labels[labels != -1]).head(1)
+    return ClusterState.build(df, labels, {"eps": 0.6, "min_samples": 2, "nc": 1}, reps, max_results=500)
+
+
+def base_state():
+    articles = story("반도체", 10) + story("금리", 10) + [a for t in range(40) for a in story(f"단독{t}", 1)]
+    return build(articles, [0] * 10 + [1] * 10 + [-1] * 40)
+
+
+def test_new_articles_for_existing_stories_stay_incremental():
+    merged, stats = base_state().merge(story("반도체", 3, start=10))
+    assert stats["assigned"] == 3
+    assert merged.recluster_reason(drift_threshold=0.3) is None
+
+
+def test_many_new_clusters_trigger_quality_recluster():
+    # 노이즈였던 단독 기사들과 같은 소식이 이어지면서 새 클러스터가 생김
+    fresh = [a for t in range(3) for a in story(f"단독{t}", 2, start=1)]
+    merged, stats = base_state().merge(fresh)
+    assert stats["new_clusters"] == 3
+    assert merged.drift < 0.3
+    assert merged.recluster_reason(drift_threshold=0.3)[0] == "reclustered_quality"
+
+
+def test_quality_survives_round_trip():
+    merged, _ = base_state().merge(story("반도체", 3, start=10))
+    loaded = ClusterState.from_dict(merged.to_dict())
+    assert loaded.baseline == merged.baseline and loaded.quality == merged.quality
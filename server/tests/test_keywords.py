@@ -0,0 +1,29 @@
+# tests/test_keywords.py
+"""/keywords 가 파싱 실패한 GPT 응답을 기사 묶음과 응답 캐시에 남기지 않는지"""
+
+import pytest
+
+from benchmark.fake_openai import fake_reply
+
+
+@pytest.fixture
+def client(redis_conn, fake_openai):
+    import app
+    return app.app.test_client()
+
+
+def test_unparseable_reply_is_retried(client, fake_openai):
+    from redis_manager import RedisManager
+    mgr = RedisManager()
+    set_id = mgr.save_article_set([{"title": "반도체 수출 증가", "description": "수출 실적 발표"}])
+    fake_openai.reply = lambda body: "키워드는 금리입니다"
+
+    assert client.post('/keywords', json={'article_set_id': set_id}).get_json() == {'keywords': []}
+    assert mgr.get_article_set_field(set_id, 'keywords') is None
+
+    fake_openai.reply = fake_reply
+    keywords = client.post('/keywords', json={'article_set_id': set_id}).get_json()['keywords']
+
+    assert keywords
+    assert mgr.get_article_set_field(set_id, 'keywords') == keywords
+    assert fake_openai.requests == 2
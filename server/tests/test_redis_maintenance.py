@@ -0,0 +1,46 @@
+# tests/test_redis_maintenance.py
+"""고아 기사 회수(gc)가 역색인(idx:*)만 가리키는 기사를 어떻게 다루는지"""
+
+import time
+
+from article_index import ArticleIndex
+from redis_manager import NEWS_TTL, RedisManager
+from redis_maintenance import RedisMaintenance
+
+
+def save(mgr, links):
+    articles = [{"originallink": link, "title": "t", "description": "d", "pubDate": "p",
+                 "processed_text": "반도체 수출"} for link in links]
+    mgr.save_news_articles(articles)
+    ArticleIndex(mgr.conn).add_articles(articles)
+    # 저장된 지 오래된 기사처럼 (min_age 보다 오래)
+    for link in links:
+        mgr.conn.expire(f"news:{link}", NEWS_TTL - 3600)
+
+
+def test_gc_collects_articles_only_in_expired_postings(redis_conn):
+    mgr = RedisManager()
+    live, expired = "http://news.test/live", "http://news.test/expired"
+    save(mgr, [live, expired])
+    # expired 는 색인 만료 시각이 지남 (예: 예전에 색인하고 다시 수집되지 않은 기사)
+    for key in ("idx:반도체", "idx:수출"):
+        redis_conn.zadd(key, {expired: time.time() - 1})
+
+    result = RedisMaintenance().gc()
+
+    assert result["orphans"] == 1 and result["deleted"] == 1
+    assert redis_conn.exists(f"news:{live}") and not redis_conn.exists(f"news:{expired}")
+    assert result["index_pruned"] == 2
+    assert redis_conn.zrange("idx:반도체", 0, -1) == [live]
+
+
+def test_gc_prunes_postings_without_news(redis_conn):
+    mgr = RedisManager()
+    save(mgr, ["http://news.test/a", "http://news.test/b"])
+    redis_conn.delete("news:http://news.test/b")  # 본문이 먼저 만료됨
+
+    result = RedisMaintenance().gc()
+
+    assert result["deleted"] == 0
+    assert result["index_pruned"] == 2
+    assert ArticleIndex(redis_conn).lookup({"반도체", "수출"}) == {"http://news.test/a"}
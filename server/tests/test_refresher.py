@@ -0,0 +1,51 @@
+# tests/test_refresher.py
+"""인기 검색어 스케줄러(Refresher.tick)가 무엇을 갱신하는지"""
+
+import pytest
+
+from redis_manager import RedisManager
+from refresher import Refresher
+
+
+@pytest.fixture
+def refresher(redis_conn):
+    calls = []
+    refresher = Refresher(max_concurrent=4, run=lambda query_list, is_initial: calls.append(query_list))
+    refresher.calls = calls
+    yield refresher
+    refresher.stop()
+
+
+def test_tick_skips_negative_results(refresher):
+    mgr = RedisManager()
+    mgr.record_query(["없는검색어"])
+    mgr.save_search_result(["없는검색어"], [])
+
+    assert refresher.tick() == []
+    # 빈 결과가 만료돼도(NEGATIVE_TTL) 갱신 보류 기간에는 다시 부르지 않는다
+    mgr.conn.delete("result:없는검색어")
+    assert refresher.tick() == []
+    assert refresher.calls == []
+
+    # 사용자 검색에서 기사가 나오면 다시 갱신 대상
+    mgr.save_search_result(["없는검색어"], [{"title": "t", "originallink": "http://news.test/1"}])
+    mgr.conn.expire("result:없는검색어", 60)
+    assert refresher.tick() == ["없는검색어"]
+
+
+def test_tick_refreshes_with_sent_query(refresher):
+    mgr = RedisManager()
+    mgr.record_query(["Samsung ", "반도체"])
+
+    assert refresher.tick() == ["samsung 반도체"]
+    assert refresher.wait_idle(timeout=5)
+    assert refresher.calls == [["Samsung ", "반도체"]]
+
+
+def test_decay_drops_query_lists(redis_conn):
+    mgr = RedisManager()
+    mgr.record_query(["반도체"])
+    mgr.decay_popularity(factor=0.1)
+    assert mgr.popular_queries() == []
+    assert mgr.popular_query_lists(["반도체"]) == [["반도체"]]
+    assert not redis_conn.hexists("popular:query_lists", "반도체")
@@ -0,0 +1,123 @@
+# tests/test_summary.py
+"""기사 묶음(article_set_id)으로 받은 /summary 가 클러스터 단위 map-reduce 요약을 하는지"""
+
+import threading
+
+import pytest
+
+import gpt_processor
+
+
+def make_articles(sizes):
+    """클러스터 번호 순으로 정렬된 대표 기사 (sizes[i] 건이 클러스터 i)"""
+    return [{"title": f"클러스터{c} 기사{i} 제목", "description": f"클러스터{c} 기사{i} 설명",
+             "pubDate": "2025.01.01. 오후 1:05", "originallink": f"http://news.test/{c}/{i}", "cluster": c}
+            for c, size in enumerate(sizes) for i in range(size)]
+
+
+@pytest.fixture
+def client(redis_conn, fake_openai):
+    import app
+    return app.app.test_client()
+
+
+@pytest.fixture
+def map_calls(monkeypatch):
+    """map 단계에 넘어간 기사 묶음 기록"""
+    calls = []
+    lock = threading.Lock()
+    summarize_chunk = gpt_processor._summarize_chunk
+
+    def record(chunk):
+        with lock:
+            calls.append(chunk)
+        return summarize_chunk(chunk)
+
+    monkeypatch.setattr(gpt_processor, '_summarize_chunk', record)
+    return calls
+
+
+def test_article_set_keeps_cluster(redis_conn):
+    from redis_manager import RedisManager
+    articles = make_articles([2, 3])
+    mgr = RedisManager()
+    assert [a["cluster"] for a in mgr.get_article_set(mgr.save_article_set(articles))] == [0, 0, 1, 1, 1]
+
+
+def test_summary_from_article_set_maps_per_cluster(client, config, fake_openai, map_calls):
+    from redis_manager import RedisManager
+    config.GPT_SUMMARY_MODE = 'map_reduce'
+    config.GPT_SUMMARY_CHUNK = 4
+    set_id = RedisManager().save_article_set(make_articles([3, 3, 2, 6]))
+
+    response = client.post('/summary', json={'article_set_id': set_id})
+
+    assert response.status_code == 200
+    assert response.get_json()['summary'] != "요약 생성 실패"
+    # 묶음 크기(4) 이하인 클러스터 0~2 는 각각 한 묶음에 통째로, 6건인 클러스터 3 만 나뉜다
+    assert sorted(sorted({a["cluster"] for a in chunk}) for chunk in map_calls) == [[0], [1], [2], [3], [3]]
+    assert all(len(chunk) <= 4 for chunk in map_calls)
+    assert fake_openai.requests == len(map_calls) + 1
+
+
+def test_empty_streamed_summary_is_not_saved(client, fake_openai):
+    from redis_manager import RedisManager
+    mgr = RedisManager()
+    set_id = mgr.save_article_set(make_articles([2]))
+    fake_openai.reply = lambda body: " \n"
+
+    body = client.post('/summary/stream', json={'article_set_id': set_id}).get_data(as_text=True)
+
+    assert "event: error" in body and "event: done" not in body
+    assert mgr.get_article_set_field(set_id, 'summary') is None
+
+    # 빈 응답은 기사 묶음에도 응답 캐시에도 남지 않아 다음 요청은 다시 생성한다
+    fake_openai.reply = lambda body: "요약문"
+    body = client.post('/summary/stream', json={'article_set_id': set_id}).get_data(as_text=True)
+
+    assert 'event: done\ndata: {"summary": "요약문"}' in body
+    assert mgr.get_article_set_field(set_id, 'summary') == "요약문"
+    assert fake_openai.requests == 2
+
+
+def test_empty_summary_is_not_saved(client, fake_openai):
+    from redis_manager import RedisManager
+    mgr = RedisManager()
+    set_id = mgr.save_article_set(make_articles([2]))
+    fake_openai.reply = lambda body: " "
+
+    assert client.post('/summary', json={'article_set_id': set_id}).get_json() == {'summary': ''}
+    assert mgr.get_article_set_field(set_id, 'summary') is None
+
+    fake_openai.reply = lambda body: "요약문"
+    assert client.post('/summary', json={'article_set_id': set_id}).get_json() == {'summary': "요약문"}
+    assert mgr.get_article_set_field(set_id, 'summary') == "요약문"
+
+
+def test_auto_mode_ignores_duplicate_titles_under_budget(client, config, fake_openai, map_calls):
+    from redis_manager import RedisManager
+    config.GPT_SUMMARY_MODE = 'auto'
+    config.GPT_SUMMARY_CHUNK = 40
+    config.GPT_PROMPT_TOKEN_BUDGET = 6000
+    articles = make_articles([46])
+    articles[1]["title"] = articles[0]["title"]
+    set_id = RedisManager().save_article_set(articles)
+
+    response = client.post('/summary', json={'article_set_id': set_id})
+
+    # 중복 제목 1건이 빠졌을 뿐 예산 안에 다 들어가므로 한 번에 요약한다
+    assert response.status_code == 200
+    assert map_calls == []
+    assert fake_openai.requests == 1
+
+
+def test_auto_mode_maps_when_budget_overflows(client, config, fake_openai, map_calls):
+    from redis_manager import RedisManager
+    config.GPT_SUMMARY_MODE = 'auto'
+    config.GPT_SUMMARY_CHUNK = 40
+    config.GPT_PROMPT_TOKEN_BUDGET = 300
+    set_id = RedisManager().save_article_set(make_articles([46]))
+
+    client.post('/summary', json={'article_set_id': set_id})
+
+    assert len(map_calls) == 2
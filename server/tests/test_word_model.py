@@ -0,0 +1,61 @@
+# tests/test_word_model.py
+"""단어 점수 모델: 재생성 주기와 memo 무효화"""
+
+import word_model
+from word_model import WordScoreModel
+
+TEXTS = ["삼성전자 반도체 수출 증가", "삼성전자 반도체 투자 확대", "반도체 수출 회복세"] * 20
+
+
+def test_rebuild_waits_for_threshold():
+    model = WordScoreModel(rebuild_ratio=0.5, rebuild_min_sents=1000, rebuild_interval=3600)
+    assert model.update(TEXTS)           # 처음 학습은 바로
+    assert not model.update(TEXTS[:10])  # 60문장의 50% 미만
+    assert model.update(TEXTS[:20])      # 누적 30문장
+    assert model.version == 2
+
+
+def test_memo_is_keyed_by_version():
+    model = WordScoreModel(rebuild_interval=3600)
+    model.tokenize("삼성전자반도체")  # 빈 모델(버전 0)로 토큰화
+    model.update(TEXTS)
+    # 재생성 뒤에는 memo 가 아니라 새 토크나이저 결과
+    assert model.tokenize("삼성전자반도체") == ' '.join(model._tokenizer.tokenize("삼성전자반도체"))
+    assert {key for key in model._memo} == {(0, "삼성전자반도체"), (1, "삼성전자반도체")}
+
+
+def test_snapshot_runs_in_background(tmp_path, config, monkeypatch):
+    config.WORD_MODEL_PATH = str(tmp_path / "word_model.json")
+    monkeypatch.setattr(word_model, "_model", WordScoreModel())
+    monkeypatch.setattr(word_model, "_batches_since_snapshot", 0)
+    word_model.update_and_snapshot(TEXTS, snapshot_every=1)
+    assert word_model.wait_snapshot(timeout=5)
+    loaded = WordScoreModel()
+    loaded.load(config.WORD_MODEL_PATH)
+    assert loaded.num_sents == len(TEXTS)
+
+
+def test_concurrent_saves_do_not_share_temp_file(tmp_path):
+    import threading
+    path = str(tmp_path / "word_model.json")
+    small, large = WordScoreModel(), WordScoreModel()
+    small.update(TEXTS[:3])
+    large.update(TEXTS * 50)
+    errors = []
+
+    def save(model):
+        try:
+            model.save(path)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=save, args=(model,)) for model in (small, large) * 10]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    loaded = WordScoreModel()
+    loaded.load(path)  # 섞인 파일이면 JSON 파싱 실패
+    assert loaded.num_sents in (small.num_sents, large.num_sents)
+    assert [p.name for p in tmp_path.iterdir()] == ["word_model.json"]
@@ -0,0 +1,134 @@
+# text_ingest.py
+"""
+네이버 뉴스 items 정리(HTML 엔티티/태그 제거, pubDate 변환, text 컬럼)를 묶음 단위로 처리하는 공용 모듈.
+- 패턴은 미리 컴파일하고, '&' / '<' 가 없는 문자열은 unescape / 태그 제거를 건너뛴다
+- pubDate 는 네이버 형식("Mon, 01 Jan 2025 09:00:00 +0900")을 문자열 슬라이스로 바로 변환
+  (형식이 다르면 strptime 으로 대체). 결과는 기존 convert_pubdate 와 같다 (표기 시간대 그대로)
+- 이미 정리한 기사는 링크별 LRU 에 보관해 다음 검색에서 다시 정리하지 않는다
+  (같은 링크라도 원문 제목/설명/pubDate 가 바뀌었으면 다시 정리)
+news_processor.clean_page 와 clean_html.clean_news_results 가 이 모듈을 사용한다.
+"""
+
+import html
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+import pandas as pd
+
+PUBDATE_FORMAT = "%a, %d %b %Y %H:%M:%S %z"
+COLUMNS = ["title", "description", "pubDate", "originallink"]
+
+_TAG = re.compile(r'<.*?>')
+_PUBDATE = re.compile(r'[A-Za-z]{3}, (\d{2}) ([A-Za-z]{3}) (\d{4}) (\d{2}):(\d{2}):\d{2} [+-]\d{4}')
+_MONTHS = {name: i for i, name in enumerate(
+    ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'], start=1)}
+
+
+def clean_text(raw_text):
+    """HTML 엔티티 복원 후 태그 제거 (기존 news_processor.clean_html 과 같은 결과)"""
+    text = str(raw_text)
+    if '&' in text:
+        text = html.unescape(text)
+    if '<' in text:
+        text = _TAG.sub('', text)
+    return text
+
+
+def clean_texts(values):
+    return [clean_text(v) for v in values]
+
+
+def _format(year, month, day, hour, minute):
+    ampm = "오전" if hour < 12 else "오후"
+    hour_12 = hour if 1 <= hour <= 12 else abs(hour - 12) if hour != 0 else 12
+    return f"{year}.{month:02}.{day:02}. {ampm} {hour_12}:{minute:02}"
+
+
+def format_pubdate(date_str):
+    """'Mon, 01 Jan 2025 09:00:00 +0900' → '2025.01.01. 오전 9:00'"""
+    m = _PUBDATE.fullmatch(date_str) if isinstance(date_str, str) else None
+    if m and m.group(2) in _MONTHS:
+        day, month, year, hour, minute = m.groups()
+        return _format(int(year), _MONTHS[month], int(day), int(hour), int(minute))
+    dt = datetime.strptime(date_str, PUBDATE_FORMAT)
+    return _format(dt.year, dt.month, dt.day, dt.hour, dt.minute)
+
+
+def format_pubdates(values):
+    return [format_pubdate(v) for v in values]
+
+
+class IngestCache:
+    """originallink → (원문 제목/설명/pubDate, 정리한 기사) LRU"""
+
+    def __init__(self, maxsize=20000):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hit": 0, "miss": 0}
+
+    def get(self, link, raw):
+        with self._lock:
+            entry = self._entries.get(link)
+            if entry is None or entry[0] != raw:
+                self.stats["miss"] += 1
+                return None
+            self._entries.move_to_end(link)
+            self.stats["hit"] += 1
+            return entry[1]
+
+    def set(self, link, raw, record):
+        with self._lock:
+            self._entries[link] = (raw, record)
+            self._entries.move_to_end(link)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_cache = IngestCache()
+
+
+def get_ingest_cache():
+    return _cache
+
+
+def normalize_items(items, cache=None):
+    """
+    네이버 items → 정리한 기사 dict 리스트 (title/description/pubDate/originallink/text).
+    cache(기본: 프로세스 공용 IngestCache)에 있는 링크는 정리 결과를 재사용한다. cache=False 면 사용 안 함.
+    """
+    if cache is None:
+        cache = _cache
+    records = [None] * len(items)
+    todo = []
+    for i, item in enumerate(items):
+        link = item.get("originallink")
+        raw = (item.get("title"), item.get("description"), item.get("pubDate"))
+        record = cache.get(link, raw) if cache and link else None
+        if record is not None:
+            records[i] = dict(record)
+        else:
+            todo.append((i, link, raw))
+
+    if todo:
+        titles = clean_texts(raw[0] for _, _, raw in todo)
+        descriptions = clean_texts(raw[1] for _, _, raw in todo)
+        pubdates = format_pubdates(raw[2] for _, _, raw in todo)
+        for (i, link, raw), title, description, pubdate in zip(todo, titles, descriptions, pubdates):
+            record = {"title": title, "description": description, "pubDate": pubdate,
+                      "originallink": link, "text": title + " " + description}
+            if cache and link:
+                cache.set(link, raw, record)
+            records[i] = dict(record)
+    return records
+
+
+def normalize_frame(items, cache=None):
+    """normalize_items 결과 DataFrame (기사가 없어도 컬럼은 유지)"""
+    return pd.DataFrame(normalize_items(items, cache), columns=COLUMNS + ["text"])
@@ -0,0 +1,261 @@
+# word_model.py
+"""
+요청마다 새로 학습하던 soynlp WordExtractor 대신 쓰는 장기 유지 단어 점수 모델.
+- LTokenizer 가 쓰는 cohesion_forward 만 필요하므로 L(왼쪽 부분문자열) 빈도만 누적한다.
+  cohesion_forward(w) = (L[w] / L[w[0]]) ** (1 / (len(w) - 1))  (soynlp 와 같은 정의)
+- 기사 묶음이 들어올 때마다 빈도를 더하고(update), 주기적으로 파일 또는 Redis 에 스냅샷을 남긴다.
+  cohesion 점수 계산과 LTokenizer 재생성은 누적 표 전체를 훑으므로 묶음마다 하지 않고,
+  마지막 재생성 뒤 쌓인 문장이 rebuild_ratio(누적 문장 대비) 또는 rebuild_min_sents 이상이거나
+  rebuild_interval 초가 지났을 때만 한다 (처음 학습하는 묶음은 바로). 스냅샷은 백그라운드 스레드에서 쓴다.
+- 서버 시작 시 스냅샷을 불러오고, 이미 본 기사 텍스트의 토큰화 결과는 LRU 로 재사용한다.
+  memo 키에 모델 버전을 넣어 토크나이저가 바뀌면 다시 토큰화한다.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import Counter, OrderedDict
+
+from soynlp.tokenizer import LTokenizer
+
+SNAPSHOT_VERSION = 1
+REDIS_KEY = "model:word_scores"
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "word_model.json")
+
+
+class WordScoreModel:
+    def __init__(self, max_left_length=10, min_frequency=5, min_cohesion_forward=0.05,
+                 max_entries=200000, memo_size=50000, rebuild_ratio=0.1, rebuild_min_sents=1000,
+                 rebuild_interval=60.0):
+        """
+        Args:
+            max_left_length (int): L(왼쪽) 부분문자열 최대 길이 (soynlp 기본값과 같음)
+            min_frequency (int): 토크나이저 점수에 넣을 최소 빈도
+            min_cohesion_forward (float): 토크나이저 점수에 넣을 최소 cohesion
+            max_entries (int): 누적 빈도 항목 상한. 넘으면 빈도 1 항목부터 정리 (상한의 90% 까지)
+            memo_size (int): 토큰화 결과 LRU 크기
+            rebuild_ratio (float): 마지막 재생성 때 문장 수 대비 이만큼 새 문장이 쌓이면 점수/토크나이저 재생성
+            rebuild_min_sents (int): 새 문장이 이만큼 쌓이면 rebuild_ratio 와 상관없이 재생성
+            rebuild_interval (float): 새 문장이 있고 마지막 재생성 뒤 이 시간(초)이 지나면 재생성
+        """
+        self.max_left_length = max_left_length
+        self.min_frequency = min_frequency
+        self.min_cohesion_forward = min_cohesion_forward
+        self.max_entries = max_entries
+        self.memo_size = memo_size
+        self.rebuild_ratio = rebuild_ratio
+        self.rebuild_min_sents = rebuild_min_sents
+        self.rebuild_interval = rebuild_interval
+
+        self.L = Counter()
+        self.num_sents = 0
+        self.version = 0
+        self._built_sents = 0   # 마지막 재생성 때 누적 문장 수
+        self._built_at = 0.0
+        self._tokenizer = LTokenizer(scores={})
+        self._memo = OrderedDict()
+        self._lock = threading.RLock()
+
+    # ---------- 학습 ----------
+    def update(self, texts):
+        """기사 텍스트 묶음으로 빈도를 누적하고, 재생성 조건이 되면 토크나이저 점수를 갱신한다. 갱신했으면 True"""
+        counts = Counter()
+        for text in texts:
+            for word in str(text).split():
+                if len(word) <= 1:
+                    continue
+                for i in range(1, min(self.max_left_length + 1, len(word)) + 1):
+                    counts[word[:i]] += 1
+        with self._lock:
+            self.L.update(counts)
+            self.num_sents += len(texts)
+            if len(self.L) > self.max_entries:
+                self._prune()
+            if not self._rebuild_due():
+                return False
+            self._rebuild_tokenizer()
+            return True
+
+    def _rebuild_due(self):
+        pending = self.num_sents - self._built_sents
+        if pending <= 0:
+            return False
+        if not self._built_sents:
+            return True
+        return (pending >= min(self.rebuild_min_sents, self.rebuild_ratio * self._built_sents)
+                or time.monotonic() - self._built_at >= self.rebuild_interval)
+
+    def _prune(self):
+        """빈도가 낮은 항목부터 지워 max_entries 의 90% 아래로 맞춘다 (넘을 때마다 전체를 훑지 않도록)."""
+        threshold = 1
+        target = int(self.max_entries * 0.9)
+        while len(self.L) > target:
+            self.L = Counter({w: f for w, f in self.L.items() if f > threshold})
+            threshold += 1
+
+    def cohesion_scores(self):
+        """LTokenizer 에 넘길 {단어: cohesion_forward}"""
+        scores = {}
+        for word, freq in self.L.items():
+            if len(word) <= 1 or freq < self.min_frequency:
+                continue
+            first = self.L.get(word[0], 0)
+            if not first:
+                continue
+            score = (freq / first) ** (1 / (len(word) - 1))
+            if score >= self.min_cohesion_forward:
+                scores[word] = score
+        return scores
+
+    def _rebuild_tokenizer(self):
+        self._tokenizer = LTokenizer(scores=self.cohesion_scores())
+        self.version += 1
+        self._built_sents = self.num_sents
+        self._built_at = time.monotonic()
+
+    def rebuild(self):
+        """쌓인 빈도로 지금 바로 점수/토크나이저를 다시 만든다."""
+        with self._lock:
+            self._rebuild_tokenizer()
+
+    # ---------- 토큰화 ----------
+    def tokenize(self, text):
+        """공백으로 이은 토큰 문자열 (process_news 의 processed_text). 같은 모델 버전에서 본 텍스트는 memo 사용."""
+        with self._lock:
+            key = (self.version, text)
+            cached = self._memo.get(key)
+            if cached is not None:
+                self._memo.move_to_end(key)
+                return cached
+            tokenizer = self._tokenizer
+        processed = ' '.join(tokenizer.tokenize(text))
+        with self._lock:
+            self._memo[key] = processed
+            if len(self._memo) > self.memo_size:
+                self._memo.popitem(last=False)
+        return processed
+
+    def tokenize_batch(self, texts):
+        return [self.tokenize(text) for text in texts]
+
+    # ---------- 스냅샷 ----------
+    def to_dict(self):
+        with self._lock:
+            return {"version": SNAPSHOT_VERSION, "num_sents": self.num_sents, "L": dict(self.L)}
+
+    def load_dict(self, data):
+        if data.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"지원하지 않는 스냅샷 버전: {data.get('version')}")
+        with self._lock:
+            self.L = Counter(data.get("L", {}))
+            self.num_sents = data.get("num_sents", 0)
+            self._memo.clear()
+            self._rebuild_tokenizer()
+
+    def save(self, path=DEFAULT_PATH):
+        """
+        파일 스냅샷 (임시 파일에 쓰고 교체 → 쓰는 도중 죽어도 기존 파일 유지).
+        임시 파일 이름은 쓰는 쪽마다 달라서 여러 프로세스가 같은 경로에 동시에 써도 섞이지 않는다.
+        """
+        data = self.to_dict()
+        fd, tmp = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp",
+                                   dir=os.path.dirname(os.path.abspath(path)))
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def load(self, path=DEFAULT_PATH):
+        with open(path, encoding="utf-8") as f:
+            self.load_dict(json.load(f))
+
+    def save_to_redis(self, conn, key=REDIS_KEY):
+        conn.set(key, json.dumps(self.to_dict(), ensure_ascii=False))
+
+    def load_from_redis(self, conn, key=REDIS_KEY):
+        raw = conn.get(key)
+        if not raw:
+            return False
+        self.load_dict(json.loads(raw))
+        return True
+
+
+_model = None
+_model_lock = threading.Lock()
+_batches_since_snapshot = 0
+_snapshot_thread = None
+
+
+def _store():
+    import config
+    return getattr(config, "WORD_MODEL_STORE", "file"), getattr(config, "WORD_MODEL_PATH", DEFAULT_PATH)
+
+
+def get_word_model():
+    """프로세스 전체에서 공유하는 단어 점수 모델. 처음 호출 시 스냅샷이 있으면 불러온다."""
+    global _model
+    with _model_lock:
+        if _model is None:
+            _model = WordScoreModel()
+            store, path = _store()
+            try:
+                if store == "redis":
+                    from redis_manager import RedisManager
+                    loaded = _model.load_from_redis(RedisManager().conn)
+                elif os.path.exists(path):
+                    _model.load(path)
+                    loaded = True
+                else:
+                    loaded = False
+                if loaded:
+                    print(f"🟢 단어 점수 모델 로드: 문장 {_model.num_sents}개, 항목 {len(_model.L)}개")
+            except Exception as e:
+                print(f"⚠️ 단어 점수 모델 로드 실패, 새로 시작: {e}")
+        return _model
+
+
+def _snapshot(model):
+    store, path = _store()
+    try:
+        if store == "redis":
+            from redis_manager import RedisManager
+            model.save_to_redis(RedisManager().conn)
+        else:
+            model.save(path)
+    except Exception as e:
+        print(f"⚠️ 단어 점수 모델 스냅샷 실패: {e}")
+
+
+def update_and_snapshot(texts, snapshot_every=5):
+    """
+    공용 모델을 갱신하고 snapshot_every 묶음마다 스냅샷을 남긴다.
+    스냅샷은 백그라운드 스레드에서 쓰고(요청 스레드는 기다리지 않음), 이전 스냅샷을 아직 쓰는 중이면 다음 차례로 미룬다.
+    """
+    global _batches_since_snapshot, _snapshot_thread
+    model = get_word_model()
+    model.update(texts)
+    with _model_lock:
+        _batches_since_snapshot += 1
+        if _batches_since_snapshot < snapshot_every:
+            return model
+        if _snapshot_thread is not None and _snapshot_thread.is_alive():
+            return model
+        _batches_since_snapshot = 0
+        _snapshot_thread = threading.Thread(target=_snapshot, args=(model,), name="word-model-snapshot",
+                                            daemon=True)
+        _snapshot_thread.start()
+    return model
+
+
+def wait_snapshot(timeout=None):
+    """진행 중인 스냅샷이 끝날 때까지 대기 (종료 직전/테스트용). 끝났으면 True"""
+    thread = _snapshot_thread
+    if thread is not None:
+        thread.join(timeout)
+        return not thread.is_alive()
+    return True